@@ -15,36 +15,28 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.core.cube import CrimeCube
+from src.core.schema import normalize_schema
+from src.core.sample_data import generate_crime_panel
+
 def load_sample_data():
     """Carrega dados de exemplo"""
-    np.random.seed(42)
-    datas = pd.date_range(start='2020-01-01', end='2024-12-31', freq='MS')
-    
-    # Simula diferentes tipos de crime
+    # Simula diferentes tipos de crime: tendência + sazonalidade + ruído
     crimes = ['Homicídio Doloso', 'Roubo de Veículo', 'Roubo a Transeunte', 'Furto de Veículo']
     regioes = ['Centro', 'Zona Sul', 'Zona Norte', 'Barra da Tijuca']
     
-    dados = []
-    for crime in crimes:
-        for regiao in regioes:
-            for data in datas:
-                # Tendência + sazonalidade + ruído
-                tendencia = 50 + np.random.normal(0, 10)
-                sazonalidade = 10 * np.sin(data.month * 2 * np.pi / 12)
-                ruido = np.random.normal(0, 5)
-                
-                valor = max(0, tendencia + sazonalidade + ruido)
-                
-                dados.append({
-                    'data': data,
-                    'tipo_crime': crime,
-                    'regiao_administrativa': regiao,
-                    'total_ocorrencias': int(valor),
-                    'populacao': np.random.randint(100000, 500000),
-                    'taxa_100k': valor / 1000 * 100
-                })
-    
-    return pd.DataFrame(dados)
+    df = generate_crime_panel(
+        crimes,
+        regioes,
+        pd.date_range(start='2020-01-01', end='2024-12-31', freq='MS'),
+        rate_denominator=1000000,
+        base=50,
+        level_noise=10,
+        seasonal_amplitude=10,
+        noise=5
+    )
+    
+    return normalize_schema(df, inplace=True)
 
 def decompose_time_series(serie):
     """Decompõe série temporal"""
@@ -182,15 +174,10 @@ def create_trend_analysis(serie):
     
     return fig
 
-def create_correlation_analysis(df):
+def create_correlation_analysis(cube):
     """Análise de correlação temporal"""
-    # Pivot para análise de correlação
-    df_pivot = df.pivot_table(
-        index='data', 
-        columns='tipo_crime', 
-        values='total_ocorrencias', 
-        aggfunc='sum'
-    ).fillna(0)
+    # Pivot (mês × tipo de crime) direto do cubo de agregados
+    df_pivot = cube.pivot(index='mes', columns='crime', value='total_ocorrencias')
     
     # Matriz de correlação
     corr_matrix = df_pivot.corr()
@@ -243,34 +230,31 @@ def main():
     st.title("📈 Análise Temporal - Tendências e Sazonalidade")
     st.markdown("Análise detalhada de tendências, sazonalidade e padrões temporais de violência")
     
-    # Carrega dados
-    df = load_sample_data()
+    # Carrega dados e monta o cubo região × crime × mês
+    cube = CrimeCube.from_frame(load_sample_data())
     
     # Sidebar com controles
     st.sidebar.title("🎛️ Controles")
     
-    # Filtros
+    # Filtros (só rótulos com registros no cubo)
     crime_tipo = st.sidebar.selectbox(
         "Tipo de Crime:",
-        ["Todos"] + df['tipo_crime'].unique().tolist()
+        ["Todos"] + cube.crimes[cube.rows.sum(axis=(0, 2)) > 0].tolist()
     )
     
     regiao = st.sidebar.selectbox(
         "Região:",
-        ["Todas"] + df['regiao_administrativa'].unique().tolist()
+        ["Todas"] + cube.regions[cube.rows.sum(axis=(1, 2)) > 0].tolist()
     )
     
-    # Aplica filtros
-    df_filtered = df.copy()
-    
-    if crime_tipo != "Todos":
-        df_filtered = df_filtered[df_filtered['tipo_crime'] == crime_tipo]
-    
-    if regiao != "Todas":
-        df_filtered = df_filtered[df_filtered['regiao_administrativa'] == regiao]
+    # Aplica filtros (recorte do cubo)
+    cube_filtered = cube.select(
+        crimes=None if crime_tipo == "Todos" else crime_tipo,
+        regions=None if regiao == "Todas" else regiao
+    )
     
     # Agrega por data
-    df_agg = df_filtered.groupby('data')['total_ocorrencias'].sum().reset_index()
+    df_agg = cube_filtered.by_month({'total_ocorrencias': 'sum'})
     serie = df_agg['total_ocorrencias'].values
     
     # Métricas básicas
@@ -333,7 +317,7 @@ def main():
     # Análise de correlação
     st.markdown("## 🔗 Análise de Correlação")
     
-    fig_corr, corr_matrix = create_correlation_analysis(df_filtered)
+    fig_corr, corr_matrix = create_correlation_analysis(cube_filtered)
     st.plotly_chart(fig_corr, use_container_width=True)
     
     # Tabela de correlação
@@ -19,6 +19,8 @@ from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.core.features import lag_windows
+
 # Configuração da página
 st.set_page_config(
     page_title="Modelos Preditivos - Violência RJ",
@@ -142,13 +144,8 @@ class MLModels:
             from sklearn.ensemble import RandomForestRegressor
             from sklearn.metrics import mean_absolute_error
             
-            # Prepara features
-            X, y = [], []
-            for i in range(n_lags, len(serie)):
-                X.append(serie[i-n_lags:i])
-                y.append(serie[i])
-            
-            X, y = np.array(X), np.array(y)
+            # Prepara features (janelas de lags sem laço Python)
+            X, y = lag_windows(serie, n_lags)
             
             if len(X) < 10:
                 return None
@@ -189,13 +186,8 @@ class MLModels:
             import xgboost as xgb
             from sklearn.metrics import mean_absolute_error
             
-            # Prepara features
-            X, y = [], []
-            for i in range(n_lags, len(serie)):
-                X.append(serie[i-n_lags:i])
-                y.append(serie[i])
-            
-            X, y = np.array(X), np.array(y)
+            # Prepara features (janelas de lags sem laço Python)
+            X, y = lag_windows(serie, n_lags)
             
             if len(X) < 10:
                 return None
@@ -241,13 +233,8 @@ class MLModels:
             from sklearn.ensemble import GradientBoostingRegressor
             from sklearn.metrics import mean_absolute_error
             
-            # Prepara features
-            X, y = [], []
-            for i in range(n_lags, len(serie)):
-                X.append(serie[i-n_lags:i])
-                y.append(serie[i])
-            
-            X, y = np.array(X), np.array(y)
+            # Prepara features (janelas de lags sem laço Python)
+            X, y = lag_windows(serie, n_lags)
             
             if len(X) < 10:
                 return None
@@ -304,12 +291,7 @@ class DeepLearningModels:
             serie_scaled = scaler.fit_transform(serie.reshape(-1, 1)).flatten()
             
             # Prepara dados para LSTM
-            X, y = [], []
-            for i in range(n_lags, len(serie_scaled)):
-                X.append(serie_scaled[i-n_lags:i])
-                y.append(serie_scaled[i])
-            
-            X, y = np.array(X), np.array(y)
+            X, y = lag_windows(serie_scaled, n_lags)
             X = X.reshape((X.shape[0], X.shape[1], 1))
             
             if len(X) < 10:
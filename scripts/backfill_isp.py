@@ -0,0 +1,240 @@
+"""
+🗄️ BACKFILL ISP - Carga Histórica Retomável dos Arquivos Mensais
+================================================================
+
+Baixa cada arquivo mensal do ISP-RJ (BaseAAAAMM.csv) desde o início da
+série e grava uma partição ano/mês por arquivo. O manifesto das
+partições funciona como checkpoint: cada mês é registrado assim que é
+gravado, então uma execução interrompida (queda, Ctrl+C) retoma só os
+meses que faltam. Meses que o servidor não tem (404) e que são anteriores
+ao último mês publicado também ficam registrados (_ausentes.json) e não
+são pedidos de novo; os posteriores são tentados a cada execução, pois
+podem ser publicados depois. Os meses são processados em paralelo, em
+processos, e cada processo usa uma parte de HTTP_RATE_LIMIT.
+
+USO:
+    python scripts/backfill_isp.py
+    python scripts/backfill_isp.py --inicio 2015 --fim 2025 --workers 8
+    python scripts/backfill_isp.py --refazer     # ignora o checkpoint
+
+RESULTADO:
+    - data/processed/isp/backfill_mensal/ano=AAAA/mes=MM/part.parquet
+    - data/processed/isp/backfill_mensal/cube.npz
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import logging
+
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import config
+from src.data_collection.api_isp import ISPDadosCollector
+from src.data_collection.http_client import TokenBucket
+from src.data_collection.isp_incremental import ISPIncrementalStore, ISP_SERIES_START_YEAR
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)s | %(message)s'
+)
+
+logger = logging.getLogger(__name__)
+
+# Base onde o backfill grava as partições
+DATASET = 'backfill_mensal'
+
+# Checkpoint dos meses que não existem no servidor (na raiz da base)
+AUSENTES_FILE = '_ausentes.json'
+
+# Limitador de taxa do processo (criado por _iniciar_processo)
+_rate_limiter = None
+
+
+def _iniciar_processo(rate):
+    """Inicializa um processo do pool com sua parte do limite de requisições/s"""
+    global _rate_limiter
+    _rate_limiter = TokenBucket(rate, capacity=1)
+
+
+def ler_ausentes(base):
+    """Meses registrados como ausentes no servidor"""
+    try:
+        nomes = json.loads((base.store.root / AUSENTES_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return set()
+    return {(int(nome[:4]), int(nome[5:])) for nome in nomes}
+
+
+def gravar_ausentes(base, meses):
+    """Grava o checkpoint dos meses ausentes (gravação atômica)"""
+    path = base.store.root / AUSENTES_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp = path.with_suffix('.tmp')
+    temp.write_text(json.dumps([f"{ano:04d}-{mes:02d}" for ano, mes in sorted(meses)], indent=1),
+                    encoding='utf-8')
+    os.replace(temp, path)
+
+
+def meses_da_serie(inicio, fim):
+    """Todos os (ano, mês) de inicio a fim, sem passar do mês corrente"""
+    hoje = datetime.now()
+    return [
+        (ano, mes)
+        for ano in range(inicio, fim + 1)
+        for mes in range(1, 13)
+        if (ano, mes) <= (hoje.year, hoje.month)
+    ]
+
+
+def _processar_particao(tarefa):
+    """
+    Baixa e grava um mês (executado em um processo do pool)
+
+    Só grava o arquivo da partição; o registro no manifesto fica com o
+    processo principal, que é o único a escrever o checkpoint.
+
+    Args:
+        tarefa: (base_url, base_path, ano, mes)
+
+    Returns:
+        ((ano, mes), entrada do manifesto ou None se o mês não existe)
+    """
+    base_url, base_path, ano, mes = tarefa
+    key = (ano, mes)
+
+    coletor = ISPDadosCollector(base_url=base_url)
+    if _rate_limiter is not None:
+        _rate_limiter.acquire()
+    response = coletor.http.get(coletor.month_url(ano, mes))
+    if response.status_code == 404:
+        return key, None
+    response.raise_for_status()
+
+    base = ISPIncrementalStore(DATASET, base_path=base_path)
+    return key, base.write_month(ano, mes, response.content)
+
+
+def _registrar_ausentes(base, ausentes, novos):
+    """
+    Registra como ausentes os meses 404 anteriores ao último mês gravado
+
+    Um buraco no meio da série não vai aparecer depois; já os meses
+    posteriores ao último publicado continuam pendentes.
+    """
+    gravados = base.store.keys()
+    if not gravados:
+        return
+    definitivos = {key for key in novos if key < gravados[-1]}
+    if definitivos - ausentes:
+        gravar_ausentes(base, ausentes | definitivos)
+
+
+def backfill(inicio=ISP_SERIES_START_YEAR, fim=None, workers=4, refazer=False,
+             base_url="http://www.ispdados.rj.gov.br", base_path=None):
+    """
+    Executa o backfill, retomando do checkpoint
+
+    Args:
+        inicio: Primeiro ano
+        fim: Último ano (padrão: ano corrente)
+        workers: Processos em paralelo (dividem HTTP_RATE_LIMIT entre si)
+        refazer: Baixa de novo meses já registrados (gravados ou ausentes)
+        base_url: URL base do ISP-RJ
+        base_path: Diretório raiz das partições (padrão: data/processed/isp)
+
+    Returns:
+        Dicionário com meses gravados, ausentes e com erro
+    """
+    fim = fim or datetime.now().year
+    base = ISPIncrementalStore(DATASET, base_path=base_path)
+    ausentes = set() if refazer else ler_ausentes(base)
+    concluidos = set() if refazer else set(base.store.keys())
+    pendentes = [key for key in meses_da_serie(inicio, fim)
+                 if key not in concluidos and key not in ausentes]
+
+    print(f"📋 Checkpoint: {len(concluidos)} meses já gravados, {len(ausentes)} ausentes "
+          f"no servidor, {len(pendentes)} pendentes")
+    print()
+
+    resumo = {'gravados': [], 'ausentes': [], 'erros': []}
+    if not pendentes:
+        return resumo
+
+    tarefas = [(base_url, base.store.root.parent, ano, mes) for ano, mes in pendentes]
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo,
+                                   initargs=(config.apis.HTTP_RATE_LIMIT / workers,))
+    try:
+        futures = {executor.submit(_processar_particao, tarefa): tarefa[2:] for tarefa in tarefas}
+        for future in as_completed(futures):
+            ano, mes = futures[future]
+            try:
+                key, entrada = future.result()
+            except Exception as e:
+                logger.warning(f"{ano}-{mes:02d}: {e}")
+                resumo['erros'].append((ano, mes))
+                continue
+
+            if entrada is None:
+                resumo['ausentes'].append(key)
+                continue
+
+            # Checkpoint: registra o mês assim que ele é gravado
+            base.store.commit({key: entrada})
+            resumo['gravados'].append(key)
+            print(f"   ✅ {ano}-{mes:02d}: {entrada['rows']:,} registros")
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        print()
+        print(f"⚠️ Interrompido: {len(resumo['gravados'])} meses salvos no checkpoint. "
+              f"Execute de novo para continuar.")
+        raise
+    finally:
+        _registrar_ausentes(base, ausentes, resumo['ausentes'])
+    executor.shutdown()
+
+    if resumo['gravados']:
+        base.rebuild_cube()
+    return resumo
+
+
+def main():
+    """Executa o backfill"""
+
+    parser = argparse.ArgumentParser(description="Backfill retomável dos dados mensais do ISP-RJ")
+    parser.add_argument('--inicio', type=int, default=ISP_SERIES_START_YEAR, help="Primeiro ano")
+    parser.add_argument('--fim', type=int, default=None, help="Último ano (padrão: ano corrente)")
+    parser.add_argument('--workers', type=int, default=4, help="Processos em paralelo")
+    parser.add_argument('--refazer', action='store_true',
+                        help="Ignora o checkpoint e baixa todos os meses")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(" 🗄️ BACKFILL HISTÓRICO - ISP-RJ")
+    print("=" * 70)
+    print()
+
+    resumo = backfill(args.inicio, args.fim, args.workers, args.refazer)
+
+    print()
+    print("=" * 70)
+    print(f" ✅ Gravados: {len(resumo['gravados'])} | "
+          f"Ausentes no servidor: {len(resumo['ausentes'])} | "
+          f"Erros: {len(resumo['erros'])}")
+    print("=" * 70)
+
+    if resumo['erros']:
+        print("⚠️ Meses com erro ficam pendentes e serão tentados na próxima execução")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        sys.exit(130)
@@ -9,10 +9,16 @@ USO:
     python scripts/download_isp_direto.py
 """
 
-import pandas as pd
+import sys
 from pathlib import Path
 import logging
 
+# Adiciona src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.data_collection.isp_incremental import ISPIncrementalStore, stream_isp_csv
+from src.data_collection.http_client import ConditionalDownloader
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -36,36 +42,43 @@ def download_isp_direto():
     save_path.mkdir(parents=True, exist_ok=True)
     
     dados_baixados = {}
+    downloader = ConditionalDownloader()
     
     for nome, url in urls.items():
         try:
             logger.info(f"Baixando: {nome}...")
             print(f"📡 Baixando {nome}...")
             
-            # Baixar CSV
-            df = pd.read_csv(
-                url,
-                encoding='latin-1',
-                sep=';',
-                low_memory=False
-            )
+            # Requisição condicional (ETag/Last-Modified)
+            download = downloader.fetch(url)
+            base = ISPIncrementalStore(nome)
+            output_file = save_path / f'isp_{nome}.csv'
             
-            logger.info(f"✅ Baixado: {len(df)} registros")
-            print(f"   ✅ {len(df):,} registros")
+            if not download.changed and base.has_data() and output_file.exists():
+                # Nada mudou no servidor: usa a base já processada
+                df_rio = base.load()
+                print(f"   📦 Sem alterações no servidor (HTTP {download.status}): "
+                      f"{len(df_rio):,} registros processados")
+                dados_baixados[nome] = df_rio
+                print()
+                continue
             
-            # Filtrar apenas Rio de Janeiro
-            if 'munic' in df.columns:
-                df_rio = df[df['munic'] == 'Rio de Janeiro'].copy()
-                logger.info(f"Filtrado Rio: {len(df_rio)} registros")
-                print(f"   🗺️  Rio de Janeiro: {len(df_rio):,} registros")
-            else:
-                df_rio = df
+            # Ler CSV em blocos, filtrando apenas Rio de Janeiro, e gravar
+            # cada bloco assim que chega (só os meses novos/revisados ficam)
+            resultado = base.ingest_chunks(stream_isp_csv(download.path, municipio='Rio de Janeiro'))
+            print(f"   🧩 Partições: {resultado.summary()}")
             
+            df_rio = base.load()
+            logger.info(f"Filtrado Rio: {len(df_rio)} registros")
+            print(f"   🗺️  Rio de Janeiro: {len(df_rio):,} registros")
+
             # Salvar
-            output_file = save_path / f'isp_{nome}.csv'
-            df_rio.to_csv(output_file, index=False)
-            logger.info(f"Salvo em: {output_file}")
-            print(f"   💾 Salvo: {output_file}")
+            if resultado.has_changes or not output_file.exists():
+                df_rio.to_csv(output_file, index=False)
+                logger.info(f"Salvo em: {output_file}")
+                print(f"   💾 Salvo: {output_file}")
+            else:
+                print(f"   📦 Sem meses novos, mantido: {output_file}")
             
             dados_baixados[nome] = df_rio
             print()
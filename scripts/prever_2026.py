@@ -24,6 +24,9 @@ import logging
 # Adiciona src ao path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.data_collection.isp_incremental import ISPIncrementalStore, stream_isp_csv
+from src.data_collection.http_client import ConditionalDownloader
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s | %(levelname)s | %(message)s'
@@ -46,15 +49,24 @@ def baixar_dados_atualizados():
         logger.info("Baixando dados do ISP-RJ...")
         print("📡 Conectando ao ISP-RJ...")
         
-        df = pd.read_csv(url, encoding='latin-1', sep=';', low_memory=False)
+        # Requisição condicional (ETag/Last-Modified)
+        download = ConditionalDownloader().fetch(url)
+        base = ISPIncrementalStore('municipio')
         
-        logger.info(f"✅ Baixado: {len(df)} registros")
-        print(f"✅ Baixado: {len(df):,} registros totais")
-        print()
+        if not download.changed and base.has_data():
+            # Nada mudou no servidor: usa a base já processada
+            df_rio = base.load()
+            print(f"📦 Sem alterações no servidor (HTTP {download.status}): "
+                  f"{len(df_rio):,} registros processados")
+            print()
+            return df_rio
         
-        # Filtrar Rio de Janeiro
-        df_rio = df[df['munic'] == 'Rio de Janeiro'].copy()
+        # Leitura em blocos, filtrando o Rio de Janeiro em cada bloco; cada
+        # bloco é gravado assim que chega (só os meses novos/revisados ficam)
+        resultado = base.ingest_chunks(stream_isp_csv(download.path, municipio='Rio de Janeiro'))
+        print(f"🧩 Partições: {resultado.summary()}")
         
+        df_rio = base.load()
         logger.info(f"Filtrado Rio: {len(df_rio)} registros")
         print(f"🗺️  Rio de Janeiro: {len(df_rio):,} registros")
         print()
@@ -63,18 +75,20 @@ def baixar_dados_atualizados():
         anos_disponiveis = sorted(df_rio['ano'].unique())
         print(f"📅 Anos disponíveis: {min(anos_disponiveis)} - {max(anos_disponiveis)}")
         print()
-        
+
         # Salvar
         save_path = Path('data/raw')
         save_path.mkdir(parents=True, exist_ok=True)
-        
+
         output_file = save_path / 'isp_rio_atualizado.csv'
-        df_rio.to_csv(output_file, index=False)
-        
-        logger.info(f"Salvo em: {output_file}")
-        print(f"💾 Salvo: {output_file}")
+        if resultado.has_changes or not output_file.exists():
+            df_rio.to_csv(output_file, index=False)
+            logger.info(f"Salvo em: {output_file}")
+            print(f"💾 Salvo: {output_file}")
+        else:
+            print(f"📦 Sem meses novos, mantido: {output_file}")
         print()
-        
+
         return df_rio
         
     except Exception as e:
@@ -15,6 +15,8 @@ from statsmodels.tsa.stattools import adfuller
 from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
 import warnings
 
+from src.core.features import FeatureSpec, add_features
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -404,40 +406,20 @@ class TemporalAnalyzer:
         # Converte para datetime
         df_features[date_col] = pd.to_datetime(df_features[date_col])
         
-        # Ordena por data
-        df_features = df_features.sort_values([group_col, date_col] if group_col else [date_col])
-        
         # Features temporais básicas
         df_features['ano'] = df_features[date_col].dt.year
         df_features['mes'] = df_features[date_col].dt.month
         df_features['dia'] = df_features[date_col].dt.day
         df_features['dia_semana'] = df_features[date_col].dt.dayofweek
         df_features['trimestre'] = df_features[date_col].dt.quarter
-        df_features['semestre'] = df_features[date_col].dt.month.apply(lambda x: 1 if x <= 6 else 2)
-        
-        # Features de lag
-        if group_col:
-            for lag in [1, 3, 6, 12]:
-                df_features[f'{value_col}_lag_{lag}'] = df_features.groupby(group_col)[value_col].shift(lag)
-        else:
-            for lag in [1, 3, 6, 12]:
-                df_features[f'{value_col}_lag_{lag}'] = df_features[value_col].shift(lag)
-        
-        # Features de média móvel
-        if group_col:
-            for window in [3, 6, 12]:
-                df_features[f'{value_col}_ma_{window}'] = df_features.groupby(group_col)[value_col].rolling(window=window).mean().reset_index(0, drop=True)
-        else:
-            for window in [3, 6, 12]:
-                df_features[f'{value_col}_ma_{window}'] = df_features[value_col].rolling(window=window).mean()
-        
-        # Features de diferença
-        if group_col:
-            df_features[f'{value_col}_diff'] = df_features.groupby(group_col)[value_col].diff()
-            df_features[f'{value_col}_diff2'] = df_features.groupby(group_col)[value_col].diff(2)
-        else:
-            df_features[f'{value_col}_diff'] = df_features[value_col].diff()
-            df_features[f'{value_col}_diff2'] = df_features[value_col].diff(2)
+        df_features['semestre'] = np.where(df_features['mes'] <= 6, 1, 2)
+        
+        # Lags, médias móveis e diferenças de todos os grupos em uma passada
+        spec = FeatureSpec(lags=(1, 3, 6, 12), windows=(3, 6, 12), diffs=(1, 2),
+                           lag_name='{col}_lag_{n}', window_name='{col}_ma_{n}',
+                           diff_name='{col}_diff{n}')
+        df_features = add_features(df_features, value_col, date_col, group_col, spec)
+        df_features = df_features.rename(columns={f'{value_col}_diff1': f'{value_col}_diff'})
         
         logger.info(f"Features temporais criadas: {len(df_features.columns)} colunas")
         return df_features
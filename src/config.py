@@ -7,7 +7,7 @@ Arquivo central de configurações do projeto seguindo boas práticas POO.
 
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 import os
 
 
@@ -19,6 +19,7 @@ class PathConfig:
     DATA_RAW: Path = DATA_DIR / "raw"
     DATA_PROCESSED: Path = DATA_DIR / "processed"
     DATA_SHAPEFILES: Path = DATA_DIR / "shapefiles"
+    DATA_CACHE: Path = DATA_DIR / "cache"
     OUTPUTS_DIR: Path = ROOT_DIR / "outputs"
     OUTPUTS_FIGURES: Path = OUTPUTS_DIR / "figures"
     OUTPUTS_MAPS: Path = OUTPUTS_DIR / "maps"
@@ -27,7 +28,7 @@ class PathConfig:
     def __post_init__(self):
         """Cria diretórios se não existirem"""
         for path in [self.DATA_RAW, self.DATA_PROCESSED, self.DATA_SHAPEFILES,
-                     self.OUTPUTS_FIGURES, self.OUTPUTS_MAPS, self.OUTPUTS_REPORTS]:
+                     self.DATA_CACHE, self.OUTPUTS_FIGURES, self.OUTPUTS_MAPS, self.OUTPUTS_REPORTS]:
             path.mkdir(parents=True, exist_ok=True)
 
 
@@ -48,6 +49,9 @@ class MapConfig:
     LINE_WEIGHT: int = 2
     LINE_COLOR: str = '#666666'
     
+    # Tolerâncias (graus) dos níveis de detalhe das geometrias
+    LOD_TOLERANCES: List[float] = None
+    
     # Cores para níveis de criminalidade
     COLOR_VERY_LOW: str = '#2ECC71'  # Verde
     COLOR_LOW: str = '#F1C40F'       # Amarelo
@@ -56,6 +60,10 @@ class MapConfig:
     COLOR_VERY_HIGH: str = '#8B0000' # Vermelho escuro
     
     def __post_init__(self):
+        if self.LOD_TOLERANCES is None:
+            # ~5 m, ~20 m, ~55 m, ~110 m e ~330 m no Rio
+            self.LOD_TOLERANCES = [0.00005, 0.0002, 0.0005, 0.001, 0.003]
+        
         if self.RIO_BBOX is None:
             self.RIO_BBOX = {
                 'min_lat': -23.082741,
@@ -95,6 +103,7 @@ class CrimeConfig:
     """Configuração de tipos de crime"""
     CRIME_TYPES: List[str] = None
     REGIONS: List[str] = None
+    CRIME_LEVELS: List[str] = None
     
     def __post_init__(self):
         if self.CRIME_TYPES is None:
@@ -117,6 +126,16 @@ class CrimeConfig:
                 'Zona Norte',
                 'Zona Oeste'
             ]
+        
+        if self.CRIME_LEVELS is None:
+            # Níveis de criminalidade, do menor para o maior
+            self.CRIME_LEVELS = [
+                'Muito Baixo',
+                'Baixo',
+                'Médio',
+                'Alto',
+                'Muito Alto'
+            ]
 
 
 @dataclass
@@ -170,8 +189,39 @@ class APIConfig:
     # Timeout padrão
     REQUEST_TIMEOUT: int = 30
     
-    # Retry
+    # Retry (backoff exponencial: RETRY_BACKOFF * 2^(tentativa - 1) segundos)
     MAX_RETRIES: int = 3
+    RETRY_BACKOFF: float = 0.5
+    
+    # Cliente HTTP compartilhado
+    USER_AGENT: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    HTTP_POOL_HOSTS: int = 10
+    
+    # Registros por página no datastore_search (Data.Rio)
+    DATASTORE_PAGE_SIZE: int = 5000
+    
+    # Prazo padrão (s) de cada fonte na coleta concorrente
+    SOURCE_DEADLINE: float = float(os.getenv('SOURCE_DEADLINE', '60'))
+    
+    # Downloads concorrentes (threads) e limite educado de requisições/s
+    HTTP_MAX_WORKERS: int = int(os.getenv('HTTP_MAX_WORKERS', '8'))
+    HTTP_RATE_LIMIT: float = float(os.getenv('HTTP_RATE_LIMIT', '4'))
+
+
+@dataclass
+class CacheConfig:
+    """Configuração dos caches de dados (memória e disco)"""
+    # Número máximo de entradas no cache LRU do processo
+    MAX_ENTRIES: int = int(os.getenv('CACHE_MAX_ENTRIES', '64'))
+    
+    # Orçamento em bytes (None = sem limite de tamanho)
+    MAX_BYTES: Optional[int] = int(os.getenv('CACHE_MAX_BYTES')) if os.getenv('CACHE_MAX_BYTES') else None
+    
+    # Cache em disco (data/cache) de DataFrames já limpos e tipados
+    DISK_ENABLED: bool = os.getenv('DISK_CACHE_ENABLED', '1') not in ('0', 'false', 'False')
+    
+    # Carga mapeada em memória (colunas .npy compartilhadas entre processos)
+    MMAP_ENABLED: bool = os.getenv('LOADER_MMAP', '0') in ('1', 'true', 'True')
 
 
 class AppConfig:
@@ -183,6 +233,7 @@ class AppConfig:
         self.crimes = CrimeConfig()
         self.models = ModelConfig()
         self.apis = APIConfig()
+        self.cache = CacheConfig()
         
         # Streamlit
         self.STREAMLIT_PAGE_TITLE = "🔒 Segurança Pública RJ"
@@ -11,6 +11,8 @@ from src.core.data_loader import (
     GeoDataLoader
 )
 
+from src.core.cube import CrimeCube
+
 from src.core.visualizer import (
     VisualizationFactory,
     TimeSeriesVisualizer,
@@ -23,6 +25,7 @@ __all__ = [
     'DataManager',
     'CrimeDataLoader',
     'GeoDataLoader',
+    'CrimeCube',
     'VisualizationFactory',
     'TimeSeriesVisualizer',
     'BarChartVisualizer',
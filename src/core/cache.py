@@ -0,0 +1,146 @@
+"""
+💾 CACHE - Cache de Processo para Carregadores
+==============================================
+
+Cache LRU compartilhado pelo processo inteiro, independente do
+Streamlit. Scripts, notebooks e workers usam o mesmo cache que o
+dashboard através de BaseDataLoader.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import logging
+
+import pandas as pd
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estima o tamanho em bytes de um valor armazenado no cache
+
+    Args:
+        value: Valor (DataFrame, GeoDataFrame, Series ou outro objeto)
+
+    Returns:
+        Tamanho aproximado em bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    nbytes = getattr(value, 'nbytes', None)
+    if nbytes is not None:
+        return int(nbytes)
+    return 0
+
+
+class LRUCache:
+    """Cache LRU limitado por número de entradas e, opcionalmente, por bytes"""
+
+    def __init__(self, max_entries: int = 64, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Busca valor no cache, marcando-o como usado recentemente
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            Valor armazenado ou None se ausente
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Armazena valor, descartando as entradas menos usadas se preciso
+
+        Valores maiores que o orçamento total não são armazenados.
+
+        Args:
+            key: Chave da entrada
+            value: Valor a armazenar
+        """
+        size = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+
+            if self.max_bytes is not None and size > self.max_bytes:
+                logger.debug(f"Valor de {size} bytes excede o orçamento do cache")
+                return
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove entradas antigas até respeitar os limites"""
+        while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Esvazia o cache (os contadores são mantidos)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com hits, misses, evictions, entradas e bytes
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Instância compartilhada pelo processo
+shared_cache = LRUCache(
+    max_entries=config.cache.MAX_ENTRIES,
+    max_bytes=config.cache.MAX_BYTES
+)
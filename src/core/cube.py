@@ -0,0 +1,585 @@
+"""
+🧊 CUBE - Cubo de Agregados Região × Crime × Mês
+================================================
+
+Agregados materializados sobre (região, tipo de crime, mês) em arrays
+NumPy densos, com soma, contagem, mínimo e máximo por célula de cada
+medida. Uma vez montado (uma passada sobre as linhas), qualquer
+agregação por mês, região ou crime é respondida somando fatias do cubo,
+em O(células), sem reler a tabela bruta.
+
+O eixo de regiões sobe na hierarquia territorial (RA → área/zona →
+município) com rollup(), usando REGIOES_INFO.
+
+Quando chegam meses novos, update() substitui só as fatias desses meses
+(o cubo pode ser persistido com save()/load() entre execuções).
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.core.regions import region_parents
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Eixos do cubo, na ordem dos arrays
+AXES = ('regiao', 'crime', 'mes')
+
+# Medidas padrão
+DEFAULT_VALUES = ('total_ocorrencias', 'taxa_100k')
+
+# Rótulo do eixo quando a coluna não existe nos dados
+ALL_LABEL = 'Total'
+
+
+def _axis_codes(values: Optional[pd.Series], n_rows: int):
+    """
+    Códigos inteiros e rótulos de um eixo categórico
+
+    Valores ausentes ganham um rótulo NaN no fim do eixo: entram nos
+    agregados dos outros eixos, mas não aparecem como grupo (como no
+    groupby com dropna=True).
+    """
+    if values is None:
+        return np.zeros(n_rows, dtype=np.intp), pd.Index([ALL_LABEL])
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy().astype(np.intp)
+        labels = values.cat.categories
+    else:
+        codes, labels = pd.factorize(values, sort=True)
+        codes = codes.astype(np.intp)
+        labels = pd.Index(labels)
+
+    missing = codes < 0
+    if missing.any():
+        codes[missing] = len(labels)
+        labels = labels.append(pd.Index([np.nan], dtype=object))
+    return codes, labels
+
+
+def _month_range(first: int, last: int) -> pd.DatetimeIndex:
+    """Eixo contínuo de meses entre dois ordinais (meses desde 1970-01)"""
+    return pd.date_range(np.datetime64(first, 'M'), periods=last - first + 1, freq='MS')
+
+
+def _month_ordinal(month: pd.Timestamp) -> int:
+    """Ordinal de um mês (meses desde 1970-01)"""
+    return (month.year - 1970) * 12 + month.month - 1
+
+
+class CrimeCube:
+    """Cubo denso de agregados de criminalidade"""
+
+    def __init__(self, regions: pd.Index, crimes: pd.Index, months: pd.DatetimeIndex,
+                 rows: np.ndarray, measures: Dict[str, Dict[str, np.ndarray]],
+                 columns: Optional[Dict[str, str]] = None):
+        self.regions = pd.Index(regions)
+        self.crimes = pd.Index(crimes)
+        self.months = pd.DatetimeIndex(months)
+        self.rows = rows
+        self.measures = measures
+        self.columns = columns or {'regiao': 'regiao_administrativa',
+                                   'crime': 'tipo_crime',
+                                   'mes': 'data'}
+
+    # ------------------------------------------------------------------
+    # Construção
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame,
+                   values: Iterable[str] = DEFAULT_VALUES,
+                   region_col: str = 'regiao_administrativa',
+                   crime_col: str = 'tipo_crime',
+                   date_col: str = 'data') -> 'CrimeCube':
+        """
+        Monta o cubo em uma única passada sobre as linhas
+
+        Colunas de região/crime ausentes viram um eixo de rótulo único.
+        O eixo de meses é contínuo entre o primeiro e o último mês; linhas
+        sem data ficam de fora.
+
+        Args:
+            df: DataFrame de criminalidade (formato longo)
+            values: Colunas numéricas a agregar (ausentes são ignoradas)
+            region_col: Coluna de região
+            crime_col: Coluna de tipo de crime
+            date_col: Coluna de data
+
+        Returns:
+            CrimeCube
+        """
+        n = len(df)
+        region_codes, regions = _axis_codes(df[region_col] if region_col in df.columns else None, n)
+        crime_codes, crimes = _axis_codes(df[crime_col] if crime_col in df.columns else None, n)
+
+        dates = df[date_col]
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = pd.to_datetime(dates)
+        valid = dates.notna().to_numpy()
+        # Meses desde 1970-01 (datetime64[M])
+        ordinal = dates.to_numpy().astype('datetime64[M]').astype(np.int64)
+
+        if valid.any():
+            first, last = int(ordinal[valid].min()), int(ordinal[valid].max())
+        else:
+            first, last = 0, -1
+        months = _month_range(first, last)
+
+        shape = (len(regions), len(crimes), len(months))
+        size = int(np.prod(shape))
+
+        month_codes = np.where(valid, ordinal - first, 0).astype(np.intp)
+        flat = np.ravel_multi_index(
+            (region_codes[valid], crime_codes[valid], month_codes[valid]), shape
+        ) if size else np.empty(0, dtype=np.intp)
+
+        rows = np.bincount(flat, minlength=size).reshape(shape)
+
+        measures = {}
+        for col in values:
+            if col not in df.columns:
+                continue
+
+            column = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)[valid]
+            present = ~np.isnan(column)
+            cells, observed = flat[present], column[present]
+
+            minimum = np.full(size, np.nan)
+            maximum = np.full(size, np.nan)
+            np.fmin.at(minimum, cells, observed)
+            np.fmax.at(maximum, cells, observed)
+
+            sums = np.bincount(cells, weights=observed, minlength=size)
+            if pd.api.types.is_integer_dtype(df[col]):
+                sums = np.rint(sums).astype(np.int64)
+
+            measures[col] = {
+                'sum': sums.reshape(shape),
+                'count': np.bincount(cells, minlength=size).reshape(shape),
+                'min': minimum.reshape(shape),
+                'max': maximum.reshape(shape)
+            }
+
+        logger.info(f"Cubo montado: {shape[0]} regiões × {shape[1]} crimes × {shape[2]} meses "
+                    f"({n} linhas)")
+        columns = {'regiao': region_col if region_col in df.columns else None,
+                   'crime': crime_col if crime_col in df.columns else None,
+                   'mes': date_col}
+        return cls(regions, crimes, months, rows, measures, columns)
+
+    # ------------------------------------------------------------------
+    # Propriedades
+    # ------------------------------------------------------------------
+
+    @property
+    def shape(self):
+        """Formato (regiões, crimes, meses)"""
+        return self.rows.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays (usada pelo cache LRU)"""
+        return int(self.rows.nbytes + sum(arr.nbytes for stats in self.measures.values()
+                                          for arr in stats.values()))
+
+    def __repr__(self) -> str:
+        return (f"CrimeCube(regioes={self.shape[0]}, crimes={self.shape[1]}, "
+                f"meses={self.shape[2]}, medidas={list(self.measures)})")
+
+    # ------------------------------------------------------------------
+    # Fatiamento e roll-up
+    # ------------------------------------------------------------------
+
+    def _take(self, region_idx: np.ndarray, crime_idx: np.ndarray,
+              month_idx: np.ndarray) -> 'CrimeCube':
+        """Sub-cubo com as posições informadas em cada eixo"""
+        index = np.ix_(region_idx, crime_idx, month_idx)
+        measures = {col: {stat: arr[index] for stat, arr in stats.items()}
+                    for col, stats in self.measures.items()}
+        return CrimeCube(self.regions[region_idx], self.crimes[crime_idx],
+                         self.months[month_idx], self.rows[index], measures, self.columns)
+
+    @staticmethod
+    def _positions(axis: pd.Index, labels: Optional[Union[str, Sequence]]) -> np.ndarray:
+        """Posições dos rótulos pedidos (todos se None)"""
+        if labels is None:
+            return np.arange(len(axis))
+        if isinstance(labels, str):
+            labels = [labels]
+        positions = axis.get_indexer(list(labels))
+        return np.sort(positions[positions >= 0])
+
+    def select(self, regions: Optional[Union[str, Sequence[str]]] = None,
+               crimes: Optional[Union[str, Sequence[str]]] = None,
+               start_date: Optional[Union[str, pd.Timestamp]] = None,
+               end_date: Optional[Union[str, pd.Timestamp]] = None) -> 'CrimeCube':
+        """
+        Recorta o cubo (mesma semântica de DataManager.query)
+
+        Args:
+            regions: Região ou lista de regiões
+            crimes: Tipo de crime ou lista de tipos
+            start_date: Data inicial (inclusiva)
+            end_date: Data final (inclusiva)
+
+        Returns:
+            Sub-cubo
+        """
+        month_mask = np.ones(len(self.months), dtype=bool)
+        if start_date is not None:
+            month_mask &= self.months >= pd.Timestamp(start_date).to_period('M').to_timestamp()
+        if end_date is not None:
+            month_mask &= self.months <= pd.Timestamp(end_date)
+
+        return self._take(self._positions(self.regions, regions),
+                          self._positions(self.crimes, crimes),
+                          np.flatnonzero(month_mask))
+
+    def rollup(self, level: str = 'area') -> 'CrimeCube':
+        """
+        Sobe o eixo de regiões na hierarquia territorial
+
+        Regiões fora de REGIOES_INFO são mantidas como estão.
+
+        Args:
+            level: 'area' (ou 'zona') ou 'municipio'
+
+        Returns:
+            Cubo com o eixo de regiões no nível pedido
+        """
+        parents = region_parents(level)
+        codes, groups = pd.factorize(pd.Index([parents.get(r, r) for r in self.regions]),
+                                     use_na_sentinel=False)
+        indicator = np.zeros((len(groups), len(self.regions)))
+        indicator[codes, np.arange(len(self.regions))] = 1
+
+        def add(arr):
+            return np.tensordot(indicator, arr, axes=(1, 0)).astype(arr.dtype, copy=False)
+
+        def reduce(ufunc, arr):
+            out = np.full((len(groups),) + arr.shape[1:], np.nan)
+            for group in range(len(groups)):
+                out[group] = ufunc.reduce(arr[codes == group], axis=0)
+            return out
+
+        measures = {
+            col: {
+                'sum': add(stats['sum']),
+                'count': add(stats['count']),
+                'min': reduce(np.fmin, stats['min']),
+                'max': reduce(np.fmax, stats['max'])
+            }
+            for col, stats in self.measures.items()
+        }
+        return CrimeCube(pd.Index(groups), self.crimes, self.months,
+                         add(self.rows), measures, self.columns)
+
+    # ------------------------------------------------------------------
+    # Manutenção incremental
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _extend(axis: pd.Index, labels: pd.Index) -> pd.Index:
+        """Acrescenta ao eixo os rótulos ainda não vistos"""
+        return axis.append(labels[~labels.isin(axis)])
+
+    def _reshape_axes(self, regions: pd.Index, crimes: pd.Index,
+                      months: pd.DatetimeIndex) -> None:
+        """Realoca os arrays para eixos maiores, preservando os valores"""
+        shape = (len(regions), len(crimes), len(months))
+        index = np.ix_(regions.get_indexer(self.regions), crimes.get_indexer(self.crimes),
+                       months.get_indexer(self.months))
+
+        def grown(arr, fill):
+            out = np.full(shape, fill, dtype=arr.dtype)
+            out[index] = arr
+            return out
+
+        self.rows = grown(self.rows, 0)
+        self.measures = {
+            col: {stat: grown(arr, np.nan if stat in ('min', 'max') else 0)
+                  for stat, arr in stats.items()}
+            for col, stats in self.measures.items()
+        }
+        self.regions, self.crimes, self.months = regions, crimes, months
+
+    def update(self, other: 'CrimeCube') -> None:
+        """
+        Substitui no lugar os meses que têm linhas em outro cubo
+
+        Usado na ingestão incremental: o cubo das partições novas ou
+        alteradas (um mês, tipicamente) sobrescreve só as fatias desses
+        meses. Os eixos crescem se aparecerem regiões, crimes ou meses
+        novos; medidas ausentes em other ficam zeradas nesses meses.
+
+        Args:
+            other: Cubo montado apenas com os meses a substituir
+        """
+        touched = other.months[other.rows.sum(axis=(0, 1)) > 0]
+        if len(touched) == 0:
+            return
+
+        regions = self._extend(self.regions, other.regions)
+        crimes = self._extend(self.crimes, other.crimes)
+        bounds = touched.append(self.months[[0, -1]]) if len(self.months) else touched
+        months = _month_range(_month_ordinal(bounds.min()), _month_ordinal(bounds.max()))
+        if (len(regions), len(crimes), len(months)) != self.shape:
+            self._reshape_axes(regions, crimes, months)
+
+        target = self.months.get_indexer(touched)
+        source = other.months.get_indexer(touched)
+        index = np.ix_(self.regions.get_indexer(other.regions),
+                       self.crimes.get_indexer(other.crimes), target)
+
+        self.rows[:, :, target] = 0
+        self.rows[index] = other.rows[:, :, source]
+        for col, stats in self.measures.items():
+            for stat, arr in stats.items():
+                arr[:, :, target] = np.nan if stat in ('min', 'max') else 0
+                if col in other.measures:
+                    arr[index] = other.measures[col][stat][:, :, source]
+
+        logger.info(f"Cubo atualizado: {len(touched)} mês(es) substituído(s)")
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """
+        Grava o cubo em um .npz (arrays + eixos em JSON)
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            Caminho gravado
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        def labels(axis):
+            return [None if pd.isna(label) else label for label in axis.tolist()]
+
+        meta = {
+            'regions': labels(self.regions),
+            'crimes': labels(self.crimes),
+            'first_month': _month_ordinal(self.months[0]) if len(self.months) else 0,
+            'n_months': len(self.months),
+            'columns': self.columns,
+            'measures': {col: list(stats) for col, stats in self.measures.items()}
+        }
+        arrays = {f"{col}__{stat}": arr for col, stats in self.measures.items()
+                  for stat, arr in stats.items()}
+
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(temp, 'wb') as handle:
+            np.savez(handle, meta=np.array(json.dumps(meta, default=str)),
+                     rows=self.rows, **arrays)
+        os.replace(temp, path)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CrimeCube':
+        """
+        Lê um cubo gravado com save()
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            CrimeCube
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            measures = {col: {stat: data[f"{col}__{stat}"] for stat in stats}
+                        for col, stats in meta['measures'].items()}
+            rows = data['rows']
+
+        def labels(values):
+            return pd.Index([np.nan if label is None else label for label in values])
+
+        return cls(labels(meta['regions']), labels(meta['crimes']),
+                   _month_range(meta['first_month'], meta['first_month'] + meta['n_months'] - 1),
+                   rows, measures, meta['columns'])
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def _reduce(self, column: str, stat: str, axes: tuple) -> np.ndarray:
+        """Reduz uma estatística de uma medida sobre os eixos informados"""
+        if column not in self.measures:
+            raise KeyError(f"Medida não agregada no cubo: {column}")
+
+        stats = self.measures[column]
+        if stat == 'sum':
+            return stats['sum'].sum(axis=axes)
+        if stat == 'count':
+            return stats['count'].sum(axis=axes)
+        if stat == 'mean':
+            count = stats['count'].sum(axis=axes)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(count > 0, stats['sum'].sum(axis=axes) / np.maximum(count, 1), np.nan)
+        # initial=NaN: fmin/fmax ignoram o NaN e um cubo vazio resulta em NaN
+        if stat == 'min':
+            return np.fmin.reduce(stats['min'], axis=axes, initial=np.nan)
+        if stat == 'max':
+            return np.fmax.reduce(stats['max'], axis=axes, initial=np.nan)
+        raise ValueError(f"Estatística não suportada: {stat}")
+
+    def _present(self, kept: Sequence[int], other: tuple, transpose: Sequence[int]) -> np.ndarray:
+        """Combinações com linhas e sem rótulo ausente nos eixos mantidos"""
+        present = self.rows.sum(axis=other).transpose(transpose) > 0
+        axis_labels = (self.regions, self.crimes, self.months)
+        for position, axis in enumerate(kept):
+            shape = [1] * len(kept)
+            shape[position] = -1
+            present &= np.asarray(axis_labels[axis].notna()).reshape(shape)
+        return present
+
+    def _column(self, axis: str) -> str:
+        """Nome de coluna de saída de um eixo"""
+        return self.columns.get(axis) or axis
+
+    def _labels(self, axis: str, positions: np.ndarray):
+        """Rótulos de um eixo para a saída (Categoricals para região/crime)"""
+        if axis == 'mes':
+            return self.months[positions]
+        labels = self.regions if axis == 'regiao' else self.crimes
+        valid = labels.notna()
+        if valid.all():
+            return pd.Categorical.from_codes(positions, categories=labels)
+        # Posições de rótulos ausentes nunca chegam aqui (ver _present)
+        remap = np.cumsum(valid) - 1
+        return pd.Categorical.from_codes(remap[positions], categories=labels[valid])
+
+    def aggregate(self, by: Sequence[str], stats: Dict[str, str]) -> pd.DataFrame:
+        """
+        Agrega o cubo pelos eixos pedidos, como um groupby().agg()
+
+        Só entram combinações com ao menos uma linha (equivalente a
+        groupby(observed=True)).
+
+        Args:
+            by: Eixos mantidos ('regiao', 'crime', 'mes')
+            stats: Medida -> estatística ('sum', 'count', 'mean', 'min', 'max')
+
+        Returns:
+            DataFrame com uma coluna por eixo (nomes originais) e por medida
+        """
+        by = list(by)
+        unknown = [axis for axis in by if axis not in AXES]
+        if unknown:
+            raise ValueError(f"Eixos desconhecidos: {unknown}")
+
+        kept = [AXES.index(axis) for axis in by]
+        other = tuple(i for i in range(len(AXES)) if i not in kept)
+        order = sorted(kept)
+        # Reordena os eixos mantidos na ordem pedida em `by`
+        transpose = [order.index(i) for i in kept]
+
+        present = self._present(kept, other, transpose)
+        positions = np.nonzero(present)
+
+        result = {self._column(axis): self._labels(axis, pos)
+                  for axis, pos in zip(by, positions)}
+        for column, stat in stats.items():
+            values = self._reduce(column, stat, other).transpose(transpose)
+            result[column] = values[positions]
+
+        return pd.DataFrame(result)
+
+    def by_month(self, stats: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Série mensal (padrão: soma de ocorrências e taxa média)"""
+        return self.aggregate(['mes'], stats or self._default_stats())
+
+    def by_region(self, stats: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Agregado por região (padrão: soma de ocorrências e taxa média)"""
+        return self.aggregate(['regiao'], stats or self._default_stats())
+
+    def by_crime(self, stats: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """Agregado por tipo de crime (padrão: soma de ocorrências e taxa média)"""
+        return self.aggregate(['crime'], stats or self._default_stats())
+
+    def _default_stats(self) -> Dict[str, str]:
+        """Soma para contagens e média para taxas"""
+        defaults = {'total_ocorrencias': 'sum', 'taxa_100k': 'mean'}
+        return {col: stat for col, stat in defaults.items() if col in self.measures}
+
+    def pivot(self, index: str = 'mes', columns: str = 'crime',
+              value: str = 'total_ocorrencias', stat: str = 'sum',
+              fill_value: Optional[float] = 0) -> pd.DataFrame:
+        """
+        Tabela larga entre dois eixos (como pivot_table)
+
+        Args:
+            index: Eixo das linhas
+            columns: Eixo das colunas
+            value: Medida
+            stat: Estatística
+            fill_value: Valor das combinações sem linhas (None = NaN)
+
+        Returns:
+            DataFrame largo
+        """
+        kept = [AXES.index(index), AXES.index(columns)]
+        other = tuple(i for i in range(len(AXES)) if i not in kept)
+        transpose = [sorted(kept).index(i) for i in kept]
+
+        values = self._reduce(value, stat, other).transpose(transpose).astype(float)
+        present = self._present(kept, other, transpose)
+        values[~present] = np.nan if fill_value is None else fill_value
+
+        rows = present.any(axis=1)
+        cols = present.any(axis=0)
+        axis_labels = {'regiao': self.regions, 'crime': self.crimes, 'mes': self.months}
+
+        table = pd.DataFrame(values[np.ix_(rows, cols)],
+                             index=axis_labels[index][rows],
+                             columns=axis_labels[columns][cols])
+        table.index.name = self._column(index)
+        table.columns.name = self._column(columns)
+        return table
+
+    def summary(self, value: str = 'total_ocorrencias', rate: str = 'taxa_100k') -> Dict:
+        """
+        Estatísticas resumidas (mesmas chaves de get_summary_statistics)
+
+        Returns:
+            Dicionário com totais, taxas e contagem de regiões/crimes
+        """
+        axes = (0, 1, 2)
+        rows_by_region = self.rows.sum(axis=(1, 2)) * self.regions.notna()
+        rows_by_crime = self.rows.sum(axis=(0, 2)) * self.crimes.notna()
+        return {
+            'total_occurrences': int(self._reduce(value, 'sum', axes)),
+            'mean_rate': float(self._reduce(rate, 'mean', axes)),
+            'max_rate': float(self._reduce(rate, 'max', axes)),
+            'min_rate': float(self._reduce(rate, 'min', axes)),
+            'n_regions': int((rows_by_region > 0).sum()) if self.columns['regiao'] else 0,
+            'n_crime_types': int((rows_by_crime > 0).sum()) if self.columns['crime'] else 0
+        }
+
+
+def as_cube(data: Union[pd.DataFrame, CrimeCube], **kwargs) -> CrimeCube:
+    """
+    Aceita DataFrame bruto ou cubo já montado
+
+    Args:
+        data: DataFrame de criminalidade ou CrimeCube
+        **kwargs: Repassados a CrimeCube.from_frame
+
+    Returns:
+        CrimeCube
+    """
+    return data if isinstance(data, CrimeCube) else CrimeCube.from_frame(data, **kwargs)
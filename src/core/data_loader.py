@@ -8,21 +8,50 @@ Classe responsável por carregar e gerenciar dados do projeto.
 import pandas as pd
 import geopandas as gpd
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Optional, List, Dict, Union, Any, Callable, Hashable
 from abc import ABC, abstractmethod
 import logging
 
 from src.config import config
+from src.core.cache import LRUCache, shared_cache
+from src.core.cube import CrimeCube, as_cube
+from src.core.disk_cache import DiskCache, shared_disk_cache
+from src.core.storage import ColumnarStore, Filter, build_filters, filter_frame, COLUMNAR_SUFFIX
+from src.core.geometry_store import GeometryStore, shared_geometry_store
+from src.core.mmap_store import MappedStore
+from src.core.schema import normalize_schema, SCHEMA_VERSION
+from src.core.sample_data import generate_crime_panel
 
 # Logger
 logger = logging.getLogger(__name__)
 
 
+def _as_list(value: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
+    """Normaliza filtro de valor único ou lista para lista"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Converte parâmetros (listas, filtros) em valores hasheáveis"""
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
 class BaseDataLoader(ABC):
     """Classe base abstrata para carregadores de dados"""
     
-    def __init__(self, cache_enabled: bool = True):
+    def __init__(self, cache_enabled: bool = True, cache: Optional[LRUCache] = None,
+                 disk_cache: Optional[DiskCache] = None):
         self.cache_enabled = cache_enabled
+        self.cache = cache if cache is not None else shared_cache
+        self.disk_cache = disk_cache if disk_cache is not None else shared_disk_cache
         self.config = config
     
     @abstractmethod
@@ -35,21 +64,74 @@ class BaseDataLoader(ABC):
         if df is None or df.empty:
             return False
         return True
+    
+    def _cache_key(self, path: Optional[Path], **params) -> Hashable:
+        """
+        Monta a chave de cache: carregador + arquivo (caminho, mtime,
+        tamanho) + parâmetros de leitura
+        """
+        if path is not None and path.exists():
+            stat = path.stat()
+            source = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        else:
+            source = (str(path) if path is not None else None,)
+        
+        return (type(self).__name__,) + source + _freeze(params)
+    
+    def _cached(self, key: Hashable, load_fn: Callable[[], Any]) -> Any:
+        """
+        Retorna o valor do cache ou carrega e armazena
+        
+        DataFrames são devolvidos como cópias rasas: atribuir colunas no
+        resultado não altera a entrada do cache.
+        """
+        if not self.cache_enabled:
+            return load_fn()
+        
+        value = self.cache.get(key)
+        if value is None:
+            value = load_fn()
+            if value is None:
+                return None
+            self.cache.put(key, value)
+        
+        if isinstance(value, pd.DataFrame):
+            return value.copy(deep=False)
+        return value
 
 
 class CrimeDataLoader(BaseDataLoader):
     """Carregador de dados de criminalidade"""
     
-    def __init__(self, cache_enabled: bool = True):
-        super().__init__(cache_enabled)
+    def __init__(self, cache_enabled: bool = True, cache: Optional[LRUCache] = None,
+                 disk_cache: Optional[DiskCache] = None, mmap_mode: Optional[bool] = None):
+        super().__init__(cache_enabled, cache, disk_cache)
         self.data_path = self.config.paths.DATA_PROCESSED
+        self.store = ColumnarStore(self.data_path)
+        self.mapped = MappedStore(self.data_path)
+        self.mmap_mode = self.config.cache.MMAP_ENABLED if mmap_mode is None else mmap_mode
     
-    def load(self, filename: Optional[str] = None) -> pd.DataFrame:
+    def load(self, filename: Optional[str] = None,
+             columns: Optional[List[str]] = None,
+             filters: Optional[List[Filter]] = None) -> pd.DataFrame:
         """
         Carrega dados de criminalidade
         
+        Arquivos .parquet (ou CSVs com cópia Parquet atualizada ao lado)
+        são lidos pelo backend colunar, decodificando apenas as colunas
+        e row groups necessários. Em todos os casos o resultado passa
+        por normalize_schema (Categoricals, contagens compactas e datas)
+        e fica no cache LRU do processo, chaveado por arquivo, mtime e
+        filtros.
+        
+        Com mmap_mode, a tabela é lida de colunas .npy mapeadas em memória
+        (geradas na primeira carga), compartilhadas entre processos; o
+        resultado sem filtros é somente leitura.
+        
         Args:
             filename: Nome do arquivo. Se None, gera dados simulados
+            columns: Colunas a carregar (None = todas)
+            filters: Predicados (coluna, operador, valor), ver build_filters
             
         Returns:
             DataFrame com dados de criminalidade
@@ -58,23 +140,57 @@ class CrimeDataLoader(BaseDataLoader):
             FileNotFoundError: Se arquivo especificado não existe
             ValueError: Se dados carregados estão inválidos
         """
+        key = self._cache_key(self._source_path(filename), filename=filename,
+                              columns=columns, filters=filters, mmap=self.mmap_mode)
+        return self._cached(key, lambda: self._read(filename, columns, filters, self.mmap_mode))
+    
+    def _source_path(self, filename: Optional[str]) -> Optional[Path]:
+        """Arquivo que será efetivamente lido para o nome pedido"""
+        if not filename:
+            return None
+        
+        file_path = self.data_path / filename
+        if file_path.suffix == COLUMNAR_SUFFIX or self.store.has_fresh_copy(file_path):
+            return self.store.path_for(file_path)
+        return file_path if file_path.exists() else None
+    
+    def _read(self, filename: Optional[str],
+              columns: Optional[List[str]],
+              filters: Optional[List[Filter]],
+              mapped: bool = False) -> pd.DataFrame:
+        """Lê os dados sem passar pelo cache"""
         try:
+            if filename and mapped:
+                df = self._read_mapped(filename, columns, filters)
+                if df is not None:
+                    return df
+            
             if filename:
                 file_path = self.data_path / filename
+                if file_path.suffix == COLUMNAR_SUFFIX or self.store.has_fresh_copy(file_path):
+                    logger.info(f"Carregando dados colunares de: {self.store.path_for(file_path)}")
+                    df = self.store.read(file_path, columns=columns, filters=filters)
+                    return normalize_schema(df, inplace=True)
+                
                 if file_path.exists():
                     logger.info(f"Carregando dados de: {file_path}")
-                    df = pd.read_csv(file_path)
-                    if self._validate_data(df):
-                        logger.info(f"Dados carregados com sucesso: {len(df)} linhas")
-                        return df
+                    if self.cache_enabled and self.disk_cache.enabled:
+                        df = self.disk_cache.fetch(
+                            file_path, 'crime', lambda: self._parse_csv(file_path),
+                            version=SCHEMA_VERSION,
+                            columns=self._needed_columns(columns, filters)
+                        )
                     else:
-                        raise ValueError(f"Dados inválidos em {filename}")
+                        df = self._parse_csv(file_path, self._csv_columns(file_path, columns, filters))
+                    df = self._project(filter_frame(df, filters), columns)
+                    logger.info(f"Dados carregados com sucesso: {len(df)} linhas")
+                    return df
                 else:
                     logger.warning(f"Arquivo não encontrado: {file_path}")
             
             # Retorna dados simulados se arquivo não existe
             logger.info("Gerando dados simulados")
-            return self._generate_sample_data()
+            return self._project(filter_frame(self._generate_sample_data(), filters), columns)
             
         except FileNotFoundError as e:
             logger.error(f"Arquivo não encontrado: {e}")
@@ -86,83 +202,204 @@ class CrimeDataLoader(BaseDataLoader):
             logger.error(f"Erro ao carregar dados: {e}")
             raise
     
+    def _read_mapped(self, filename: str,
+                     columns: Optional[List[str]],
+                     filters: Optional[List[Filter]]) -> Optional[pd.DataFrame]:
+        """
+        Lê a tabela de colunas mapeadas em memória, gerando-as se preciso
+        
+        Returns:
+            DataFrame filtrado ou None se o arquivo de origem não existe
+        """
+        source = self._source_path(filename)
+        if source is None:
+            return None
+        
+        if not self.mapped.has_fresh_copy(source):
+            self.mapped.write(self._read(filename, None, None), source)
+        
+        df = self.mapped.read(source, columns=self._needed_columns(columns, filters))
+        return self._project(filter_frame(df, filters), columns)
+    
+    @staticmethod
+    def _project(df: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+        """Mantém apenas as colunas pedidas (as de filtro podem ter sido lidas a mais)"""
+        if columns is None:
+            return df
+        return df[[col for col in columns if col in df.columns]]
+    
+    def _parse_csv(self, file_path: Path, usecols: Optional[List[str]] = None) -> pd.DataFrame:
+        """Lê e tipa um CSV processado"""
+        df = pd.read_csv(file_path, usecols=usecols)
+        if not self._validate_data(df):
+            raise ValueError(f"Dados inválidos em {file_path.name}")
+        return normalize_schema(df, inplace=True)
+    
+    @staticmethod
+    def _needed_columns(columns: Optional[List[str]],
+                        filters: Optional[List[Filter]]) -> Optional[List[str]]:
+        """Projeção + colunas usadas nos filtros"""
+        if columns is None:
+            return None
+        return list(columns) + [f[0] for f in filters or [] if f[0] not in columns]
+    
+    def _csv_columns(self, file_path: Path, columns: Optional[List[str]],
+                     filters: Optional[List[Filter]]) -> Optional[List[str]]:
+        """Colunas a ler do CSV: projeção + colunas usadas nos filtros"""
+        needed = self._needed_columns(columns, filters)
+        if needed is None:
+            return None
+        
+        header = pd.read_csv(file_path, nrows=0).columns
+        return [col for col in needed if col in header]
+    
+    def save(self, df: pd.DataFrame, filename: str) -> Path:
+        """
+        Salva dados de criminalidade no formato colunar
+        
+        Args:
+            df: DataFrame a salvar
+            filename: Nome do arquivo (a extensão vira .parquet)
+            
+        Returns:
+            Caminho do arquivo gravado
+        """
+        return self.store.write(df, filename)
+    
+    def convert_to_columnar(self, filename: str) -> Path:
+        """
+        Gera cópia Parquet de um CSV processado
+        
+        Depois da conversão, load(filename) passa a ler a cópia colunar
+        enquanto ela for mais recente que o CSV.
+        
+        Args:
+            filename: Nome do CSV em DATA_PROCESSED
+            
+        Returns:
+            Caminho do arquivo Parquet gerado
+        """
+        file_path = self.data_path / filename
+        if not file_path.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
+        
+        df = pd.read_csv(file_path)
+        return self.store.write(df, file_path)
+    
     def _generate_sample_data(self) -> pd.DataFrame:
         """Gera dados de exemplo para demonstração"""
-        import numpy as np
-        from datetime import datetime, timedelta
-        
-        np.random.seed(42)
-        
-        # Gera 5 anos de dados mensais
-        start_date = datetime(2020, 1, 1)
-        dates = pd.date_range(start=start_date, periods=60, freq='MS')
-        
-        data = []
-        for crime_type in self.config.crimes.CRIME_TYPES:
-            for region in self.config.crimes.REGIONS:
-                for date in dates:
-                    # Simula tendência + sazonalidade + ruído
-                    trend = 100 + np.random.normal(0, 10)
-                    seasonality = 20 * np.sin(date.month * 2 * np.pi / 12)
-                    noise = np.random.normal(0, 5)
-                    
-                    value = max(0, int(trend + seasonality + noise))
-                    
-                    data.append({
-                        'data': date,
-                        'tipo_crime': crime_type,
-                        'regiao_administrativa': region,
-                        'total_ocorrencias': value,
-                        'populacao': np.random.randint(100000, 500000),
-                        'taxa_100k': (value / 300000) * 100000
-                    })
-        
-        return pd.DataFrame(data)
+        # 5 anos de dados mensais: tendência + sazonalidade + ruído
+        df = generate_crime_panel(
+            self.config.crimes.CRIME_TYPES,
+            self.config.crimes.REGIONS,
+            pd.date_range(start='2020-01-01', periods=60, freq='MS'),
+            rate_denominator=300000,
+            base=100,
+            level_noise=10,
+            seasonal_amplitude=20,
+            noise=5
+        )
+        return normalize_schema(df, inplace=True)
+    
+    def filter(self, df: pd.DataFrame,
+               crime_types: Optional[Union[str, List[str]]] = None,
+               regions: Optional[Union[str, List[str]]] = None,
+               start_date: Optional[str] = None,
+               end_date: Optional[str] = None) -> pd.DataFrame:
+        """
+        Filtra dados por tipo de crime, região e período de uma só vez
+        
+        Os predicados são combinados em uma única máscara, sem cópias
+        intermediárias.
+        
+        Args:
+            df: DataFrame com dados de criminalidade
+            crime_types: Tipo de crime ou lista de tipos
+            regions: Região ou lista de regiões
+            start_date: Data inicial (inclusiva)
+            end_date: Data final (inclusiva)
+            
+        Returns:
+            DataFrame filtrado
+        """
+        filters = build_filters(_as_list(crime_types), _as_list(regions), start_date, end_date)
+        return filter_frame(df, filters)
     
     def filter_by_crime_type(self, df: pd.DataFrame, crime_type: str) -> pd.DataFrame:
         """Filtra dados por tipo de crime"""
-        return df[df['tipo_crime'] == crime_type].copy()
+        return self.filter(df, crime_types=crime_type)
     
     def filter_by_region(self, df: pd.DataFrame, region: str) -> pd.DataFrame:
         """Filtra dados por região"""
-        return df[df['regiao_administrativa'] == region].copy()
+        return self.filter(df, regions=region)
     
     def filter_by_date_range(self, df: pd.DataFrame, 
                              start_date: str, end_date: str) -> pd.DataFrame:
         """Filtra dados por período"""
-        df['data'] = pd.to_datetime(df['data'])
-        mask = (df['data'] >= start_date) & (df['data'] <= end_date)
-        return df[mask].copy()
+        return self.filter(df, start_date=start_date, end_date=end_date)
+    
+    def load_cube(self, filename: Optional[str] = None) -> CrimeCube:
+        """
+        Carrega o cubo de agregados região × crime × mês
+        
+        O cubo é montado uma vez por versão do arquivo e fica no cache do
+        processo; as agregações seguintes são fatias dele.
+        
+        Args:
+            filename: Nome do arquivo. Se None, usa dados simulados
+            
+        Returns:
+            CrimeCube
+        """
+        key = self._cache_key(self._source_path(filename), filename=filename, cube=True)
+        return self._cached(key, lambda: CrimeCube.from_frame(self.load(filename)))
     
-    def aggregate_by_month(self, df: pd.DataFrame) -> pd.DataFrame:
+    def aggregate_by_month(self, data: Union[pd.DataFrame, CrimeCube]) -> pd.DataFrame:
         """Agrega dados por mês"""
-        df['data'] = pd.to_datetime(df['data'])
-        return df.groupby('data').agg({
+        return as_cube(data).by_month({
             'total_ocorrencias': 'sum',
             'taxa_100k': 'mean'
-        }).reset_index()
+        })
     
-    def aggregate_by_region(self, df: pd.DataFrame) -> pd.DataFrame:
+    def aggregate_by_region(self, data: Union[pd.DataFrame, CrimeCube]) -> pd.DataFrame:
         """Agrega dados por região"""
-        return df.groupby('regiao_administrativa').agg({
+        return as_cube(data).by_region({
             'total_ocorrencias': 'sum',
             'taxa_100k': 'mean'
-        }).reset_index()
+        })
 
 
 class GeoDataLoader(BaseDataLoader):
     """Carregador de dados geoespaciais"""
     
-    def __init__(self, cache_enabled: bool = True):
-        super().__init__(cache_enabled)
+    # Versão de _process_geodataframe (incrementar ao mudar o processamento:
+    # invalida o cache em disco)
+    PIPELINE_VERSION = 1
+    
+    # Caminho em que cada arquivo foi encontrado (evita sondar de novo)
+    _resolved_paths: Dict[str, Path] = {}
+    
+    def __init__(self, cache_enabled: bool = True, cache: Optional[LRUCache] = None,
+                 disk_cache: Optional[DiskCache] = None,
+                 geometry_store: Optional[GeometryStore] = None):
+        super().__init__(cache_enabled, cache, disk_cache)
         self.shapefiles_path = self.config.paths.DATA_SHAPEFILES
+        self.geometry = geometry_store if geometry_store is not None else shared_geometry_store
     
-    def load(self, filename: str = "zonas_rio_limites_reais.geojson") -> Optional[gpd.GeoDataFrame]:
+    def load(self, filename: str = "zonas_rio_limites_reais.geojson",
+             zoom: Optional[float] = None,
+             width: Optional[int] = None) -> Optional[gpd.GeoDataFrame]:
         """
         Carrega dados geoespaciais
         
+        O GeoDataFrame de cada arquivo é lido uma vez por processo e fica no
+        GeometryStore, com versões simplificadas pré-calculadas. Informando
+        zoom ou width, as geometrias já vêm no nível de detalhe adequado.
+        
         Args:
             filename: Nome do arquivo GeoJSON
+            zoom: Nível de zoom do mapa (None = resolução completa)
+            width: Largura de saída em pixels (None = resolução completa)
             
         Returns:
             GeoDataFrame ou None se não encontrar
@@ -171,6 +408,12 @@ class GeoDataLoader(BaseDataLoader):
             FileNotFoundError: Se arquivo não encontrado em nenhum caminho
             ValueError: Se GeoDataFrame está vazio ou inválido
         """
+        resolved = self._resolved_paths.get(filename)
+        if resolved is not None and resolved.exists():
+            gdf = self._load_path(resolved)
+            if gdf is not None:
+                return self.geometry.for_view(gdf, zoom, width)
+        
         # Tenta múltiplos caminhos
         possible_paths = [
             self.shapefiles_path / filename,
@@ -180,27 +423,54 @@ class GeoDataLoader(BaseDataLoader):
         
         for path in possible_paths:
             if path.exists():
-                try:
-                    logger.info(f"Tentando carregar GeoJSON: {path}")
-                    gdf = gpd.read_file(path)
-                    if not gdf.empty:
-                        logger.info(f"GeoJSON carregado: {len(gdf)} geometrias")
-                        return self._process_geodataframe(gdf)
-                    else:
-                        logger.warning(f"GeoDataFrame vazio: {path}")
-                except FileNotFoundError:
-                    logger.error(f"Arquivo não encontrado: {path}")
-                    continue
-                except ValueError as e:
-                    logger.error(f"GeoJSON inválido: {e}")
-                    continue
-                except Exception as e:
-                    logger.error(f"Erro ao carregar GeoJSON: {e}")
-                    continue
+                gdf = self._load_path(path)
+                if gdf is not None:
+                    self._resolved_paths[filename] = path
+                    return self.geometry.for_view(gdf, zoom, width)
         
         logger.error(f"Arquivo {filename} não encontrado em nenhum caminho")
         return None
     
+    def _load_path(self, path: Path) -> Optional[gpd.GeoDataFrame]:
+        """Lê um arquivo pelo GeometryStore (lido uma vez por versão do arquivo)"""
+        if not self.cache_enabled:
+            return self._read(path)
+        
+        gdf = self.geometry.get(path)
+        if gdf is None:
+            gdf = self._read(path)
+            if gdf is None:
+                return None
+            self.geometry.put(path, gdf)
+        
+        return gdf.copy(deep=False)
+    
+    def _read(self, path: Path) -> Optional[gpd.GeoDataFrame]:
+        """Lê e processa um GeoJSON (via cache em disco, se habilitado)"""
+        try:
+            if self.cache_enabled:
+                return self.disk_cache.fetch(path, 'geo', lambda: self._parse(path),
+                                             version=self.PIPELINE_VERSION, geo=True)
+            return self._parse(path)
+        except FileNotFoundError:
+            logger.error(f"Arquivo não encontrado: {path}")
+        except ValueError as e:
+            logger.error(f"GeoJSON inválido: {e}")
+        except Exception as e:
+            logger.error(f"Erro ao carregar GeoJSON: {e}")
+        return None
+    
+    def _parse(self, path: Path) -> Optional[gpd.GeoDataFrame]:
+        """Lê e processa um GeoJSON"""
+        logger.info(f"Tentando carregar GeoJSON: {path}")
+        gdf = gpd.read_file(path)
+        if gdf.empty:
+            logger.warning(f"GeoDataFrame vazio: {path}")
+            return None
+        
+        logger.info(f"GeoJSON carregado: {len(gdf)} geometrias")
+        return self._process_geodataframe(gdf)
+    
     def _process_geodataframe(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """
         Processa GeoDataFrame após carregamento
@@ -239,7 +509,7 @@ class GeoDataLoader(BaseDataLoader):
         return gdf
     
     def merge_with_crime_data(self, gdf: gpd.GeoDataFrame, 
-                              crime_df: pd.DataFrame,
+                              crime_df: Union[pd.DataFrame, CrimeCube],
                               geometry_key: str = 'zona',
                               crime_key: str = 'regiao_administrativa') -> gpd.GeoDataFrame:
         """
@@ -247,7 +517,7 @@ class GeoDataLoader(BaseDataLoader):
         
         Args:
             gdf: GeoDataFrame com geometrias
-            crime_df: DataFrame com dados de crime
+            crime_df: DataFrame com dados de crime ou cubo de agregados
             geometry_key: Coluna do GeoDataFrame para junção (padrão: 'zona')
             crime_key: Coluna do crime_df para junção (padrão: 'regiao_administrativa')
             
@@ -264,11 +534,12 @@ class GeoDataLoader(BaseDataLoader):
                     logger.info(f"Usando coluna '{geometry_key}' para merge")
                     break
         
-        # Agrega dados de crime por região
-        crime_agg = crime_df.groupby(crime_key).agg({
+        # Agrega dados de crime por região (fatia do cubo)
+        crime_agg = as_cube(crime_df, region_col=crime_key).by_region({
             'total_ocorrencias': 'sum',
             'taxa_100k': 'mean'
-        }).reset_index()
+        })
+        crime_agg = crime_agg.rename(columns={crime_agg.columns[0]: crime_key})
         
         logger.info(f"Regiões nos dados de crime: {crime_agg[crime_key].unique().tolist()}")
         logger.info(f"Regiões no GeoDataFrame: {gdf[geometry_key].unique().tolist()}")
@@ -301,27 +572,85 @@ class DataManager:
     
     def get_crime_data(self, filename: Optional[str] = None,
                        crime_type: Optional[str] = None,
-                       region: Optional[str] = None) -> pd.DataFrame:
+                       region: Optional[str] = None,
+                       columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Obtém dados de criminalidade com filtros opcionais
         
+        Os filtros são repassados ao leitor, que os aplica direto nos
+        row groups quando o arquivo está em formato colunar.
+        
         Args:
             filename: Nome do arquivo
             crime_type: Filtro por tipo de crime
             region: Filtro por região
+            columns: Colunas a carregar (None = todas)
             
         Returns:
             DataFrame filtrado
         """
-        df = self.crime_loader.load(filename)
+        return self.query(filename, crime_types=crime_type, regions=region, columns=columns)
+    
+    def query(self, filename: Optional[str] = None,
+              crime_types: Optional[Union[str, List[str]]] = None,
+              regions: Optional[Union[str, List[str]]] = None,
+              start_date: Optional[str] = None,
+              end_date: Optional[str] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Consulta dados de criminalidade com todos os filtros em uma chamada
         
-        if crime_type:
-            df = self.crime_loader.filter_by_crime_type(df, crime_type)
+        Os predicados vão para o leitor: em arquivos colunares viram
+        filtros de row group; em CSV ou dados simulados viram uma única
+        máscara combinada.
         
-        if region:
-            df = self.crime_loader.filter_by_region(df, region)
+        Args:
+            filename: Nome do arquivo
+            crime_types: Tipo de crime ou lista de tipos
+            regions: Região ou lista de regiões
+            start_date: Data inicial (inclusiva)
+            end_date: Data final (inclusiva)
+            columns: Colunas a carregar (None = todas)
+            
+        Returns:
+            DataFrame filtrado
+        """
+        filters = build_filters(_as_list(crime_types), _as_list(regions), start_date, end_date)
+        return self.crime_loader.load(filename, columns=columns, filters=filters)
+    
+    def save_crime_data(self, df: pd.DataFrame, filename: str) -> Path:
+        """
+        Salva dados de criminalidade no formato colunar
         
-        return df
+        Args:
+            df: DataFrame a salvar
+            filename: Nome do arquivo
+            
+        Returns:
+            Caminho do arquivo gravado
+        """
+        return self.crime_loader.save(df, filename)
+    
+    def get_cube(self, filename: Optional[str] = None) -> CrimeCube:
+        """
+        Obtém o cubo de agregados região × crime × mês
+        
+        Args:
+            filename: Nome do arquivo
+            
+        Returns:
+            CrimeCube (recorte com .select, roll-up com .rollup)
+        """
+        return self.crime_loader.load_cube(filename)
+    
+    def cache_stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache de processo dos carregadores
+        
+        Returns:
+            Dicionário com hits, misses, evictions, entradas e bytes
+        """
+        return self.crime_loader.cache.stats()
     
     def get_geo_data(self, filename: str = "zonas_rio_limites_reais.geojson",
                      include_crime_data: bool = False) -> Optional[gpd.GeoDataFrame]:
@@ -338,19 +667,11 @@ class DataManager:
         gdf = self.geo_loader.load(filename)
         
         if gdf is not None and include_crime_data:
-            crime_df = self.crime_loader.load()
-            gdf = self.geo_loader.merge_with_crime_data(gdf, crime_df)
+            gdf = self.geo_loader.merge_with_crime_data(gdf, self.crime_loader.load_cube())
         
         return gdf
     
-    def get_summary_statistics(self, df: pd.DataFrame) -> Dict:
-        """Calcula estatísticas resumidas"""
-        return {
-            'total_occurrences': int(df['total_ocorrencias'].sum()),
-            'mean_rate': float(df['taxa_100k'].mean()),
-            'max_rate': float(df['taxa_100k'].max()),
-            'min_rate': float(df['taxa_100k'].min()),
-            'n_regions': df['regiao_administrativa'].nunique() if 'regiao_administrativa' in df.columns else 0,
-            'n_crime_types': df['tipo_crime'].nunique() if 'tipo_crime' in df.columns else 0
-        }
+    def get_summary_statistics(self, data: Union[pd.DataFrame, CrimeCube]) -> Dict:
+        """Calcula estatísticas resumidas (a partir do cubo de agregados)"""
+        return as_cube(data).summary()
 
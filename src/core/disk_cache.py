@@ -0,0 +1,196 @@
+"""
+🗄️ DISK CACHE - Cache Persistente em Disco
+==========================================
+
+Segundo nível de cache, abaixo do LRU em memória. Guarda em
+data/cache DataFrames (e GeoDataFrames) já limpos e tipados, em
+Parquet/GeoParquet, chaveados pelo hash do conteúdo do arquivo de
+origem mais a versão do pipeline que os produziu.
+
+Um novo processo (restart do Streamlit, worker, script) reaproveita o
+resultado sem reparsear CSV/GeoJSON nem repetir a limpeza. Quando o
+arquivo de origem muda, o hash muda e a entrada antiga é descartada.
+"""
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from src.config import config
+from src.core.storage import PYARROW_AVAILABLE, COLUMNAR_SUFFIX
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Tamanho dos blocos lidos ao calcular o hash
+HASH_CHUNK_SIZE = 1 << 20
+
+# Hashes já calculados: caminho -> (mtime_ns, tamanho, hash)
+_hash_memo: Dict[str, Tuple[int, int, str]] = {}
+_hash_lock = threading.Lock()
+
+
+def content_hash(path: Path) -> str:
+    """
+    Calcula o hash (BLAKE2b) do conteúdo de um arquivo
+
+    O resultado é memorizado por (mtime, tamanho), então o arquivo só é
+    relido quando muda.
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Hash hexadecimal do conteúdo
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    memo_key = str(path)
+
+    with _hash_lock:
+        memo = _hash_memo.get(memo_key)
+    if memo is not None and memo[:2] == (stat.st_mtime_ns, stat.st_size):
+        return memo[2]
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    value = digest.hexdigest()
+    with _hash_lock:
+        _hash_memo[memo_key] = (stat.st_mtime_ns, stat.st_size, value)
+    return value
+
+
+class DiskCache:
+    """Cache de DataFrames em Parquet, chaveado por conteúdo + versão"""
+
+    def __init__(self, base_path: Optional[Path] = None, enabled: bool = True):
+        self.base_path = Path(base_path or config.paths.DATA_CACHE)
+        self.enabled = enabled and PYARROW_AVAILABLE
+
+    def _prefix(self, source: Path, namespace: str) -> str:
+        """Prefixo comum a todas as versões de uma mesma origem"""
+        location = hashlib.blake2b(str(source.resolve()).encode('utf-8'), digest_size=4)
+        return f"{namespace}__{source.stem}-{location.hexdigest()}__"
+
+    def path_for(self, source: Path, namespace: str, version: Any = '') -> Path:
+        """
+        Caminho da entrada de cache para a versão atual da origem
+
+        Args:
+            source: Arquivo de origem
+            namespace: Identifica quem produz o dado (ex.: 'crime', 'geo')
+            version: Versão do pipeline de limpeza/tipagem
+
+        Returns:
+            Caminho do arquivo Parquet da entrada
+        """
+        source = Path(source)
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(content_hash(source).encode('ascii'))
+        digest.update(f"{namespace}:{version}".encode('utf-8'))
+        return self.base_path / f"{self._prefix(source, namespace)}{digest.hexdigest()}{COLUMNAR_SUFFIX}"
+
+    def fetch(self, source: Path, namespace: str,
+              build_fn: Callable[[], Optional[pd.DataFrame]],
+              version: Any = '',
+              columns: Optional[List[str]] = None,
+              geo: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Lê a entrada do cache ou a constrói e grava
+
+        Args:
+            source: Arquivo de origem (o hash do conteúdo entra na chave)
+            namespace: Identifica quem produz o dado (ex.: 'crime', 'geo')
+            build_fn: Função que lê e limpa a origem (chamada no miss)
+            version: Versão do pipeline de limpeza/tipagem
+            columns: Colunas a ler na entrada (None = todas)
+            geo: Se o valor é um GeoDataFrame (GeoParquet)
+
+        Returns:
+            DataFrame (ou GeoDataFrame) limpo
+        """
+        if not self.enabled:
+            return self._project(build_fn(), columns)
+
+        try:
+            entry = self.path_for(source, namespace, version)
+        except OSError as e:
+            logger.warning(f"Não foi possível calcular o hash de {source}: {e}")
+            return self._project(build_fn(), columns)
+
+        if entry.exists():
+            try:
+                df = self._read(entry, columns, geo)
+                logger.info(f"Cache em disco: {entry.name}")
+                return df
+            except Exception as e:
+                logger.warning(f"Entrada de cache ilegível ({entry.name}): {e}")
+
+        df = build_fn()
+        if df is not None and not df.empty:
+            self._write(entry, df, geo)
+            self._prune(Path(source), namespace, keep=entry)
+
+        return self._project(df, columns)
+
+    @staticmethod
+    def _project(df: Optional[pd.DataFrame], columns: Optional[List[str]]) -> Optional[pd.DataFrame]:
+        """Seleciona colunas existentes (None = todas)"""
+        if df is None or not columns:
+            return df
+        return df[[col for col in columns if col in df.columns]]
+
+    @staticmethod
+    def _read(entry: Path, columns: Optional[List[str]], geo: bool) -> pd.DataFrame:
+        """Lê uma entrada Parquet/GeoParquet"""
+        if geo:
+            import geopandas as gpd
+            return gpd.read_parquet(entry, columns=columns)
+        return pd.read_parquet(entry, columns=columns)
+
+    def _write(self, entry: Path, df: pd.DataFrame, geo: bool) -> None:
+        """Grava a entrada de forma atômica (arquivo temporário + rename)"""
+        temp = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        try:
+            self.base_path.mkdir(parents=True, exist_ok=True)
+            if geo:
+                df.to_parquet(temp, index=False)
+            else:
+                df.to_parquet(temp, engine='pyarrow')
+            os.replace(temp, entry)
+            logger.info(f"Cache em disco gravado: {entry.name}")
+        except Exception as e:
+            logger.warning(f"Não foi possível gravar cache em disco: {e}")
+            temp.unlink(missing_ok=True)
+
+    def _prune(self, source: Path, namespace: str, keep: Path) -> None:
+        """Remove entradas de versões anteriores da mesma origem"""
+        for stale in self.base_path.glob(f"{self._prefix(source, namespace)}*{COLUMNAR_SUFFIX}"):
+            if stale != keep:
+                stale.unlink(missing_ok=True)
+                logger.debug(f"Cache em disco obsoleto removido: {stale.name}")
+
+    def clear(self) -> int:
+        """
+        Remove todas as entradas do cache em disco
+
+        Returns:
+            Número de arquivos removidos
+        """
+        removed = 0
+        for entry in self.base_path.glob(f"*__*{COLUMNAR_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+
+# Instância compartilhada pelo processo
+shared_disk_cache = DiskCache(enabled=config.cache.DISK_ENABLED)
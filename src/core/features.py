@@ -0,0 +1,186 @@
+"""
+⏱️ FEATURES - Lags, Médias Móveis e Diferenças por Grupo
+========================================================
+
+Motor único de features temporais, usado pelo DataCleaner, pelo
+TemporalAnalyzer e pelos modelos preditivos.
+
+As linhas são ordenadas uma única vez por (grupo, data), o que deixa
+cada série em um bloco contíguo. Sobre cada coluna de valores é aberta
+uma janela deslizante (view strided do NumPy, sem cópia) que dá, de uma
+vez, todos os lags, médias móveis e diferenças para todos os grupos;
+posições que cruzariam a fronteira de um grupo viram NaN. O resultado é
+uma matriz float32 compacta.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Tipo das features
+FEATURE_DTYPE = np.float32
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """Features a calcular e seus nomes ({col} = coluna ou apelido, {n} = passo)"""
+    lags: Tuple[int, ...] = (1, 3, 6, 12)
+    windows: Tuple[int, ...] = (3, 6, 12)
+    diffs: Tuple[int, ...] = (1, 2)
+    lag_name: str = '{col}_lag_{n}'
+    window_name: str = '{col}_ma_{n}'
+    diff_name: str = '{col}_diff_{n}'
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def span(self) -> int:
+        """Maior distância para trás usada por alguma feature"""
+        return max(self.lags + self.diffs + tuple(w - 1 for w in self.windows) + (0,))
+
+    def names(self, column: str) -> List[str]:
+        """Nomes das features de uma coluna, na ordem da matriz"""
+        col = self.aliases.get(column, column)
+        return ([self.lag_name.format(col=col, n=n) for n in self.lags]
+                + [self.window_name.format(col=col, n=n) for n in self.windows]
+                + [self.diff_name.format(col=col, n=n) for n in self.diffs])
+
+
+@dataclass
+class FeatureMatrix:
+    """Matriz de features na ordem (grupo, data)"""
+    values: np.ndarray
+    columns: List[str]
+    order: np.ndarray
+    index: pd.Index
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame das features, indexado pelo índice original das linhas"""
+        return pd.DataFrame(self.values, index=self.index, columns=self.columns)
+
+
+def _sort_order(df: pd.DataFrame, order_col: Optional[str],
+                group_cols: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Ordem estável por (grupo, data) e código do grupo de cada linha ordenada"""
+    n = len(df)
+    groups = (df.groupby(list(group_cols), sort=True, dropna=False).ngroup().to_numpy()
+              if group_cols else np.zeros(n, dtype=np.int64))
+
+    keys = [groups]
+    if order_col is not None:
+        order_values = df[order_col].to_numpy()
+        if order_values.dtype.kind == 'M':
+            order_values = order_values.view('i8')
+        keys.insert(0, order_values)
+
+    order = np.lexsort(keys)
+    return order, groups[order]
+
+
+def _position_in_group(groups: np.ndarray) -> np.ndarray:
+    """Posição de cada linha dentro do seu bloco (0 = primeira do grupo)"""
+    n = len(groups)
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]]) if n else np.array([], int)
+    block_start = np.repeat(starts, np.diff(np.r_[starts, n]))
+    return np.arange(n) - block_start
+
+
+def build_features(df: pd.DataFrame, value_cols: Union[str, Sequence[str]],
+                   order_col: Optional[str] = None,
+                   group_cols: Union[str, Sequence[str], None] = None,
+                   spec: Optional[FeatureSpec] = None) -> FeatureMatrix:
+    """
+    Calcula lags, médias móveis e diferenças de todas as colunas e grupos
+
+    Semântica igual à do pandas por grupo: shift(n), rolling(w).mean()
+    (NaN se faltar algum valor na janela) e diff(n).
+
+    Args:
+        df: DataFrame com as séries
+        value_cols: Colunas de valores
+        order_col: Coluna de ordenação (data); None = ordem atual
+        group_cols: Colunas que identificam cada série (None = série única)
+        spec: Features a calcular (padrão: FeatureSpec())
+
+    Returns:
+        FeatureMatrix (float32) na ordem (grupo, data)
+    """
+    spec = spec or FeatureSpec()
+    value_cols = [value_cols] if isinstance(value_cols, str) else list(value_cols)
+    group_cols = [group_cols] if isinstance(group_cols, str) else list(group_cols or [])
+
+    order, groups = _sort_order(df, order_col, group_cols)
+    position = _position_in_group(groups)
+    span = spec.span
+    n = len(order)
+
+    blocks = []
+    for column in value_cols:
+        x = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64,
+                                                                na_value=np.nan)[order]
+
+        # Janela [i - span, ..., i] de cada linha (view, sem cópia)
+        padded = np.concatenate([np.full(span, np.nan), x])
+        window = sliding_window_view(padded, span + 1)
+
+        features = np.empty((n, len(spec.names(column))), dtype=FEATURE_DTYPE)
+        k = 0
+        for lag in spec.lags:
+            features[:, k] = np.where(position >= lag, window[:, span - lag], np.nan)
+            k += 1
+        for size in spec.windows:
+            means = window[:, span - size + 1:].mean(axis=1)
+            features[:, k] = np.where(position >= size - 1, means, np.nan)
+            k += 1
+        for step in spec.diffs:
+            features[:, k] = np.where(position >= step, x - window[:, span - step], np.nan)
+            k += 1
+        blocks.append(features)
+
+    values = np.hstack(blocks) if blocks else np.empty((n, 0), dtype=FEATURE_DTYPE)
+    columns = [name for column in value_cols for name in spec.names(column)]
+    return FeatureMatrix(values, columns, order, df.index[order])
+
+
+def add_features(df: pd.DataFrame, value_cols: Union[str, Sequence[str]],
+                 order_col: Optional[str] = None,
+                 group_cols: Union[str, Sequence[str], None] = None,
+                 spec: Optional[FeatureSpec] = None) -> pd.DataFrame:
+    """
+    Ordena por (grupo, data) e acrescenta as features como colunas
+
+    Args:
+        df: DataFrame com as séries
+        value_cols: Colunas de valores
+        order_col: Coluna de ordenação (data)
+        group_cols: Colunas que identificam cada série
+        spec: Features a calcular
+
+    Returns:
+        Novo DataFrame ordenado, com as colunas de features (float32)
+    """
+    matrix = build_features(df, value_cols, order_col, group_cols, spec)
+    result = df.take(matrix.order)
+    features = pd.DataFrame(matrix.values, index=result.index, columns=matrix.columns)
+    return pd.concat([result.drop(columns=matrix.columns, errors='ignore'), features], axis=1)
+
+
+def lag_windows(serie: Sequence[float], n_lags: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Matriz supervisionada de uma série: cada linha são os n_lags valores
+    anteriores e o alvo é o valor seguinte
+
+    Args:
+        serie: Série temporal
+        n_lags: Número de lags por linha
+
+    Returns:
+        (X, y) com X de forma (len(serie) - n_lags, n_lags)
+    """
+    serie = np.asarray(serie, dtype=np.float64)
+    if len(serie) <= n_lags:
+        return np.empty((0, n_lags)), np.empty(0)
+    X = sliding_window_view(serie[:-1], n_lags)
+    return X, serie[n_lags:]
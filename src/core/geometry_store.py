@@ -0,0 +1,206 @@
+"""
+🗺️ GEOMETRY STORE - Geometrias em Cache com Níveis de Detalhe
+=============================================================
+
+Guarda os GeoDataFrames já lidos (um por arquivo) e pré-calcula versões
+simplificadas das geometrias em várias tolerâncias. Na hora de desenhar,
+o mapa recebe o nível de detalhe compatível com o zoom ou com a largura
+de saída: não adianta mandar ao navegador vértices menores que um pixel.
+
+As geometrias simplificadas são indexadas pelo hash do WKB de cada
+geometria original, então continuam valendo depois de merges, filtros e
+reordenações do GeoDataFrame.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+import geopandas as gpd
+import shapely
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Largura de um tile em pixels (Web Mercator)
+TILE_SIZE = 256
+
+
+def degrees_per_pixel(zoom: Optional[float] = None,
+                      width: Optional[int] = None,
+                      bounds: Optional[Tuple[float, float, float, float]] = None) -> Optional[float]:
+    """
+    Estima quantos graus de longitude cabem em um pixel do mapa
+
+    Args:
+        zoom: Nível de zoom do mapa (tiles Web Mercator)
+        width: Largura de saída em pixels (usa a extensão de bounds)
+        bounds: (minx, miny, maxx, maxy) das geometrias
+
+    Returns:
+        Graus por pixel ou None se não há informação de visualização
+    """
+    if zoom is not None:
+        return 360.0 / (TILE_SIZE * 2 ** zoom)
+    if width and bounds is not None:
+        return (bounds[2] - bounds[0]) / width
+    return None
+
+
+class GeometryStore:
+    """Cache de GeoDataFrames por arquivo e de geometrias simplificadas"""
+
+    def __init__(self, tolerances: Optional[List[float]] = None):
+        self.tolerances = sorted(tolerances if tolerances is not None
+                                 else config.maps.LOD_TOLERANCES)
+        self._frames: Dict[str, Tuple[int, int, gpd.GeoDataFrame]] = {}
+        self._levels: Dict[float, Dict[int, object]] = {tol: {} for tol in self.tolerances}
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # GeoDataFrames por arquivo
+    # ------------------------------------------------------------------
+
+    def get(self, path: Path) -> Optional[gpd.GeoDataFrame]:
+        """
+        Retorna o GeoDataFrame já lido de um arquivo, se ainda atual
+
+        Args:
+            path: Caminho do arquivo de origem
+
+        Returns:
+            GeoDataFrame ou None se ausente ou se o arquivo mudou
+        """
+        stat = path.stat()
+        with self._lock:
+            entry = self._frames.get(str(path.resolve()))
+        if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return entry[2]
+
+    def put(self, path: Path, gdf: gpd.GeoDataFrame) -> None:
+        """
+        Guarda o GeoDataFrame de um arquivo e pré-calcula seus níveis de detalhe
+
+        Args:
+            path: Caminho do arquivo de origem
+            gdf: GeoDataFrame processado
+        """
+        stat = path.stat()
+        self.register(gdf.geometry)
+        with self._lock:
+            self._frames[str(path.resolve())] = (stat.st_mtime_ns, stat.st_size, gdf)
+
+    # ------------------------------------------------------------------
+    # Níveis de detalhe
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _keys(geometry: gpd.GeoSeries) -> np.ndarray:
+        """Hash do WKB de cada geometria"""
+        return pd.util.hash_array(shapely.to_wkb(geometry.to_numpy()))
+
+    def register(self, geometry: gpd.GeoSeries) -> None:
+        """
+        Pré-calcula as geometrias simplificadas em todas as tolerâncias
+
+        Args:
+            geometry: Geometrias em resolução completa
+        """
+        keys = self._keys(geometry)
+        for tolerance in self.tolerances:
+            self._simplify_missing(geometry, keys, tolerance)
+
+    def _simplify_missing(self, geometry: gpd.GeoSeries, keys: np.ndarray,
+                          tolerance: float) -> Dict[int, object]:
+        """Simplifica (em lote) só as geometrias ainda não vistas"""
+        with self._lock:
+            level = self._levels[tolerance]
+            missing = np.fromiter((key not in level for key in keys), dtype=bool, count=len(keys))
+
+        if missing.any():
+            simplified = shapely.simplify(geometry.to_numpy()[missing], tolerance,
+                                          preserve_topology=True)
+            with self._lock:
+                level.update(zip(keys[missing].tolist(), simplified))
+
+        return level
+
+    def tolerance_for(self, zoom: Optional[float] = None,
+                      width: Optional[int] = None,
+                      bounds: Optional[Tuple[float, float, float, float]] = None) -> float:
+        """
+        Escolhe a maior tolerância que não ultrapassa um pixel
+
+        Args:
+            zoom: Nível de zoom do mapa
+            width: Largura de saída em pixels
+            bounds: (minx, miny, maxx, maxy) das geometrias
+
+        Returns:
+            Tolerância em graus (0.0 = resolução completa)
+        """
+        pixel = degrees_per_pixel(zoom, width, bounds)
+        if pixel is None:
+            return 0.0
+        return max((tol for tol in self.tolerances if tol <= pixel), default=0.0)
+
+    def simplified(self, geometry: gpd.GeoSeries, tolerance: float) -> gpd.GeoSeries:
+        """
+        Retorna as geometrias no nível de detalhe pedido
+
+        Args:
+            geometry: Geometrias em resolução completa
+            tolerance: Uma das tolerâncias configuradas (0.0 = original)
+
+        Returns:
+            GeoSeries simplificada, com o mesmo índice e CRS
+        """
+        if tolerance not in self._levels:
+            return geometry
+
+        keys = self._keys(geometry)
+        level = self._simplify_missing(geometry, keys, tolerance)
+        with self._lock:
+            values = [level[key] for key in keys.tolist()]
+        return gpd.GeoSeries(values, index=geometry.index, crs=geometry.crs)
+
+    def for_view(self, gdf: gpd.GeoDataFrame,
+                 zoom: Optional[float] = None,
+                 width: Optional[int] = None) -> gpd.GeoDataFrame:
+        """
+        Troca as geometrias pelo nível de detalhe adequado à visualização
+
+        Args:
+            gdf: GeoDataFrame em resolução completa
+            zoom: Nível de zoom do mapa
+            width: Largura de saída em pixels
+
+        Returns:
+            GeoDataFrame com geometrias simplificadas (ou o próprio gdf)
+        """
+        if gdf is None or gdf.empty:
+            return gdf
+
+        tolerance = self.tolerance_for(zoom, width, tuple(gdf.total_bounds))
+        if tolerance == 0.0:
+            return gdf
+
+        logger.debug(f"Nível de detalhe: tolerância {tolerance}°")
+        return gdf.set_geometry(self.simplified(gdf.geometry, tolerance))
+
+    def clear(self) -> None:
+        """Esvazia os GeoDataFrames e os níveis de detalhe"""
+        with self._lock:
+            self._frames.clear()
+            for level in self._levels.values():
+                level.clear()
+
+
+# Instância compartilhada pelo processo
+shared_geometry_store = GeometryStore()
@@ -0,0 +1,180 @@
+"""
+🧷 MMAP STORE - Colunas Mapeadas em Memória
+===========================================
+
+Armazena cada coluna de um DataFrame como um arquivo .npy e o reabre com
+np.load(mmap_mode='r'). O DataFrame resultante aponta direto para as
+páginas do arquivo: vários processos (workers do Streamlit) que abrem a
+mesma tabela compartilham a memória física em vez de cada um manter a
+sua cópia.
+
+Os DataFrames lidos são somente leitura. Filtros e agregações funcionam
+normalmente (produzem novos objetos); alterações no lugar levantam erro.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.core.schema import SCHEMA_VERSION
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Sufixo do diretório com as colunas
+MAPPED_SUFFIX = '.cols'
+
+# Arquivo de metadados dentro do diretório
+META_FILE = '_meta.json'
+
+
+def _codes_dtype(n_categories: int) -> np.dtype:
+    """Menor inteiro com sinal que comporta os códigos (e o -1 de ausente)"""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class MappedStore:
+    """Armazenamento de DataFrames em colunas .npy mapeáveis em memória"""
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+
+    def path_for(self, filename: Union[str, Path]) -> Path:
+        """Retorna o diretório de colunas correspondente a um arquivo"""
+        path = Path(filename)
+        if not path.is_absolute():
+            path = self.base_path / path
+        return path.with_suffix(MAPPED_SUFFIX)
+
+    def has_fresh_copy(self, source: Path) -> bool:
+        """
+        Verifica se existe cópia mapeável atualizada de um arquivo fonte
+
+        Args:
+            source: Caminho do arquivo original (CSV ou Parquet)
+
+        Returns:
+            True se a cópia existe, é mais recente que a fonte e foi
+            gravada com o schema de carga atual
+        """
+        meta_path = self.path_for(source) / META_FILE
+        if not meta_path.exists():
+            return False
+
+        try:
+            meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+
+        if meta.get('schema_version') != SCHEMA_VERSION:
+            return False
+        if not source.exists():
+            return True
+        return meta_path.stat().st_mtime >= source.stat().st_mtime
+
+    def write(self, df: pd.DataFrame, filename: Union[str, Path]) -> Path:
+        """
+        Grava cada coluna do DataFrame como um .npy
+
+        Colunas numéricas, booleanas e de data vão como estão. Categoricals
+        viram códigos inteiros + categorias nos metadados; demais colunas
+        (texto, tipos de extensão) são fatoradas e voltam como Categorical.
+
+        Args:
+            df: DataFrame a gravar
+            filename: Nome (ou caminho) do arquivo de referência
+
+        Returns:
+            Caminho do diretório gravado
+        """
+        target = self.path_for(filename)
+        temp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.rmtree(temp, ignore_errors=True)
+        temp.mkdir(parents=True)
+
+        if 'data' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['data']):
+            df = df.assign(data=pd.to_datetime(df['data']))
+
+        columns: List[Dict[str, Any]] = []
+        for i, name in enumerate(df.columns):
+            entry: Dict[str, Any] = {'name': name, 'file': f"c{i}.npy"}
+            values = df[name]
+
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufM':
+                array = values.to_numpy()
+            else:
+                if isinstance(values.dtype, pd.CategoricalDtype):
+                    codes = values.cat.codes.to_numpy()
+                    categories = values.cat.categories
+                    entry['ordered'] = bool(values.cat.ordered)
+                else:
+                    codes, categories = pd.factorize(values, use_na_sentinel=True)
+                    entry['ordered'] = False
+                array = codes.astype(_codes_dtype(len(categories)), copy=False)
+                entry['categories'] = list(categories)
+
+            np.save(temp / entry['file'], np.ascontiguousarray(array), allow_pickle=False)
+            columns.append(entry)
+
+        meta = {'rows': len(df), 'schema_version': SCHEMA_VERSION, 'columns': columns}
+        (temp / META_FILE).write_text(json.dumps(meta, ensure_ascii=False, default=str),
+                                      encoding='utf-8')
+
+        # Troca o diretório inteiro; quem já mapeou a versão antiga continua
+        # lendo os arquivos antigos até fechar
+        stale = target.with_name(f".{target.name}.{os.getpid()}.old")
+        if target.exists():
+            os.replace(target, stale)
+        os.replace(temp, target)
+        shutil.rmtree(stale, ignore_errors=True)
+
+        logger.info(f"Colunas mapeáveis gravadas: {target} ({len(df)} linhas)")
+        return target
+
+    def read(self, filename: Union[str, Path],
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Abre as colunas mapeadas em memória, sem copiar
+
+        Args:
+            filename: Nome (ou caminho) do arquivo de referência
+            columns: Colunas a abrir (None = todas)
+
+        Returns:
+            DataFrame somente leitura apoiado nos arquivos .npy
+
+        Raises:
+            FileNotFoundError: Se não existe cópia mapeável
+        """
+        target = self.path_for(filename)
+        meta_path = target / META_FILE
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Colunas mapeáveis não encontradas: {target}")
+
+        meta = json.loads(meta_path.read_text(encoding='utf-8'))
+        wanted = set(columns) if columns is not None else None
+
+        data = {}
+        for entry in meta['columns']:
+            if wanted is not None and entry['name'] not in wanted:
+                continue
+
+            array = np.load(target / entry['file'], mmap_mode='r', allow_pickle=False)
+            if 'categories' in entry:
+                array = pd.Categorical.from_codes(array, categories=entry['categories'],
+                                                  ordered=entry['ordered'])
+            data[entry['name']] = array
+
+        # copy=False mantém um bloco por coluna, apontando para o mmap
+        df = pd.DataFrame(data, index=pd.RangeIndex(meta['rows']), copy=False)
+        logger.info(f"Colunas mapeadas: {target} ({len(df)} linhas, {df.shape[1]} colunas)")
+        return df
@@ -0,0 +1,353 @@
+"""
+🧩 PARTITIONS - Armazenamento Particionado por Ano/Mês
+======================================================
+
+Guarda uma tabela mensal (ex.: séries do ISP-RJ) em partições Parquet
+ano=AAAA/mes=MM, com um manifesto do hash do conteúdo de cada partição.
+Na ingestão só as partições novas ou alteradas são regravadas, então
+uma atualização mensal custa o tamanho de um mês, não do histórico.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.core.storage import PYARROW_AVAILABLE, COLUMNAR_SUFFIX
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Chave de partição: (ano, mês)
+PartitionKey = Tuple[int, int]
+
+# Colunas que definem a partição
+PARTITION_COLUMNS = ('ano', 'mes')
+
+# Arquivo de manifesto na raiz do dataset
+MANIFEST_FILE = '_manifest.json'
+
+# Diretório dos blocos em trânsito da ingestão em streaming
+STAGING_DIR = '_staging'
+
+
+def _key_name(key: PartitionKey) -> str:
+    """Nome da partição no manifesto (AAAA-MM)"""
+    return f"{key[0]:04d}-{key[1]:02d}"
+
+
+def _canonical_values(values: pd.Series) -> pd.Series:
+    """Coluna em forma canônica para o hash (numéricos em float64, datas em ns)"""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        return pd.Series(values.to_numpy(dtype=np.float64, na_value=np.nan), index=values.index)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('datetime64[ns]')
+    return values
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash de cada linha, independente de dtype e da ordem das colunas
+
+    Cada coluna é levada à forma canônica e tem o hash calculado à parte,
+    combinado com o hash do nome da coluna; células nulas não contribuem.
+    Assim um NaN que converte int em float não altera os outros meses, e
+    uma coluna nova só altera os meses em que ela tem valores.
+    """
+    rows = np.zeros(len(df), dtype=np.uint64)
+    for column in sorted(df.columns, key=str):
+        values = _canonical_values(df[column])
+        cells = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        name = int.from_bytes(hashlib.blake2b(str(column).encode('utf-8'),
+                                              digest_size=8).digest(), 'little')
+        mixed = (cells ^ np.uint64(name)) * np.uint64(0x9E3779B97F4A7C15)
+        rows += np.where(values.notna().to_numpy(), mixed, np.uint64(0))
+    return rows
+
+
+def partition_hashes(df: pd.DataFrame,
+                     columns: Tuple[str, str] = PARTITION_COLUMNS) -> Dict[PartitionKey, str]:
+    """
+    Calcula o hash do conteúdo de cada partição (ano, mês)
+
+    O hash não depende da ordem das linhas dentro do mês, da ordem das
+    colunas nem do dtype numérico (int/float/Int64) de cada coluna.
+
+    Args:
+        df: DataFrame com as colunas de partição
+        columns: Colunas de ano e mês
+
+    Returns:
+        Dicionário (ano, mês) -> hash hexadecimal
+    """
+    if df.empty:
+        return {}
+
+    rows = _row_hashes(df)
+    years = pd.to_numeric(df[columns[0]]).to_numpy(dtype=np.int64)
+    months = pd.to_numeric(df[columns[1]]).to_numpy(dtype=np.int64)
+    keys = years * 100 + months
+
+    order = np.lexsort((rows, keys))
+    keys, rows = keys[order], rows[order]
+    bounds = np.flatnonzero(np.diff(keys)) + 1
+
+    hashes = {}
+    for group_keys, group_rows in zip(np.split(keys, bounds), np.split(rows, bounds)):
+        key = (int(group_keys[0] // 100), int(group_keys[0] % 100))
+        hashes[key] = hashlib.blake2b(group_rows.tobytes(), digest_size=16).hexdigest()
+    return hashes
+
+
+@dataclass
+class IngestResult:
+    """Resultado de uma ingestão incremental"""
+    new: List[PartitionKey] = field(default_factory=list)
+    changed: List[PartitionKey] = field(default_factory=list)
+    unchanged: List[PartitionKey] = field(default_factory=list)
+    frames: Dict[PartitionKey, pd.DataFrame] = field(default_factory=dict)
+
+    @property
+    def updated(self) -> List[PartitionKey]:
+        """Partições gravadas (novas + alteradas), em ordem"""
+        return sorted(self.new + self.changed)
+
+    @property
+    def has_changes(self) -> bool:
+        """Se alguma partição foi gravada"""
+        return bool(self.new or self.changed)
+
+    def summary(self) -> str:
+        """Resumo legível da ingestão"""
+        return (f"{len(self.new)} nova(s), {len(self.changed)} alterada(s), "
+                f"{len(self.unchanged)} sem mudança")
+
+
+class PartitionedStore:
+    """Dataset Parquet particionado por ano/mês com manifesto de hashes"""
+
+    def __init__(self, base_path: Path, dataset: str,
+                 columns: Tuple[str, str] = PARTITION_COLUMNS):
+        self.root = Path(base_path) / dataset
+        self.columns = columns
+
+    # ------------------------------------------------------------------
+    # Manifesto
+    # ------------------------------------------------------------------
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.root / MANIFEST_FILE
+
+    def manifest(self) -> Dict[str, Dict]:
+        """
+        Lê o manifesto (AAAA-MM -> hash e número de linhas)
+
+        Returns:
+            Dicionário do manifesto (vazio se o dataset não existe)
+        """
+        if not self.manifest_path.exists():
+            return {}
+        return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+
+    def _save_manifest(self, manifest: Dict[str, Dict]) -> None:
+        """Grava o manifesto de forma atômica"""
+        temp = self.manifest_path.with_suffix('.tmp')
+        temp.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(temp, self.manifest_path)
+
+    def keys(self) -> List[PartitionKey]:
+        """Partições existentes, em ordem cronológica"""
+        return sorted((int(name[:4]), int(name[5:])) for name in self.manifest())
+
+    def partition_path(self, key: PartitionKey) -> Path:
+        """Caminho do arquivo de uma partição"""
+        return (self.root / f"{self.columns[0]}={key[0]:04d}"
+                / f"{self.columns[1]}={key[1]:02d}" / f"part{COLUMNAR_SUFFIX}")
+
+    # ------------------------------------------------------------------
+    # Ingestão e leitura
+    # ------------------------------------------------------------------
+
+    def _split(self, df: pd.DataFrame) -> Iterator[Tuple[PartitionKey, pd.DataFrame]]:
+        """Linhas de cada partição (ano, mês) de um DataFrame"""
+        years = pd.to_numeric(df[self.columns[0]])
+        months = pd.to_numeric(df[self.columns[1]])
+        for (year, month), part in df.groupby([years, months]):
+            yield (int(year), int(month)), part.reset_index(drop=True)
+
+    def _classify(self, result: IngestResult, manifest: Dict[str, Dict],
+                  key: PartitionKey, digest: str) -> bool:
+        """Registra a partição como nova/alterada/sem mudança (True = gravar)"""
+        entry = manifest.get(_key_name(key))
+        if entry is None:
+            result.new.append(key)
+        elif entry['hash'] != digest:
+            result.changed.append(key)
+        else:
+            result.unchanged.append(key)
+            return False
+        return True
+
+    def ingest(self, df: pd.DataFrame) -> IngestResult:
+        """
+        Grava apenas as partições novas ou com conteúdo diferente
+
+        Partições ausentes em df são mantidas (a ingestão só acrescenta
+        ou substitui meses).
+
+        Args:
+            df: DataFrame com as colunas de ano e mês
+
+        Returns:
+            IngestResult com as partições novas/alteradas e seus dados
+
+        Raises:
+            ImportError: Se pyarrow não estiver instalado
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow é necessário para o armazenamento particionado")
+
+        result = IngestResult()
+        if df is None or df.empty:
+            return result
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifest()
+        hashes = partition_hashes(df, self.columns)
+
+        changed_keys = [key for key, digest in sorted(hashes.items())
+                        if self._classify(result, manifest, key, digest)]
+        if not changed_keys:
+            logger.info(f"Nenhuma partição nova em {self.root.name}")
+            return result
+
+        years = pd.to_numeric(df[self.columns[0]])
+        months = pd.to_numeric(df[self.columns[1]])
+        wanted = pd.Series(list(zip(years, months)), index=df.index).isin(changed_keys)
+
+        entries = {}
+        for key, part in self._split(df.loc[wanted.to_numpy()]):
+            entries[key] = self.write_partition(key, part, hashes[key])
+            result.frames[key] = part
+
+        self.commit(entries)
+        logger.info(f"Ingestão em {self.root.name}: {result.summary()}")
+        return result
+
+    def ingest_chunks(self, chunks: Iterable[pd.DataFrame]) -> IngestResult:
+        """
+        Ingestão em streaming: grava cada bloco assim que ele chega
+
+        As linhas de cada bloco são separadas por mês e gravadas em
+        _staging; um mês pode vir espalhado por vários blocos, então o hash
+        e a comparação com o manifesto só acontecem no fim, um mês por vez.
+        A memória fica limitada a um bloco (na leitura) e a um mês (na
+        consolidação), e os dados das partições não ficam em result.frames.
+
+        Args:
+            chunks: Blocos com as colunas de ano e mês (ex.: stream_isp_csv)
+
+        Returns:
+            IngestResult com as partições novas/alteradas (frames vazio)
+
+        Raises:
+            ImportError: Se pyarrow não estiver instalado
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow é necessário para o armazenamento particionado")
+
+        staging = self.root / STAGING_DIR
+        shutil.rmtree(staging, ignore_errors=True)
+
+        result = IngestResult()
+        try:
+            staged: Dict[PartitionKey, List[Path]] = {}
+            for number, chunk in enumerate(chunks):
+                for key, part in self._split(chunk):
+                    path = staging / _key_name(key) / f"{number:06d}{COLUMNAR_SUFFIX}"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    part.to_parquet(path, index=False)
+                    staged.setdefault(key, []).append(path)
+
+            manifest = self.manifest()
+            entries = {}
+            for key in sorted(staged):
+                part = pd.concat([pd.read_parquet(path) for path in staged[key]],
+                                 ignore_index=True)
+                digest = partition_hashes(part, self.columns)[key]
+                if self._classify(result, manifest, key, digest):
+                    entries[key] = self.write_partition(key, part, digest)
+
+            self.commit(entries)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        logger.info(f"Ingestão em {self.root.name}: {result.summary()}")
+        return result
+
+    def write_partition(self, key: PartitionKey, df: pd.DataFrame,
+                        digest: Optional[str] = None) -> Dict:
+        """
+        Grava o arquivo de uma partição, sem tocar no manifesto
+
+        Seguro para processos paralelos (cada partição é um arquivo);
+        a entrada retornada deve ser registrada com commit().
+
+        Args:
+            key: Partição (ano, mês)
+            df: Linhas do mês
+            digest: Hash do conteúdo (calculado se None)
+
+        Returns:
+            Entrada do manifesto (hash e número de linhas)
+        """
+        if digest is None:
+            digest = partition_hashes(df, self.columns).get(key, '')
+        path = self.partition_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        df.to_parquet(temp, index=False)
+        os.replace(temp, path)
+        return {'hash': digest, 'rows': len(df)}
+
+    def commit(self, entries: Dict[PartitionKey, Dict]) -> None:
+        """
+        Registra partições gravadas no manifesto (gravação atômica)
+
+        Args:
+            entries: Partição -> entrada retornada por write_partition
+        """
+        if not entries:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifest()
+        for key, entry in entries.items():
+            manifest[_key_name(key)] = entry
+        self._save_manifest(manifest)
+
+    def read(self, keys: Optional[Iterable[PartitionKey]] = None,
+             columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Lê partições (todas, se keys for None), em ordem cronológica
+
+        Args:
+            keys: Partições (ano, mês) a ler
+            columns: Colunas a projetar (None = todas)
+
+        Returns:
+            DataFrame concatenado (vazio se não há partições)
+        """
+        keys = sorted(keys) if keys is not None else self.keys()
+        frames = [pd.read_parquet(self.partition_path(key), columns=columns)
+                  for key in keys if self.partition_path(key).exists()]
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,170 @@
+"""
+🏙️ REGIONS - Hierarquia Territorial do Município
+================================================
+
+Mapeamentos territoriais do município do Rio de Janeiro: delegacias
+(CISP) → Regiões Administrativas (RA) → áreas/zonas → município. Usados
+pelos coletores e pelo cubo de agregados para o roll-up entre níveis.
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+import pandas as pd
+
+# Nome do município (nível mais alto da hierarquia)
+MUNICIPIO = 'Rio de Janeiro'
+
+# Níveis da hierarquia, do mais fino ao mais agregado
+REGION_LEVELS = ('regiao', 'area', 'municipio')
+
+# Sinônimos aceitos para os níveis
+LEVEL_ALIASES = {'ra': 'regiao', 'zona': 'area'}
+
+# Mapeamento completo CISP para RA (baseado em dados oficiais)
+CISP_PARA_RA = {
+    # Centro
+    1: 1,   # 1ª DP - Portuária
+    2: 2,   # 2ª DP - Centro
+    3: 3,   # 3ª DP - Rio Comprido
+    4: 4,   # 4ª DP - Botafogo
+    5: 5,   # 5ª DP - Copacabana
+    6: 6,   # 6ª DP - Lagoa
+    7: 7,   # 7ª DP - São Cristóvão
+    8: 8,   # 8ª DP - Tijuca
+    9: 9,   # 9ª DP - Vila Isabel
+    10: 10, # 10ª DP - Ramos
+    11: 11, # 11ª DP - Penha
+    12: 12, # 12ª DP - Inhaúma
+    13: 13, # 13ª DP - Méier
+    14: 14, # 14ª DP - Irajá
+    15: 15, # 15ª DP - Madureira
+    16: 16, # 16ª DP - Jacarepaguá
+    17: 17, # 17ª DP - Bangu
+    18: 18, # 18ª DP - Campo Grande
+    19: 19, # 19ª DP - Santa Cruz
+    20: 20, # 20ª DP - Ilha do Governador
+    21: 21, # 21ª DP - Paquetá
+    22: 22, # 22ª DP - Anchieta
+    23: 23, # 23ª DP - Santa Teresa
+    24: 24, # 24ª DP - Barra da Tijuca
+    25: 25, # 25ª DP - Pavuna
+    26: 26, # 26ª DP - Guaratiba
+    27: 27, # 27ª DP - Rocinha
+    28: 28, # 28ª DP - Jacarezinho
+    29: 29, # 29ª DP - Complexo do Alemão
+    30: 30, # 30ª DP - Maré
+    31: 31, # 31ª DP - Vigário Geral
+    32: 32, # 32ª DP - Realengo
+    33: 33, # 33ª DP - Cidade de Deus
+    # Adicionais (se existirem)
+    34: 1,   # DP adicional → Portuária
+    35: 2,   # DP adicional → Centro
+    36: 8,   # DP adicional → Tijuca
+    37: 17,  # DP adicional → Bangu
+    38: 18,  # DP adicional → Campo Grande
+    39: 19,  # DP adicional → Santa Cruz
+    40: 32,  # DP adicional → Realengo
+}
+
+# Informações das Regiões Administrativas
+REGIOES_INFO = {
+    1: {"nome": "Portuária", "area": "Centro", "populacao": 39773},
+    2: {"nome": "Centro", "area": "Centro", "populacao": 41142},
+    3: {"nome": "Rio Comprido", "area": "Centro", "populacao": 79647},
+    4: {"nome": "Botafogo", "area": "Zona Sul", "populacao": 239729},
+    5: {"nome": "Copacabana", "area": "Zona Sul", "populacao": 146392},
+    6: {"nome": "Lagoa", "area": "Zona Sul", "populacao": 164936},
+    7: {"nome": "São Cristóvão", "area": "Zona Norte", "populacao": 85135},
+    8: {"nome": "Tijuca", "area": "Zona Norte", "populacao": 181839},
+    9: {"nome": "Vila Isabel", "area": "Zona Norte", "populacao": 187362},
+    10: {"nome": "Ramos", "area": "Zona Norte", "populacao": 147236},
+    11: {"nome": "Penha", "area": "Zona Norte", "populacao": 183561},
+    12: {"nome": "Inhaúma", "area": "Zona Norte", "populacao": 134743},
+    13: {"nome": "Méier", "area": "Zona Norte", "populacao": 391124},
+    14: {"nome": "Irajá", "area": "Zona Norte", "populacao": 192346},
+    15: {"nome": "Madureira", "area": "Zona Norte", "populacao": 360869},
+    16: {"nome": "Jacarepaguá", "area": "Zona Oeste", "populacao": 573896},
+    17: {"nome": "Bangu", "area": "Zona Oeste", "populacao": 732437},
+    18: {"nome": "Campo Grande", "area": "Zona Oeste", "populacao": 542080},
+    19: {"nome": "Santa Cruz", "area": "Zona Oeste", "populacao": 434753},
+    20: {"nome": "Ilha do Governador", "area": "Zona Norte", "populacao": 211018},
+    21: {"nome": "Paquetá", "area": "Zona Norte", "populacao": 3361},
+    22: {"nome": "Anchieta", "area": "Zona Norte", "populacao": 128386},
+    23: {"nome": "Santa Teresa", "area": "Centro", "populacao": 40926},
+    24: {"nome": "Barra da Tijuca", "area": "Zona Oeste", "populacao": 300823},
+    25: {"nome": "Pavuna", "area": "Zona Norte", "populacao": 227729},
+    26: {"nome": "Guaratiba", "area": "Zona Oeste", "populacao": 110049},
+    27: {"nome": "Rocinha", "area": "Zona Sul", "populacao": 69161},
+    28: {"nome": "Jacarezinho", "area": "Zona Norte", "populacao": 37839},
+    29: {"nome": "Complexo do Alemão", "area": "Zona Norte", "populacao": 69143},
+    30: {"nome": "Maré", "area": "Zona Norte", "populacao": 140003},
+    31: {"nome": "Vigário Geral", "area": "Zona Norte", "populacao": 35859},
+    32: {"nome": "Realengo", "area": "Zona Oeste", "populacao": 245025},
+    33: {"nome": "Cidade de Deus", "area": "Zona Oeste", "populacao": 36515}
+}
+
+
+def region_parents(level: str) -> Dict[str, str]:
+    """
+    Retorna o mapeamento nome da região -> nome no nível pedido
+
+    Inclui as RAs (pelo nome) e as próprias áreas, de modo que dados já
+    agregados por zona (ex.: 'Zona Sul') também sobem na hierarquia.
+
+    Args:
+        level: 'regiao', 'area' (ou 'zona') ou 'municipio'
+
+    Returns:
+        Dicionário nome -> nome do nível superior
+
+    Raises:
+        ValueError: Se o nível não existe
+    """
+    level = LEVEL_ALIASES.get(level, level)
+    if level not in REGION_LEVELS:
+        raise ValueError(f"Nível territorial desconhecido: {level}")
+
+    areas = {info['area'] for info in REGIOES_INFO.values()}
+
+    if level == 'regiao':
+        return {info['nome']: info['nome'] for info in REGIOES_INFO.values()}
+    if level == 'area':
+        parents = {area: area for area in areas}
+        parents.update({info['nome']: info['area'] for info in REGIOES_INFO.values()})
+        return parents
+
+    names = areas | {info['nome'] for info in REGIOES_INFO.values()}
+    return {name: MUNICIPIO for name in names}
+
+
+@lru_cache(maxsize=1)
+def _cisp_ra_table() -> pd.DataFrame:
+    """Tabela CISP -> RA montada uma única vez"""
+    ras = pd.DataFrame.from_dict(REGIOES_INFO, orient='index')
+    ras.index.name = 'ra_id'
+    table = pd.Series(CISP_PARA_RA, name='ra_id').rename_axis('cisp').to_frame()
+    return table.join(ras, on='ra_id')
+
+
+def cisp_ra_table() -> pd.DataFrame:
+    """
+    Tabela de consulta CISP -> RA (ra_id, nome, area, populacao)
+
+    Pré-calculada para ser unida aos dados com um único join, em vez de
+    um map por atributo.
+
+    Returns:
+        DataFrame indexado por cisp
+    """
+    return _cisp_ra_table().copy()
+
+
+def ra_table() -> pd.DataFrame:
+    """
+    Tabela das RAs (nome, area, populacao)
+
+    Returns:
+        DataFrame indexado por ra_id
+    """
+    return _cisp_ra_table().drop_duplicates('ra_id').set_index('ra_id').sort_index()
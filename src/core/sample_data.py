@@ -0,0 +1,143 @@
+"""
+🎲 SAMPLE DATA - Gerador Vetorizado de Dados Simulados
+======================================================
+
+Gerador único de dados simulados (fallback quando não há dados reais).
+Monta o produto cartesiano crime × região × mês com broadcasting do
+NumPy e sorteia cada coluna de uma vez, sem laços em Python.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Optional, Sequence, Tuple, Union
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def _axis(values: Optional[ArrayLike], size: int) -> np.ndarray:
+    """Converte fator escalar/sequência em vetor de tamanho fixo"""
+    if values is None:
+        return np.ones(size)
+    array = np.asarray(values, dtype=float)
+    if array.ndim == 0:
+        return np.full(size, float(array))
+    if array.shape != (size,):
+        raise ValueError(f"Fator com tamanho {array.shape}, esperado ({size},)")
+    return array
+
+
+def generate_counts(dates: pd.DatetimeIndex,
+                    n_crimes: int,
+                    n_regions: int,
+                    base: float = 100.0,
+                    crime_factors: Optional[ArrayLike] = None,
+                    region_factors: Optional[ArrayLike] = None,
+                    month_factors: Optional[ArrayLike] = None,
+                    seasonal_amplitude: float = 0.0,
+                    level_noise: float = 0.0,
+                    noise: float = 0.0,
+                    distribution: str = 'normal',
+                    rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Gera contagens simuladas para todas as combinações crime × região × mês
+
+    O nível esperado de cada célula é
+    base × fator_crime × fator_região × fator_mês, somado a uma
+    sazonalidade senoidal aditiva (seasonal_amplitude).
+
+    Args:
+        dates: Datas da série (uma por período)
+        n_crimes: Número de tipos de crime
+        n_regions: Número de regiões
+        base: Nível base de ocorrências
+        crime_factors: Multiplicador por tipo de crime (escalar ou vetor)
+        region_factors: Multiplicador por região (escalar ou vetor)
+        month_factors: Multiplicador por mês do ano (vetor de 12, jan-dez)
+        seasonal_amplitude: Amplitude da sazonalidade senoidal aditiva
+        level_noise: Desvio padrão do ruído de nível ('normal')
+        noise: Desvio padrão do ruído adicional ('normal')
+        distribution: 'normal' (nível + ruído gaussiano) ou 'poisson'
+        rng: Gerador de números aleatórios
+
+    Returns:
+        Array inteiro (n_crimes, n_regions, n_dates) com contagens >= 0
+    """
+    rng = rng or np.random.default_rng()
+    dates = pd.DatetimeIndex(dates)
+    shape = (n_crimes, n_regions, len(dates))
+
+    months = dates.month.to_numpy()
+    seasonal = seasonal_amplitude * np.sin(months * 2 * np.pi / 12)
+    month_scale = _axis(month_factors, 12)[months - 1]
+
+    expected = (base
+                * _axis(crime_factors, n_crimes)[:, None, None]
+                * _axis(region_factors, n_regions)[None, :, None]
+                * month_scale[None, None, :]
+                + seasonal[None, None, :])
+
+    if distribution == 'poisson':
+        return rng.poisson(np.maximum(expected, 0))
+
+    if distribution != 'normal':
+        raise ValueError(f"Distribuição não suportada: {distribution}")
+
+    values = expected
+    if level_noise:
+        values = values + rng.normal(0, level_noise, shape)
+    if noise:
+        values = values + rng.normal(0, noise, shape)
+
+    return np.maximum(np.trunc(values), 0).astype(np.int64)
+
+
+def _labels(values: Sequence[str], repeats: int, tiles: int) -> pd.Categorical:
+    """Rótulos categóricos repetidos/ladrilhados para o formato longo"""
+    codes = np.tile(np.repeat(np.arange(len(values)), repeats), tiles)
+    if len(set(values)) == len(values):
+        return pd.Categorical.from_codes(codes, categories=list(values))
+    return pd.Categorical(np.asarray(values, dtype=object)[codes])
+
+
+def generate_crime_panel(crime_types: Sequence[str],
+                         regions: Sequence[str],
+                         dates: pd.DatetimeIndex,
+                         population_range: Tuple[int, int] = (100000, 500000),
+                         rate_denominator: Optional[float] = None,
+                         seed: Optional[int] = 42,
+                         **count_kwargs) -> pd.DataFrame:
+    """
+    Gera painel longo de criminalidade simulada
+
+    As linhas seguem a ordem crime → região → data, como nos antigos
+    laços aninhados.
+
+    Args:
+        crime_types: Tipos de crime
+        regions: Regiões administrativas
+        dates: Datas da série
+        population_range: Faixa [min, max) da população sorteada por linha
+        rate_denominator: População usada na taxa; None usa a da linha
+        seed: Semente do gerador aleatório
+        **count_kwargs: Parâmetros repassados a generate_counts
+
+    Returns:
+        DataFrame com data, tipo_crime, regiao_administrativa,
+        total_ocorrencias, populacao e taxa_100k
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.DatetimeIndex(dates)
+    n_crimes, n_regions, n_dates = len(crime_types), len(regions), len(dates)
+
+    counts = generate_counts(dates, n_crimes, n_regions, rng=rng, **count_kwargs).ravel()
+    populacao = rng.integers(population_range[0], population_range[1], counts.size)
+    denominator = populacao if rate_denominator is None else rate_denominator
+
+    return pd.DataFrame({
+        'data': np.tile(dates.to_numpy(), n_crimes * n_regions),
+        'tipo_crime': _labels(crime_types, n_regions * n_dates, 1),
+        'regiao_administrativa': _labels(regions, n_dates, n_crimes),
+        'total_ocorrencias': counts,
+        'populacao': populacao,
+        'taxa_100k': counts / denominator * 100000
+    })
@@ -0,0 +1,152 @@
+"""
+🧬 SCHEMA - Tipos de Dados na Carga
+===================================
+
+Normaliza os tipos das colunas ao carregar dados de criminalidade:
+colunas de crime/região viram Categoricals com vocabulário fixo (vindo
+de CrimeConfig), contagens viram inteiros compactos e a coluna de data
+vira datetime64, qualquer que seja o backend de leitura (CSV, Parquet,
+colunas mapeadas).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Iterable
+import logging
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Colunas de contagem candidatas a downcast para inteiros compactos
+COUNT_COLUMNS = [
+    'total_ocorrencias', 'ocorrencias', 'quantidade', 'populacao',
+    'homicidios', 'roubos', 'furtos', 'total_crimes', 'ano', 'mes'
+]
+
+# Tipo compacto das contagens e sua faixa
+COUNT_DTYPE = np.dtype('int32')
+INT32_MIN, INT32_MAX = np.iinfo(COUNT_DTYPE).min, np.iinfo(COUNT_DTYPE).max
+
+# Colunas categóricas ordenadas
+ORDERED_COLUMNS = {'nivel_criminalidade'}
+
+# Colunas de data
+DATE_COLUMNS = ['data']
+
+# Versão do schema de carga (incrementar ao mudar normalize_schema ou os
+# vocabulários: invalida o cache em disco e as colunas mapeadas)
+SCHEMA_VERSION = 2
+
+
+def category_vocabularies() -> Dict[str, List[str]]:
+    """
+    Retorna o vocabulário fixo de cada coluna categórica
+
+    Returns:
+        Dicionário coluna -> lista de categorias
+    """
+    return {
+        'tipo_crime': config.crimes.CRIME_TYPES,
+        'regiao_administrativa': config.crimes.REGIONS,
+        'regiao': config.crimes.REGIONS,
+        'area': config.crimes.REGIONS,
+        'nivel_criminalidade': config.crimes.CRIME_LEVELS
+    }
+
+
+def to_categorical(values: pd.Series, vocabulary: Iterable[str],
+                   ordered: bool = False) -> pd.Series:
+    """
+    Converte série para Categorical com vocabulário fixo
+
+    Valores fora do vocabulário não são descartados: entram como
+    categorias extras, depois das do vocabulário.
+
+    Args:
+        values: Série de entrada
+        vocabulary: Categorias conhecidas, na ordem desejada
+        ordered: Se as categorias têm ordem
+
+    Returns:
+        Série categórica
+    """
+    categories = list(vocabulary)
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        observed = values.cat.categories
+    else:
+        observed = pd.Index(values.dropna().unique())
+
+    known = set(categories)
+    extras = sorted((v for v in observed if v not in known), key=str)
+    if extras:
+        logger.debug(f"Categorias fora do vocabulário em '{values.name}': {extras}")
+
+    dtype = pd.CategoricalDtype(categories + extras, ordered=ordered)
+    return values.astype(dtype)
+
+
+def downcast_counts(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Converte colunas de contagem para int32
+
+    int32 comporta qualquer contagem ou população do município e, ao
+    contrário de int8/int16, não transborda em somas entre colunas
+    (ex.: homicidios + roubos + furtos). Colunas com valores ausentes,
+    fracionários ou fora da faixa são mantidas como estão.
+
+    Args:
+        df: DataFrame (alterado no lugar)
+        columns: Colunas a considerar (padrão: COUNT_COLUMNS)
+
+    Returns:
+        O próprio DataFrame
+    """
+    for col in columns or COUNT_COLUMNS:
+        if col not in df.columns:
+            continue
+
+        values = df[col]
+        if values.dtype == COUNT_DTYPE:
+            continue
+
+        if pd.api.types.is_float_dtype(values):
+            if values.isna().any() or not (values % 1 == 0).all():
+                continue
+        elif not pd.api.types.is_integer_dtype(values):
+            continue
+
+        if values.empty or (values.min() >= INT32_MIN and values.max() <= INT32_MAX):
+            df[col] = values.astype(COUNT_DTYPE)
+
+    return df
+
+
+def normalize_schema(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """
+    Aplica o schema de carga: Categoricals + contagens compactas + datas
+
+    Args:
+        df: DataFrame de criminalidade
+        inplace: Se True, altera o próprio df; senão trabalha numa cópia rasa
+
+    Returns:
+        DataFrame com tipos normalizados
+    """
+    if df is None or df.empty:
+        return df
+
+    if not inplace:
+        df = df.copy(deep=False)
+
+    for col, vocabulary in category_vocabularies().items():
+        if col in df.columns:
+            df[col] = to_categorical(df[col], vocabulary, ordered=col in ORDERED_COLUMNS)
+
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    return downcast_counts(df)
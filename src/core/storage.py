@@ -0,0 +1,226 @@
+"""
+🗄️ STORAGE - Armazenamento Colunar
+===================================
+
+Backend colunar (Parquet) para os dados processados. Permite projeção de
+colunas e filtragem por row group, de modo que uma consulta filtrada só
+decodifica as colunas e os blocos de linhas de que precisa.
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import Optional, List, Tuple, Any, Iterable, Union
+import logging
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Filtro no formato aceito pelo pyarrow: (coluna, operador, valor)
+Filter = Tuple[str, str, Any]
+
+# Extensões reconhecidas como armazenamento colunar
+COLUMNAR_SUFFIX = '.parquet'
+
+# Ordenação usada na escrita: agrupa linhas de mesmo crime/região/período
+# no mesmo row group, deixando as estatísticas min/max bem seletivas
+SORT_COLUMNS = ['tipo_crime', 'regiao_administrativa', 'data']
+
+
+def build_filters(crime_types: Optional[Iterable[str]] = None,
+                  regions: Optional[Iterable[str]] = None,
+                  start_date: Optional[Union[str, pd.Timestamp]] = None,
+                  end_date: Optional[Union[str, pd.Timestamp]] = None) -> Optional[List[Filter]]:
+    """
+    Monta a lista de predicados (conjunção) para leitura filtrada
+
+    Args:
+        crime_types: Tipos de crime aceitos
+        regions: Regiões administrativas aceitas
+        start_date: Data inicial (inclusiva)
+        end_date: Data final (inclusiva)
+
+    Returns:
+        Lista de filtros ou None se nenhum predicado foi informado
+    """
+    filters: List[Filter] = []
+
+    if crime_types:
+        filters.append(('tipo_crime', 'in', list(crime_types)))
+
+    if regions:
+        filters.append(('regiao_administrativa', 'in', list(regions)))
+
+    if start_date is not None:
+        filters.append(('data', '>=', pd.Timestamp(start_date)))
+
+    if end_date is not None:
+        filters.append(('data', '<=', pd.Timestamp(end_date)))
+
+    return filters or None
+
+
+def filter_frame(df: pd.DataFrame, filters: Optional[List[Filter]]) -> pd.DataFrame:
+    """
+    Aplica os mesmos predicados de leitura a um DataFrame em memória
+
+    Todos os predicados são combinados em uma única máscara, e o
+    resultado é materializado uma só vez.
+
+    Args:
+        df: DataFrame de entrada
+        filters: Lista de filtros (coluna, operador, valor)
+
+    Returns:
+        DataFrame filtrado (o próprio df se não houver filtros)
+    """
+    if not filters:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+
+    for column, op, value in filters:
+        if column not in df.columns:
+            logger.warning(f"Coluna de filtro ausente: {column}")
+            continue
+
+        values = df[column]
+        if isinstance(value, pd.Timestamp) and not pd.api.types.is_datetime64_any_dtype(values):
+            values = pd.to_datetime(values)
+
+        if op == 'in':
+            mask &= values.isin(value)
+        elif op == '==':
+            mask &= values == value
+        elif op == '>=':
+            mask &= values >= value
+        elif op == '<=':
+            mask &= values <= value
+        elif op == '>':
+            mask &= values > value
+        elif op == '<':
+            mask &= values < value
+        else:
+            raise ValueError(f"Operador de filtro não suportado: {op}")
+
+    if mask.all():
+        return df
+
+    return df.loc[mask]
+
+
+class ColumnarStore:
+    """Armazenamento de DataFrames em Parquet com leitura seletiva"""
+
+    ROW_GROUP_SIZE = 50_000
+
+    def __init__(self, base_path: Path, row_group_size: Optional[int] = None):
+        self.base_path = Path(base_path)
+        self.row_group_size = row_group_size or self.ROW_GROUP_SIZE
+
+    @staticmethod
+    def is_available() -> bool:
+        """Indica se o backend colunar (pyarrow) está instalado"""
+        return PYARROW_AVAILABLE
+
+    def path_for(self, filename: Union[str, Path]) -> Path:
+        """Retorna o caminho Parquet correspondente a um arquivo"""
+        path = Path(filename)
+        if not path.is_absolute():
+            path = self.base_path / path
+        return path.with_suffix(COLUMNAR_SUFFIX)
+
+    def has_fresh_copy(self, source: Path) -> bool:
+        """
+        Verifica se existe cópia colunar atualizada de um arquivo fonte
+
+        Args:
+            source: Caminho do arquivo original (ex.: CSV)
+
+        Returns:
+            True se o Parquet existe e é mais recente que a fonte
+        """
+        if not PYARROW_AVAILABLE:
+            return False
+
+        columnar = self.path_for(source)
+        if not columnar.exists():
+            return False
+        if not source.exists():
+            return True
+        return columnar.stat().st_mtime >= source.stat().st_mtime
+
+    def write(self, df: pd.DataFrame, filename: Union[str, Path],
+              sort_by: Optional[List[str]] = None) -> Path:
+        """
+        Grava DataFrame em Parquet, ordenado para maximizar o pushdown
+
+        Args:
+            df: DataFrame a gravar
+            filename: Nome (ou caminho) do arquivo de destino
+            sort_by: Colunas de ordenação (padrão: SORT_COLUMNS)
+
+        Returns:
+            Caminho do arquivo gravado
+
+        Raises:
+            ImportError: Se pyarrow não estiver instalado
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow é necessário para o armazenamento colunar")
+
+        path = self.path_for(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if 'data' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['data']):
+            df = df.assign(data=pd.to_datetime(df['data']))
+
+        sort_columns = [col for col in (sort_by or SORT_COLUMNS) if col in df.columns]
+        if sort_columns:
+            df = df.sort_values(sort_columns, kind='stable')
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, path, row_group_size=self.row_group_size)
+
+        logger.info(f"Parquet gravado: {path} ({len(df)} linhas, "
+                    f"{pq.ParquetFile(path).num_row_groups} row groups)")
+        return path
+
+    def read(self, filename: Union[str, Path],
+             columns: Optional[List[str]] = None,
+             filters: Optional[List[Filter]] = None) -> pd.DataFrame:
+        """
+        Lê Parquet decodificando apenas colunas e row groups necessários
+
+        Args:
+            filename: Nome (ou caminho) do arquivo
+            columns: Colunas a projetar (None = todas)
+            filters: Predicados avaliados contra as estatísticas dos row groups
+
+        Returns:
+            DataFrame com o resultado da leitura
+
+        Raises:
+            ImportError: Se pyarrow não estiver instalado
+            FileNotFoundError: Se o arquivo não existe
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow é necessário para o armazenamento colunar")
+
+        path = self.path_for(filename)
+        if not path.exists():
+            raise FileNotFoundError(f"Arquivo colunar não encontrado: {path}")
+
+        if columns is not None:
+            available = pq.ParquetFile(path).schema_arrow.names
+            columns = [col for col in columns if col in available]
+
+        table = pq.read_table(path, columns=columns, filters=filters)
+        logger.info(f"Parquet lido: {path} ({table.num_rows} linhas, {table.num_columns} colunas)")
+        return table.to_pandas()
@@ -15,6 +15,7 @@ from typing import Optional, Dict, List, Tuple
 from abc import ABC, abstractmethod
 
 from src.config import config
+from src.core.geometry_store import shared_geometry_store
 
 
 class BaseVisualizer(ABC):
@@ -210,15 +211,25 @@ class MapVisualizer(BaseVisualizer):
                value_column: str = 'taxa_100k',
                name_column: str = 'zona',
                title: str = 'Mapa de Calor',
+               zoom: Optional[float] = None,
+               width: Optional[int] = None,
                **kwargs) -> folium.Map:
         """
         Cria mapa coroplético com Folium
         
+        Com zoom ou width, as geometrias são enviadas no nível de detalhe
+        dessa visualização, sem vértices menores que um pixel; sem eles,
+        vão na resolução original.
+        
         Args:
             gdf: GeoDataFrame com geometrias
             value_column: Coluna com valores para colorir
             name_column: Coluna com nomes das áreas
             title: Título do mapa
+            zoom: Zoom do mapa, que também define o nível de detalhe
+                (padrão: MapConfig.DEFAULT_ZOOM, sem simplificar)
+            width: Largura de saída em pixels para o nível de detalhe
+                (usada se zoom não for dado)
             
         Returns:
             Mapa Folium
@@ -230,10 +241,14 @@ class MapVisualizer(BaseVisualizer):
         bounds = gdf.total_bounds
         center = [(bounds[1] + bounds[3]) / 2, (bounds[0] + bounds[2]) / 2]
         
+        # Nível de detalhe das geometrias (só quando a visualização é informada)
+        if zoom is not None or width is not None:
+            gdf = shared_geometry_store.for_view(gdf, zoom=zoom, width=width)
+        
         # Cria mapa
         m = folium.Map(
             location=center,
-            zoom_start=self.config.maps.DEFAULT_ZOOM,
+            zoom_start=zoom if zoom is not None else self.config.maps.DEFAULT_ZOOM,
             tiles=self.config.maps.TILE_STYLE,
             dragging=False,
             scrollWheelZoom=False,
@@ -3,7 +3,6 @@ Módulo para coleta de dados do DataRio (Portal de Dados Abertos do Rio de Janei
 Fonte: https://data.rio/
 """
 
-import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -13,6 +12,9 @@ from typing import Dict, List, Optional
 import logging
 import json
 
+from src.data_collection.http_client import shared_http_client
+from src.data_collection.datastore import DatastoreReader
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,10 +26,8 @@ class DataRioCollector:
     
     def __init__(self, base_url: str = "https://www.data.rio/api/3/action"):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.http = shared_http_client
+        self.datastore = DatastoreReader(base_url, http=self.http)
         
     def get_social_development_index(self) -> pd.DataFrame:
         """
@@ -39,28 +39,14 @@ class DataRioCollector:
         logger.info("Coletando dados do Índice de Desenvolvimento Social")
         
         try:
-            # URL para dados do IDS
-            url = f"{self.base_url}/datastore_search"
-            params = {
-                'resource_id': 'ids-2020',
-                'limit': 10000
-            }
-            
-            response = self.session.get(url, params=params, timeout=30)
+            # Leitura paginada de dados do IDS (sem truncar)
+            df = self.datastore.read('ids-2020')
             
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'result' in data and 'records' in data['result']:
-                    df = pd.DataFrame(data['result']['records'])
-                    logger.info(f"Dados do IDS coletados: {len(df)} registros")
-                    return df
-                else:
-                    logger.warning("Dados do IDS não encontrados na resposta")
-                    return pd.DataFrame()
+            if not df.empty:
+                logger.info(f"Dados do IDS coletados: {len(df)} registros")
             else:
-                logger.warning(f"Erro ao coletar dados do IDS: {response.status_code}")
-                return pd.DataFrame()
+                logger.warning("Dados do IDS não encontrados na resposta")
+            return df
                 
         except Exception as e:
             logger.error(f"Erro ao coletar dados do IDS: {str(e)}")
@@ -76,28 +62,14 @@ class DataRioCollector:
         logger.info("Coletando dados territoriais do IPP")
         
         try:
-            # URL para dados territoriais
-            url = f"{self.base_url}/datastore_search"
-            params = {
-                'resource_id': 'dados-territoriais-ipp',
-                'limit': 10000
-            }
+            # Leitura paginada de dados territoriais (sem truncar)
+            df = self.datastore.read('dados-territoriais-ipp')
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'result' in data and 'records' in data['result']:
-                    df = pd.DataFrame(data['result']['records'])
-                    logger.info(f"Dados territoriais coletados: {len(df)} registros")
-                    return df
-                else:
-                    logger.warning("Dados territoriais não encontrados na resposta")
-                    return pd.DataFrame()
+            if not df.empty:
+                logger.info(f"Dados territoriais coletados: {len(df)} registros")
             else:
-                logger.warning(f"Erro ao coletar dados territoriais: {response.status_code}")
-                return pd.DataFrame()
+                logger.warning("Dados territoriais não encontrados na resposta")
+            return df
                 
         except Exception as e:
             logger.error(f"Erro ao coletar dados territoriais: {str(e)}")
@@ -113,28 +85,14 @@ class DataRioCollector:
         logger.info("Coletando dados de equipamentos públicos")
         
         try:
-            # URL para dados de equipamentos públicos
-            url = f"{self.base_url}/datastore_search"
-            params = {
-                'resource_id': 'equipamentos-publicos',
-                'limit': 10000
-            }
+            # Leitura paginada de dados de equipamentos públicos (sem truncar)
+            df = self.datastore.read('equipamentos-publicos')
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'result' in data and 'records' in data['result']:
-                    df = pd.DataFrame(data['result']['records'])
-                    logger.info(f"Dados de equipamentos públicos coletados: {len(df)} registros")
-                    return df
-                else:
-                    logger.warning("Dados de equipamentos públicos não encontrados na resposta")
-                    return pd.DataFrame()
+            if not df.empty:
+                logger.info(f"Dados de equipamentos públicos coletados: {len(df)} registros")
             else:
-                logger.warning(f"Erro ao coletar dados de equipamentos públicos: {response.status_code}")
-                return pd.DataFrame()
+                logger.warning("Dados de equipamentos públicos não encontrados na resposta")
+            return df
                 
         except Exception as e:
             logger.error(f"Erro ao coletar dados de equipamentos públicos: {str(e)}")
@@ -150,28 +108,14 @@ class DataRioCollector:
         logger.info("Coletando dados de transporte público")
         
         try:
-            # URL para dados de transporte
-            url = f"{self.base_url}/datastore_search"
-            params = {
-                'resource_id': 'transporte-publico',
-                'limit': 10000
-            }
+            # Leitura paginada de dados de transporte (sem truncar)
+            df = self.datastore.read('transporte-publico')
             
-            response = self.session.get(url, params=params, timeout=30)
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if 'result' in data and 'records' in data['result']:
-                    df = pd.DataFrame(data['result']['records'])
-                    logger.info(f"Dados de transporte coletados: {len(df)} registros")
-                    return df
-                else:
-                    logger.warning("Dados de transporte não encontrados na resposta")
-                    return pd.DataFrame()
+            if not df.empty:
+                logger.info(f"Dados de transporte coletados: {len(df)} registros")
             else:
-                logger.warning(f"Erro ao coletar dados de transporte: {response.status_code}")
-                return pd.DataFrame()
+                logger.warning("Dados de transporte não encontrados na resposta")
+            return df
                 
         except Exception as e:
             logger.error(f"Erro ao coletar dados de transporte: {str(e)}")
@@ -3,7 +3,6 @@ Módulo para coleta de dados do IBGE (Instituto Brasileiro de Geografia e Estat
 Fonte: https://www.ibge.gov.br/
 """
 
-import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -13,6 +12,8 @@ from typing import Dict, List, Optional
 import logging
 import json
 
+from src.data_collection.http_client import shared_http_client
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,10 +25,7 @@ class IBGEDadosCollector:
     
     def __init__(self, base_url: str = "https://servicodados.ibge.gov.br/api/v1"):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.http = shared_http_client
         
     def get_population_data(self, municipality_code: str = "3304557") -> pd.DataFrame:
         """
@@ -45,7 +43,7 @@ class IBGEDadosCollector:
             # URL para dados populacionais
             url = f"{self.base_url}/localidades/municipios/{municipality_code}/distritos"
             
-            response = self.session.get(url, timeout=30)
+            response = self.http.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -82,7 +80,7 @@ class IBGEDadosCollector:
             # URL para dados do Censo 2022
             url = f"{self.base_url}/censo2022/agregados/municipios/{municipality_code}"
             
-            response = self.session.get(url, timeout=30)
+            response = self.http.get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -116,7 +114,7 @@ class IBGEDadosCollector:
             # URL para dados geográficos
             url = f"{self.base_url}/localidades/municipios/{municipality_code}"
             
-            response = self.session.get(url, timeout=30)
+            response = self.http.get(url)
             
             if response.status_code == 200:
                 data = response.json()
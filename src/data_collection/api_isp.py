@@ -3,15 +3,17 @@ Módulo para coleta de dados do Instituto de Segurança Pública do Rio de Janei
 Fonte: http://www.ispdados.rj.gov.br/
 """
 
-import requests
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import time
 import os
 from typing import Dict, List, Optional
 import logging
 
+from src.config import config
+from src.data_collection.http_client import HttpClient, TokenBucket, fetch_all, shared_http_client
+from src.data_collection.isp_incremental import parse_isp_csv
+
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,17 +23,38 @@ class ISPDadosCollector:
     Classe para coleta de dados do ISP-RJ
     """
     
-    def __init__(self, base_url: str = "http://www.ispdados.rj.gov.br"):
+    def __init__(self, base_url: str = "http://www.ispdados.rj.gov.br",
+                 max_workers: Optional[int] = None,
+                 rate_limit: Optional[float] = None,
+                 http: Optional[HttpClient] = None):
+        """
+        Args:
+            base_url: URL base do ISP-RJ
+            max_workers: Downloads simultâneos (padrão: config.apis.HTTP_MAX_WORKERS)
+            rate_limit: Requisições por segundo (padrão: config.apis.HTTP_RATE_LIMIT)
+            http: Cliente HTTP (padrão: shared_http_client)
+        """
         self.base_url = base_url
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.max_workers = max_workers or config.apis.HTTP_MAX_WORKERS
+        self.rate_limiter = TokenBucket(rate_limit or config.apis.HTTP_RATE_LIMIT)
+        self.http = http or shared_http_client
+    
+    def month_url(self, year: int, month: int) -> str:
+        """URL do arquivo mensal do ISP-RJ"""
+        return f"{self.base_url}/Arquivos/Base{year}{month:02d}.csv"
+    
+    @staticmethod
+    def _parse_csv(content: bytes) -> pd.DataFrame:
+        """Lê um CSV do ISP-RJ a partir dos bytes já baixados"""
+        return parse_isp_csv(content)
         
     def get_crime_data_by_month(self, start_year: int = 2020, end_year: int = 2025) -> pd.DataFrame:
         """
         Coleta dados de criminalidade por mês
         
+        Os arquivos mensais são baixados em paralelo (pool de threads),
+        respeitando o limite de requisições por segundo.
+        
         Args:
             start_year: Ano inicial
             end_year: Ano final
@@ -41,42 +64,35 @@ class ISPDadosCollector:
         """
         logger.info(f"Coletando dados de criminalidade de {start_year} a {end_year}")
         
+        # URL do ISP-RJ para dados mensais
+        urls = {
+            (year, month): self.month_url(year, month)
+            for year in range(start_year, end_year + 1)
+            for month in range(1, 13)
+        }
+        
+        frames = fetch_all(self.http, urls.values(), parse=self._parse_csv,
+                           max_workers=self.max_workers, rate_limiter=self.rate_limiter)
+        
         all_data = []
         
-        for year in range(start_year, end_year + 1):
-            for month in range(1, 13):
-                try:
-                    # URL do ISP-RJ para dados mensais
-                    url = f"{self.base_url}/Arquivos/Base{year}{month:02d}.csv"
-                    
-                    logger.info(f"Coletando dados de {year}-{month:02d}")
-                    response = self.session.get(url, timeout=30)
-                    
-                    if response.status_code == 200:
-                        # Lê o CSV
-                        df = pd.read_csv(url, encoding='latin-1', sep=';')
-                        
-                        # Adiciona colunas de ano e mês
-                        df['ano'] = year
-                        df['mes'] = month
-                        df['data'] = pd.to_datetime(f"{year}-{month:02d}-01")
-                        
-                        all_data.append(df)
-                        logger.info(f"Dados de {year}-{month:02d} coletados com sucesso")
-                        
-                    else:
-                        logger.warning(f"Dados de {year}-{month:02d} não encontrados")
-                        
-                    # Delay para não sobrecarregar o servidor
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(f"Erro ao coletar dados de {year}-{month:02d}: {str(e)}")
-                    continue
+        for (year, month), url in urls.items():
+            df = frames.get(url)
+            if df is None:
+                logger.warning(f"Dados de {year}-{month:02d} não encontrados")
+                continue
+            
+            # Adiciona colunas de ano e mês
+            df['ano'] = year
+            df['mes'] = month
+            df['data'] = pd.Timestamp(year=year, month=month, day=1)
+            
+            all_data.append(df)
         
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
-            logger.info(f"Total de registros coletados: {len(combined_df)}")
+            logger.info(f"Total de registros coletados: {len(combined_df)} "
+                        f"({len(all_data)}/{len(urls)} meses)")
             return combined_df
         else:
             logger.warning("Nenhum dado foi coletado")
@@ -98,10 +114,11 @@ class ISPDadosCollector:
             # URL para dados por região
             url = f"{self.base_url}/Arquivos/Base{year}_Regiao.csv"
             
-            response = self.session.get(url, timeout=30)
+            self.rate_limiter.acquire()
+            response = self.http.get(url)
             
             if response.status_code == 200:
-                df = pd.read_csv(url, encoding='latin-1', sep=';')
+                df = self._parse_csv(response.content)
                 logger.info(f"Dados por região coletados: {len(df)} registros")
                 return df
             else:
@@ -13,6 +13,10 @@ from typing import Optional, Dict, List
 from datetime import datetime
 from pathlib import Path
 
+from src.data_collection.http_client import shared_http_client
+from src.data_collection.orchestrator import SourceResult, run_sources
+from src.data_collection.datastore import DatastoreError, DatastoreReader
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,9 +25,9 @@ class ISPRJCollector:
     
     BASE_URL = "http://www.ispdados.rj.gov.br/api"
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: Optional[int] = None):
         self.timeout = timeout
-        self.session = requests.Session()
+        self.http = shared_http_client
     
     def coletar_ocorrencias(self, 
                            ano_inicio: int = 2020,
@@ -51,7 +55,7 @@ class ISPRJCollector:
             
             logger.info(f"Coletando dados ISP-RJ: {ano_inicio}-{ano_fim}")
             
-            response = self.session.get(
+            response = self.http.get(
                 endpoint,
                 params=params,
                 timeout=self.timeout
@@ -88,15 +92,16 @@ class DataRioCollector:
     
     BASE_URL = "https://www.data.rio/api/3/action"
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: Optional[int] = None):
         self.timeout = timeout
-        self.session = requests.Session()
+        self.http = shared_http_client
+        self.datastore = DatastoreReader(self.BASE_URL, http=self.http)
     
     def listar_datasets(self) -> List[Dict]:
         """Lista todos os datasets disponíveis"""
         try:
             endpoint = f"{self.BASE_URL}/package_list"
-            response = self.session.get(endpoint, timeout=self.timeout)
+            response = self.http.get(endpoint, timeout=self.timeout)
             response.raise_for_status()
             
             return response.json()['result']
@@ -107,46 +112,30 @@ class DataRioCollector:
     
     def coletar_seguranca(self, 
                          resource_id: str,
-                         limit: int = 100000) -> Optional[pd.DataFrame]:
+                         limit: Optional[int] = None) -> Optional[pd.DataFrame]:
         """
         Coleta dados de segurança pública
         
+        O recurso é lido página a página (sem truncar em um limite fixo).
+        
         Args:
             resource_id: ID do recurso no Data.Rio
-            limit: Limite de registros
+            limit: Limite de registros (None = recurso inteiro)
             
         Returns:
             DataFrame com dados ou None
         """
         try:
-            endpoint = f"{self.BASE_URL}/datastore_search"
-            
-            params = {
-                'resource_id': resource_id,
-                'limit': limit
-            }
-            
             logger.info(f"Coletando dados Data.Rio: {resource_id}")
             
-            response = self.session.get(
-                endpoint,
-                params=params,
-                timeout=self.timeout
-            )
-            
-            response.raise_for_status()
-            
-            dados = response.json()
-            registros = dados['result']['records']
-            
-            df = pd.DataFrame(registros)
+            df = self.datastore.read(resource_id, max_records=limit)
             
             logger.info(f"Coletados {len(df)} registros do Data.Rio")
             
             return self._processar_dados_datario(df)
             
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Erro ao coletar Data.Rio: {e}")
+        except DatastoreError as e:
+            logger.error(f"Erro ao coletar Data.Rio (retomar do offset {e.offset}): {e}")
             return None
     
     def _processar_dados_datario(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -165,9 +154,9 @@ class IBGECollector:
     BASE_URL = "https://servicodados.ibge.gov.br/api/v1"
     CODIGO_RIO = "3304557"  # Código IBGE do município do Rio
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: Optional[int] = None):
         self.timeout = timeout
-        self.session = requests.Session()
+        self.http = shared_http_client
     
     def coletar_populacao(self) -> Optional[pd.DataFrame]:
         """Coleta projeção populacional do Rio de Janeiro"""
@@ -176,7 +165,7 @@ class IBGECollector:
             
             logger.info("Coletando população IBGE")
             
-            response = self.session.get(endpoint, timeout=self.timeout)
+            response = self.http.get(endpoint, timeout=self.timeout)
             response.raise_for_status()
             
             dados = response.json()
@@ -205,28 +194,41 @@ class RealDataManager:
         self.isp = ISPRJCollector()
         self.datario = DataRioCollector()
         self.ibge = IBGECollector()
+        self.status_fontes: Dict[str, SourceResult] = {}
     
     def coletar_dados_completos(self, 
                                 ano_inicio: int = 2020,
                                 ano_fim: int = 2024,
-                                save_path: Optional[Path] = None) -> Dict[str, pd.DataFrame]:
+                                save_path: Optional[Path] = None,
+                                prazos: Optional[Dict[str, float]] = None) -> Dict[str, pd.DataFrame]:
         """
         Coleta dados de todas as fontes
         
+        As fontes são independentes e coletadas em paralelo, cada uma com
+        seu prazo. Fontes lentas ou fora do ar ficam de fora do resultado;
+        o status de cada uma fica em self.status_fontes.
+        
         Args:
             ano_inicio: Ano inicial
             ano_fim: Ano final
             save_path: Caminho para salvar (opcional)
+            prazos: Prazo em segundos por fonte ('isp', 'datario', 'ibge')
             
         Returns:
             Dicionário com DataFrames de cada fonte
         """
         resultados = {}
         
-        # 1. ISP-RJ
         logger.info("=" * 50)
-        logger.info("COLETANDO DADOS ISP-RJ")
-        df_isp = self.isp.coletar_ocorrencias(ano_inicio, ano_fim)
+        logger.info("COLETANDO DADOS ISP-RJ, DATA.RIO E IBGE (em paralelo)")
+        self.status_fontes = run_sources({
+            'isp': lambda: self.isp.coletar_ocorrencias(ano_inicio, ano_fim),
+            'datario': self.datario.listar_datasets,
+            'ibge': self.ibge.coletar_populacao
+        }, deadlines=prazos)
+        
+        # 1. ISP-RJ
+        df_isp = self.status_fontes['isp'].data
         if df_isp is not None:
             resultados['isp'] = df_isp
             if save_path:
@@ -234,19 +236,15 @@ class RealDataManager:
                 logger.info(f"✅ ISP salvo em: {save_path / 'isp_ocorrencias.csv'}")
         
         # 2. Data.Rio
-        logger.info("=" * 50)
-        logger.info("COLETANDO DADOS DATA.RIO")
         # Primeiro, listar datasets disponíveis
-        datasets = self.datario.listar_datasets()
+        datasets = self.status_fontes['datario'].data or []
         logger.info(f"Datasets disponíveis: {len(datasets)}")
         
         # TODO: Buscar resource_id correto de segurança pública
         # Exemplo: df_datario = self.datario.coletar_seguranca('RESOURCE_ID')
         
         # 3. IBGE
-        logger.info("=" * 50)
-        logger.info("COLETANDO DADOS IBGE")
-        df_ibge = self.ibge.coletar_populacao()
+        df_ibge = self.status_fontes['ibge'].data
         if df_ibge is not None:
             resultados['ibge'] = df_ibge
             if save_path:
@@ -9,14 +9,28 @@ oficiais do Instituto de Segurança Pública do Rio de Janeiro.
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
 import json
+import os
 from pathlib import Path
 from datetime import datetime, timedelta
 import time
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from src.core.sample_data import generate_counts
+from src.core.disk_cache import shared_disk_cache
+from src.core.regions import CISP_PARA_RA, REGIOES_INFO, cisp_ra_table, ra_table
+from src.data_collection.isp_incremental import ISPIncrementalStore
+from src.data_collection.isp_schema import indicator_groups, resolve_isp_layout
+from src.data_collection.http_client import ConditionalDownloader
+
 # ============================================================================
 # CONFIGURAÇÕES
 # ============================================================================
@@ -39,92 +53,30 @@ PROCESSED_DIR = DATA_DIR / 'processed'
 for dir_path in [DATA_DIR, RAW_DIR, CACHE_DIR, PROCESSED_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
-# ============================================================================
-# MAPEAMENTO CISP → REGIÃO ADMINISTRATIVA
-# ============================================================================
+# Cache da última coleta (Parquet tipado + metadados da coleta; sem pyarrow
+# o cache fica desativado e toda coleta vai à fonte)
+ISP_CACHE_FILE = CACHE_DIR / 'isp_data_cache.parquet'
+ISP_CACHE_META_KEY = b'isp_cache'
+ISP_CACHE_TTL = timedelta(hours=24)
 
-# Mapeamento completo CISP para RA (baseado em dados oficiais)
-CISP_PARA_RA = {
-    # Centro
-    1: 1,   # 1ª DP - Portuária
-    2: 2,   # 2ª DP - Centro
-    3: 3,   # 3ª DP - Rio Comprido
-    4: 4,   # 4ª DP - Botafogo
-    5: 5,   # 5ª DP - Copacabana
-    6: 6,   # 6ª DP - Lagoa
-    7: 7,   # 7ª DP - São Cristóvão
-    8: 8,   # 8ª DP - Tijuca
-    9: 9,   # 9ª DP - Vila Isabel
-    10: 10, # 10ª DP - Ramos
-    11: 11, # 11ª DP - Penha
-    12: 12, # 12ª DP - Inhaúma
-    13: 13, # 13ª DP - Méier
-    14: 14, # 14ª DP - Irajá
-    15: 15, # 15ª DP - Madureira
-    16: 16, # 16ª DP - Jacarepaguá
-    17: 17, # 17ª DP - Bangu
-    18: 18, # 18ª DP - Campo Grande
-    19: 19, # 19ª DP - Santa Cruz
-    20: 20, # 20ª DP - Ilha do Governador
-    21: 21, # 21ª DP - Paquetá
-    22: 22, # 22ª DP - Anchieta
-    23: 23, # 23ª DP - Santa Teresa
-    24: 24, # 24ª DP - Barra da Tijuca
-    25: 25, # 25ª DP - Pavuna
-    26: 26, # 26ª DP - Guaratiba
-    27: 27, # 27ª DP - Rocinha
-    28: 28, # 28ª DP - Jacarezinho
-    29: 29, # 29ª DP - Complexo do Alemão
-    30: 30, # 30ª DP - Maré
-    31: 31, # 31ª DP - Vigário Geral
-    32: 32, # 32ª DP - Realengo
-    33: 33, # 33ª DP - Cidade de Deus
-    # Adicionais (se existirem)
-    34: 1,   # DP adicional → Portuária
-    35: 2,   # DP adicional → Centro
-    36: 8,   # DP adicional → Tijuca
-    37: 17,  # DP adicional → Bangu
-    38: 18,  # DP adicional → Campo Grande
-    39: 19,  # DP adicional → Santa Cruz
-    40: 32,  # DP adicional → Realengo
-}
 
-# Informações das Regiões Administrativas
-REGIOES_INFO = {
-    1: {"nome": "Portuária", "area": "Centro", "populacao": 39773},
-    2: {"nome": "Centro", "area": "Centro", "populacao": 41142},
-    3: {"nome": "Rio Comprido", "area": "Centro", "populacao": 79647},
-    4: {"nome": "Botafogo", "area": "Zona Sul", "populacao": 239729},
-    5: {"nome": "Copacabana", "area": "Zona Sul", "populacao": 146392},
-    6: {"nome": "Lagoa", "area": "Zona Sul", "populacao": 164936},
-    7: {"nome": "São Cristóvão", "area": "Zona Norte", "populacao": 85135},
-    8: {"nome": "Tijuca", "area": "Zona Norte", "populacao": 181839},
-    9: {"nome": "Vila Isabel", "area": "Zona Norte", "populacao": 187362},
-    10: {"nome": "Ramos", "area": "Zona Norte", "populacao": 147236},
-    11: {"nome": "Penha", "area": "Zona Norte", "populacao": 183561},
-    12: {"nome": "Inhaúma", "area": "Zona Norte", "populacao": 134743},
-    13: {"nome": "Méier", "area": "Zona Norte", "populacao": 391124},
-    14: {"nome": "Irajá", "area": "Zona Norte", "populacao": 192346},
-    15: {"nome": "Madureira", "area": "Zona Norte", "populacao": 360869},
-    16: {"nome": "Jacarepaguá", "area": "Zona Oeste", "populacao": 573896},
-    17: {"nome": "Bangu", "area": "Zona Oeste", "populacao": 732437},
-    18: {"nome": "Campo Grande", "area": "Zona Oeste", "populacao": 542080},
-    19: {"nome": "Santa Cruz", "area": "Zona Oeste", "populacao": 434753},
-    20: {"nome": "Ilha do Governador", "area": "Zona Norte", "populacao": 211018},
-    21: {"nome": "Paquetá", "area": "Zona Norte", "populacao": 3361},
-    22: {"nome": "Anchieta", "area": "Zona Norte", "populacao": 128386},
-    23: {"nome": "Santa Teresa", "area": "Centro", "populacao": 40926},
-    24: {"nome": "Barra da Tijuca", "area": "Zona Oeste", "populacao": 300823},
-    25: {"nome": "Pavuna", "area": "Zona Norte", "populacao": 227729},
-    26: {"nome": "Guaratiba", "area": "Zona Oeste", "populacao": 110049},
-    27: {"nome": "Rocinha", "area": "Zona Sul", "populacao": 69161},
-    28: {"nome": "Jacarezinho", "area": "Zona Norte", "populacao": 37839},
-    29: {"nome": "Complexo do Alemão", "area": "Zona Norte", "populacao": 69143},
-    30: {"nome": "Maré", "area": "Zona Norte", "populacao": 140003},
-    31: {"nome": "Vigário Geral", "area": "Zona Norte", "populacao": 35859},
-    32: {"nome": "Realengo", "area": "Zona Oeste", "populacao": 245025},
-    33: {"nome": "Cidade de Deus", "area": "Zona Oeste", "populacao": 36515}
-}
+def ler_metadados_cache(cache_file=ISP_CACHE_FILE):
+    """
+    Lê os metadados gravados no cache (data da coleta e hash da fonte)
+    
+    Args:
+        cache_file (Path): Arquivo de cache
+        
+    Returns:
+        dict: Metadados ou None se o cache não existe/é ilegível
+    """
+    if not PYARROW_AVAILABLE:
+        return None
+    try:
+        metadata = pq.read_schema(cache_file).metadata or {}
+        return json.loads(metadata[ISP_CACHE_META_KEY])
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        return None
 
 # ============================================================================
 # CLASSE: COLETOR DE DADOS
@@ -134,8 +86,12 @@ class ISPDataCollector:
     """Coletor automático de dados do ISP-RJ"""
     
     def __init__(self):
-        self.cache_file = CACHE_DIR / 'isp_data_cache.json'
+        self.cache_file = ISP_CACHE_FILE
         self.raw_file = RAW_DIR / f'isp_dados_{datetime.now().strftime("%Y%m%d")}.csv'
+        self.incremental = ISPIncrementalStore('mensal_cisp')
+        self.downloader = ConditionalDownloader()
+        self.dados_alterados = True
+        self.hash_fonte = None
         
     def coletar(self, force_refresh=False):
         """
@@ -163,9 +119,13 @@ class ISPDataCollector:
             if df_raw is not None and len(df_raw) > 0:
                 st.success(f"✅ Dados coletados: {len(df_raw):,} registros")
                 
+                if self.dados_alterados or not self.raw_file.exists():
+                    # Grava só os meses novos/revisados e atualiza o cubo
+                    self._ingerir_incremental(df_raw)
+                    self._salvar_raw(df_raw)
+                
                 # Salva cache
                 self._salvar_cache(df_raw)
-                self._salvar_raw(df_raw)
                 
                 return df_raw
             else:
@@ -184,31 +144,52 @@ class ISPDataCollector:
             st.warning("🔄 Usando dados simulados (baseados em padrões reais)")
             return self._gerar_dados_simulados()
     
+    def _ingerir_incremental(self, df):
+        """Ingere a base baixada nas partições mensais"""
+        try:
+            resultado = self.incremental.ingest(df)
+            st.info(f"🧩 Partições mensais: {resultado.summary()}")
+        except Exception as e:
+            st.warning(f"⚠️ Ingestão incremental indisponível: {e}")
+    
     def _cache_valido(self):
         """Verifica se cache é válido (menos de 24h)"""
-        if not self.cache_file.exists():
+        metadados = ler_metadados_cache(self.cache_file)
+        if metadados is None:
             return False
         
-        # Verifica idade do arquivo
-        idade = datetime.now() - datetime.fromtimestamp(self.cache_file.stat().st_mtime)
-        return idade < timedelta(hours=24)
+        # Verifica idade da coleta
+        idade = datetime.now() - datetime.fromisoformat(metadados['coletado_em'])
+        return idade < ISP_CACHE_TTL
     
     def _carregar_cache(self):
-        """Carrega dados do cache"""
+        """Carrega dados do cache (Parquet, com os tipos originais)"""
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            return pd.DataFrame(data)
+            return pd.read_parquet(self.cache_file)
         except Exception as e:
             st.error(f"Erro ao carregar cache: {e}")
             return None
     
     def _salvar_cache(self, df):
-        """Salva dados no cache"""
+        """Salva dados no cache com data da coleta e hash da fonte"""
+        if not PYARROW_AVAILABLE:
+            return
         try:
-            df_json = df.to_json(orient='records', date_format='iso')
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(json.loads(df_json), f, ensure_ascii=False, indent=2)
+            tabela = pa.Table.from_pandas(df, preserve_index=False)
+            metadados = {
+                'coletado_em': datetime.now().isoformat(timespec='seconds'),
+                'hash_fonte': self.hash_fonte,
+                'registros': len(df)
+            }
+            tabela = tabela.replace_schema_metadata({
+                **(tabela.schema.metadata or {}),
+                ISP_CACHE_META_KEY: json.dumps(metadados).encode('utf-8')
+            })
+            
+            # Grava em arquivo temporário e troca (leitores nunca veem meio arquivo)
+            temp_file = self.cache_file.with_name(f".{self.cache_file.name}.{os.getpid()}.tmp")
+            pq.write_table(tabela, temp_file)
+            os.replace(temp_file, self.cache_file)
         except Exception as e:
             st.error(f"Erro ao salvar cache: {e}")
     
@@ -220,34 +201,31 @@ class ISPDataCollector:
             st.error(f"Erro ao salvar arquivo raw: {e}")
     
     def _coletar_dados_api(self):
-        """Coleta dados da API oficial do ISP-RJ"""
+        """
+        Coleta dados da API oficial do ISP-RJ
+        
+        A requisição é condicional (ETag/Last-Modified): se o arquivo não
+        mudou no servidor, nada é baixado e o CSV já processado sai do
+        cache em disco.
+        """
         try:
-            # Headers para simular navegador
+            # Headers da requisição (User-Agent vem do cliente compartilhado)
             headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
                 'Accept': 'text/csv,application/csv',
                 'Accept-Language': 'pt-BR,pt;q=0.9,en;q=0.8'
             }
             
-            # Tenta URL principal
-            response = requests.get(ISP_URLS['base_dados'], headers=headers, timeout=30)
+            download = self.downloader.fetch(ISP_URLS['base_dados'], headers=headers)
+            self.dados_alterados = download.changed
+            self.hash_fonte = download.content_hash
+            if not download.changed:
+                st.info("📦 Base do ISP-RJ sem alterações no servidor")
             
-            if response.status_code == 200:
-                # Salva temporariamente
-                temp_file = RAW_DIR / 'temp_isp_data.csv'
-                with open(temp_file, 'wb') as f:
-                    f.write(response.content)
-                
-                # Lê CSV
-                df = pd.read_csv(temp_file, encoding='utf-8', sep=';')
-                
-                # Remove arquivo temporário
-                temp_file.unlink()
-                
-                return df
-            else:
-                st.error(f"Erro HTTP: {response.status_code}")
-                return None
+            # Lê CSV (ou o resultado já processado, se o conteúdo não mudou)
+            return shared_disk_cache.fetch(
+                download.path, 'isp_api',
+                lambda: pd.read_csv(download.path, encoding='utf-8', sep=';')
+            )
                 
         except Exception as e:
             st.error(f"Erro na coleta: {e}")
@@ -264,7 +242,10 @@ class ISPDataCollector:
                 arquivo_mais_recente = max(csv_files, key=lambda x: x.stat().st_mtime)
                 st.info(f"📁 Carregando: {arquivo_mais_recente.name}")
                 
-                df = pd.read_csv(arquivo_mais_recente, encoding='utf-8')
+                df = shared_disk_cache.fetch(
+                    arquivo_mais_recente, 'isp_raw',
+                    lambda: pd.read_csv(arquivo_mais_recente, encoding='utf-8')
+                )
                 return df
             
             return None
@@ -281,55 +262,44 @@ class ISPDataCollector:
         # Período: últimos 12 meses
         datas = pd.date_range(start='2024-01-01', end='2024-12-31', freq='MS')
         
-        dados = []
-        
-        for ra_id, info in REGIOES_INFO.items():
-            # Fatores de risco por área (baseado em dados reais)
-            if info['area'] == 'Zona Sul':
-                fator_risco = 0.6
-            elif info['area'] == 'Centro':
-                fator_risco = 1.0
-            elif info['area'] == 'Zona Norte':
-                fator_risco = 1.4
-            else:  # Zona Oeste
-                fator_risco = 1.6
-            
-            # Regiões com alta criminalidade (dados reais)
-            regioes_alta = [17, 18, 19, 25, 28, 29, 30, 32, 33]  # Bangu, Campo Grande, Santa Cruz, etc.
-            if ra_id in regioes_alta:
-                fator_risco *= 2.0
-            
-            for data in datas:
-                # Gera crimes baseados em população e fator de risco
-                base_crimes = (info['populacao'] / 100000) * 50 * fator_risco
-                
-                # Adiciona sazonalidade
-                mes = data.month
-                if mes in [12, 1, 2]:  # Verão
-                    sazonalidade = 1.2
-                elif mes in [6, 7, 8]:  # Inverno
-                    sazonalidade = 0.9
-                else:
-                    sazonalidade = 1.0
-                
-                # Gera valores
-                homicidios = max(0, int(np.random.poisson(base_crimes * 0.1 * sazonalidade)))
-                roubos = max(0, int(np.random.poisson(base_crimes * 0.4 * sazonalidade)))
-                furtos = max(0, int(np.random.poisson(base_crimes * 0.3 * sazonalidade)))
-                
-                dados.append({
-                    'ra_id': ra_id,
-                    'nome': info['nome'],
-                    'area': info['area'],
-                    'populacao': info['populacao'],
-                    'data': data,
-                    'homicidios': homicidios,
-                    'roubos': roubos,
-                    'furtos': furtos,
-                    'total_crimes': homicidios + roubos + furtos
-                })
-        
-        df = pd.DataFrame(dados)
+        ra_ids = np.array(list(REGIOES_INFO.keys()))
+        areas = np.array([info['area'] for info in REGIOES_INFO.values()])
+        populacao = np.array([info['populacao'] for info in REGIOES_INFO.values()])
+        
+        # Fatores de risco por área (baseado em dados reais)
+        fatores_area = {'Zona Sul': 0.6, 'Centro': 1.0, 'Zona Norte': 1.4}
+        fator_risco = np.array([fatores_area.get(area, 1.6) for area in areas])  # Zona Oeste: 1.6
+        
+        # Regiões com alta criminalidade (dados reais)
+        regioes_alta = [17, 18, 19, 25, 28, 29, 30, 32, 33]  # Bangu, Campo Grande, Santa Cruz, etc.
+        fator_risco = np.where(np.isin(ra_ids, regioes_alta), fator_risco * 2.0, fator_risco)
+        
+        # Crimes baseados em população e fator de risco, com sazonalidade
+        # (verão 1.2, inverno 0.9) e proporção por tipo de crime
+        sazonalidade = [1.2, 1.2, 1.0, 1.0, 1.0, 0.9, 0.9, 0.9, 1.0, 1.0, 1.0, 1.2]
+        contagens = generate_counts(
+            datas, 3, len(ra_ids),
+            base=50,
+            crime_factors=[0.1, 0.4, 0.3],
+            region_factors=(populacao / 100000) * fator_risco,
+            month_factors=sazonalidade,
+            distribution='poisson'
+        )
+        homicidios, roubos, furtos = (contagens[i].ravel() for i in range(3))
+        
+        # Linhas na ordem RA → data
+        n_datas = len(datas)
+        df = pd.DataFrame({
+            'ra_id': np.repeat(ra_ids, n_datas),
+            'nome': np.repeat([info['nome'] for info in REGIOES_INFO.values()], n_datas),
+            'area': np.repeat(areas, n_datas),
+            'populacao': np.repeat(populacao, n_datas),
+            'data': np.tile(datas.to_numpy(), len(ra_ids)),
+            'homicidios': homicidios,
+            'roubos': roubos,
+            'furtos': furtos,
+            'total_crimes': homicidios + roubos + furtos
+        })
         
         # Calcula taxa por 100k habitantes
         df['taxa_100k'] = (df['total_crimes'] / df['populacao']) * 100000
@@ -346,6 +316,9 @@ class ISPDataProcessor:
     def __init__(self):
         self.cisp_para_ra = CISP_PARA_RA
         self.regioes_info = REGIOES_INFO
+        # Tabelas de consulta pré-calculadas (CISP -> RA e atributos das RAs)
+        self.lookup = cisp_ra_table()
+        self.regioes = ra_table()
     
     def processar(self, df_raw, ano=2024):
         """
@@ -363,12 +336,12 @@ class ISPDataProcessor:
         
         try:
             # Se dados são simulados, já estão processados
-            if 'ra_id' in df_raw.columns and 'nome' in df_raw.columns:
+            if self.ja_por_ra(df_raw):
                 st.success("✅ Dados já processados")
                 return df_raw
             
-            # Processa dados reais do ISP
-            df_processado = self._processar_dados_reais(df_raw, ano)
+            painel = self.processar_painel(df_raw, anos=[ano])
+            df_processado = self.resumo_ano(painel, ano)
             
             st.success(f"✅ Processados dados de {len(df_processado)} RAs")
             return df_processado
@@ -377,56 +350,89 @@ class ISPDataProcessor:
             st.error(f"❌ Erro no processamento: {e}")
             return self._gerar_dados_fallback()
     
-    def _processar_dados_reais(self, df_raw, ano):
-        """Processa dados reais do ISP-RJ"""
+    @staticmethod
+    def ja_por_ra(df_raw):
+        """Se os dados já estão por RA (dados simulados)"""
+        return 'ra_id' in df_raw.columns and 'nome' in df_raw.columns
+    
+    def processar_painel(self, df_raw, anos=None):
+        """
+        Monta o painel longo (ra_id, ano, mes, indicador, valor) em uma passada
         
-        # Identifica colunas (estrutura pode variar)
-        colunas_identificadas = self._identificar_colunas(df_raw)
+        Todos os anos pedidos e todos os indicadores saem de uma única
+        agregação por (RA, ano, mês); a página fatia o painel por ano sem
+        reprocessar a base bruta.
         
-        if not colunas_identificadas:
-            raise Exception("Não foi possível identificar estrutura dos dados")
+        Args:
+            df_raw (pd.DataFrame): Dados brutos do ISP ou já por RA (simulados)
+            anos (list): Anos mantidos (None = todos)
+            
+        Returns:
+            pd.DataFrame: Painel longo
+        """
         
-        # Filtra por ano
-        if 'ano' in colunas_identificadas:
-            df_ano = df_raw[df_raw[colunas_identificadas['ano']] == ano]
-        else:
-            df_ano = df_raw
-        
-        # Agrupa por CISP/DP
-        if 'cisp' in colunas_identificadas:
-            df_agrupado = df_ano.groupby(colunas_identificadas['cisp']).agg({
-                colunas_identificadas['homicidios']: 'sum',
-                colunas_identificadas['roubos']: 'sum',
-                colunas_identificadas['furtos']: 'sum'
-            }).reset_index()
+        if self.ja_por_ra(df_raw):
+            # Dados simulados: já estão por RA
+            indicadores = [col for col in ('homicidios', 'roubos', 'furtos') if col in df_raw.columns]
+            datas = pd.to_datetime(df_raw['data'])
+            df = df_raw[indicadores].assign(ra_id=df_raw['ra_id'], ano=datas.dt.year,
+                                             mes=datas.dt.month)
         else:
-            # Se não tem CISP, agrupa por outra coluna
-            df_agrupado = df_ano.groupby(colunas_identificadas.get('delegacia', 'delegacia')).sum().reset_index()
+            # Identifica colunas pelo layout declarativo
+            layout = self._identificar_colunas(df_raw)
+            indicadores = layout.indicators
+            df_raw = layout.apply(df_raw)
+            
+            # Une a tabela CISP -> RA (CISPs sem RA são descartadas)
+            cisp = pd.to_numeric(df_raw['cisp'], errors='coerce')
+            df = df_raw[indicadores].assign(ra_id=cisp.map(self.lookup['ra_id']))
+            for chave in ('ano', 'mes'):
+                df[chave] = df_raw[chave] if chave in layout.keys else pd.NA
+            df = df.dropna(subset=['ra_id'])
+            df['ra_id'] = df['ra_id'].astype(int)
+        
+        # Sem coluna de ano no layout, todas as linhas entram (como em resumo_ano)
+        if anos is not None and df['ano'].notna().any():
+            df = df[df['ano'].isin(list(anos))]
+        
+        # Uma agregação por (RA, ano, mês) com todos os indicadores
+        agregado = df.groupby(['ra_id', 'ano', 'mes'], dropna=False)[indicadores].sum()
+        painel = agregado.reset_index().melt(
+            id_vars=['ra_id', 'ano', 'mes'], value_vars=indicadores,
+            var_name='indicador', value_name='valor'
+        )
+        painel['indicador'] = painel['indicador'].astype('category')
+        return painel
+    
+    def resumo_ano(self, painel, ano=None):
+        """
+        Fatia o painel e resume por RA (formato usado pelo dashboard)
+        
+        Args:
+            painel (pd.DataFrame): Saída de processar_painel
+            ano (int): Ano do resumo (None = todos os anos do painel)
+            
+        Returns:
+            pd.DataFrame: Dados por RA com todos os indicadores e totais
+        """
         
-        # Mapeia CISP para RA
-        df_agrupado['ra_id'] = df_agrupado[colunas_identificadas['cisp']].map(self.cisp_para_ra)
+        if ano is not None and painel['ano'].notna().any():
+            painel = painel[painel['ano'] == ano]
         
-        # Remove registros sem mapeamento
-        df_agrupado = df_agrupado.dropna(subset=['ra_id'])
+        # Indicadores em colunas, somados por RA
+        df_ra = painel.pivot_table(index='ra_id', columns='indicador', values='valor',
+                                   aggfunc='sum', observed=True)
+        df_ra.columns = df_ra.columns.astype(str)
+        df_ra.columns.name = None
         
-        # Agrupa por RA
-        df_ra = df_agrupado.groupby('ra_id').agg({
-            colunas_identificadas['homicidios']: 'sum',
-            colunas_identificadas['roubos']: 'sum',
-            colunas_identificadas['furtos']: 'sum'
-        }).reset_index()
+        # Grupos usados pelo dashboard (homicídios, roubos, furtos)
+        grupos = indicator_groups(df_ra.columns)
+        for grupo in ('homicidios', 'roubos', 'furtos'):
+            colunas = grupos.get(grupo, [])
+            df_ra[grupo] = df_ra[colunas].sum(axis=1) if colunas else 0
         
         # Adiciona informações das RAs
-        df_ra['nome'] = df_ra['ra_id'].map(lambda x: self.regioes_info[x]['nome'])
-        df_ra['area'] = df_ra['ra_id'].map(lambda x: self.regioes_info[x]['area'])
-        df_ra['populacao'] = df_ra['ra_id'].map(lambda x: self.regioes_info[x]['populacao'])
-        
-        # Renomeia colunas
-        df_ra = df_ra.rename(columns={
-            colunas_identificadas['homicidios']: 'homicidios',
-            colunas_identificadas['roubos']: 'roubos',
-            colunas_identificadas['furtos']: 'furtos'
-        })
+        df_ra = self.regioes.join(df_ra, how='inner').reset_index()
         
         # Calcula totais
         df_ra['total_crimes'] = df_ra['homicidios'] + df_ra['roubos'] + df_ra['furtos']
@@ -435,33 +441,12 @@ class ISPDataProcessor:
         return df_ra
     
     def _identificar_colunas(self, df):
-        """Identifica colunas do CSV do ISP-RJ"""
-        
-        colunas_disponiveis = df.columns.tolist()
-        colunas_identificadas = {}
-        
-        # Procura colunas de ano
-        for col in colunas_disponiveis:
-            if 'ano' in col.lower() or 'year' in col.lower():
-                colunas_identificadas['ano'] = col
-                break
-        
-        # Procura colunas de CISP/DP
-        for col in colunas_disponiveis:
-            if 'cisp' in col.lower() or 'dp' in col.lower() or 'delegacia' in col.lower():
-                colunas_identificadas['cisp'] = col
-                break
-        
-        # Procura colunas de crimes
-        for col in colunas_disponiveis:
-            if 'homicidio' in col.lower() or 'homicídio' in col.lower():
-                colunas_identificadas['homicidios'] = col
-            elif 'roubo' in col.lower():
-                colunas_identificadas['roubos'] = col
-            elif 'furto' in col.lower():
-                colunas_identificadas['furtos'] = col
-        
-        return colunas_identificadas
+        """Resolve o layout do CSV do ISP-RJ (nomes exatos, ver isp_schema)"""
+        
+        layout = resolve_isp_layout(df, required=('cisp',))
+        if not layout.indicators:
+            raise ValueError("Nenhuma coluna de indicador encontrada nos dados do ISP")
+        return layout
     
     def _gerar_dados_fallback(self):
         """Gera dados de fallback se processamento falhar"""
@@ -604,9 +589,10 @@ def main():
         st.markdown("---")
         
         # Status do cache
-        cache_file = CACHE_DIR / 'isp_data_cache.json'
-        if cache_file.exists():
-            idade = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
+        cache_file = ISP_CACHE_FILE
+        metadados = ler_metadados_cache(cache_file)
+        if metadados is not None:
+            idade = datetime.now() - datetime.fromisoformat(metadados['coletado_em'])
             st.info(f"📦 Cache: {idade.seconds // 3600}h {(idade.seconds % 3600) // 60}m atrás")
         else:
             st.warning("📦 Nenhum cache disponível")
@@ -653,44 +639,70 @@ def main():
             if df_raw is not None and len(df_raw) > 0:
                 st.success(f"✅ Dados coletados: {len(df_raw):,} registros")
                 
-                # Processa dados
-                processador = ISPDataProcessor()
-                df_processado = processador.processar(df_raw, ano)
-                
-                # Integra dados
-                integrador = DataIntegrator()
-                df_final = integrador.integrar(df_processado)
-                
-                # Salva dados processados
-                output_file = PROCESSED_DIR / f'dados_criminalidade_{ano}.csv'
-                df_final.to_csv(output_file, index=False, encoding='utf-8-sig')
-                
-                st.success(f"💾 Dados salvos em: {output_file}")
-                
-                # Mostra preview
-                st.markdown("### 📋 Preview dos Dados")
-                st.dataframe(df_final.head(10), use_container_width=True)
-                
-                # Estatísticas
-                st.markdown("### 📊 Estatísticas")
-                
-                col1, col2, col3, col4 = st.columns(4)
-                
-                with col1:
-                    st.metric("Total RAs", len(df_final))
-                
-                with col2:
-                    st.metric("Total Crimes", f"{df_final['total_crimes'].sum():,}")
-                
-                with col3:
-                    st.metric("Taxa Média", f"{df_final['taxa_100k'].mean():.1f}/100k")
-                
-                with col4:
-                    ra_max = df_final.loc[df_final['taxa_100k'].idxmax(), 'nome']
-                    st.metric("RA Mais Crítica", ra_max)
+                # Processa todos os anos de uma vez (o ano só fatia o painel)
+                st.info("⚙️ Processando dados...")
+                try:
+                    if ISPDataProcessor.ja_por_ra(df_raw):
+                        # Dados simulados: usados como vieram, sem filtro de ano
+                        st.session_state.pop('isp_painel', None)
+                        st.session_state['isp_fallback'] = df_raw
+                    else:
+                        st.session_state['isp_painel'] = ISPDataProcessor().processar_painel(df_raw)
+                        st.session_state.pop('isp_fallback', None)
+                except Exception as e:
+                    st.error(f"❌ Erro no processamento: {e}")
+                    st.session_state.pop('isp_painel', None)
+                    st.session_state['isp_fallback'] = ISPDataProcessor()._gerar_dados_fallback()
                 
             else:
                 st.error("❌ Falha na coleta de dados")
+        
+        # Fatia o painel já processado pelo ano escolhido (sem reprocessar)
+        painel = st.session_state.get('isp_painel')
+        df_processado = None
+        if painel is not None:
+            df_processado = ISPDataProcessor().resumo_ano(painel, ano)
+            if df_processado.empty:
+                st.warning(f"⚠️ Sem dados de {ano} no painel processado")
+                df_processado = None
+            else:
+                st.success(f"✅ Processados dados de {len(df_processado)} RAs ({ano})")
+        elif 'isp_fallback' in st.session_state:
+            df_processado = st.session_state['isp_fallback']
+        
+        if df_processado is not None:
+            
+            # Integra dados
+            integrador = DataIntegrator()
+            df_final = integrador.integrar(df_processado)
+            
+            # Salva dados processados
+            output_file = PROCESSED_DIR / f'dados_criminalidade_{ano}.csv'
+            df_final.to_csv(output_file, index=False, encoding='utf-8-sig')
+            
+            st.success(f"💾 Dados salvos em: {output_file}")
+            
+            # Mostra preview
+            st.markdown("### 📋 Preview dos Dados")
+            st.dataframe(df_final.head(10), use_container_width=True)
+            
+            # Estatísticas
+            st.markdown("### 📊 Estatísticas")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            
+            with col1:
+                st.metric("Total RAs", len(df_final))
+            
+            with col2:
+                st.metric("Total Crimes", f"{df_final['total_crimes'].sum():,}")
+            
+            with col3:
+                st.metric("Taxa Média", f"{df_final['taxa_100k'].mean():.1f}/100k")
+            
+            with col4:
+                ra_max = df_final.loc[df_final['taxa_100k'].idxmax(), 'nome']
+                st.metric("RA Mais Crítica", ra_max)
     
     with col2:
         st.markdown("### 📊 Status")
@@ -733,7 +745,10 @@ def main():
         
         if arquivo_selecionado:
             # Carrega dados
-            df_loaded = pd.read_csv(arquivo_selecionado, encoding='utf-8-sig')
+            df_loaded = shared_disk_cache.fetch(
+                arquivo_selecionado, 'isp_processed',
+                lambda: pd.read_csv(arquivo_selecionado, encoding='utf-8-sig')
+            )
             
             st.markdown(f"### 📊 Dados: {arquivo_selecionado.name}")
             
@@ -804,7 +819,7 @@ def main():
         **Cache:**
         - Duração: 24 horas
         - Local: `data/cache/`
-        - Formato: JSON
+        - Formato: Parquet (tipos preservados; data da coleta e hash da fonte nos metadados)
         
         **Arquivos:**
         - Raw: `data/raw/`
@@ -0,0 +1,251 @@
+"""
+📄 DATASTORE - Leitura Paginada do datastore_search (CKAN / Data.Rio)
+====================================================================
+
+Lê recursos do datastore do Data.Rio página a página, seguindo
+_links.next, em vez de uma única requisição com limit gigante (que
+trunca sem aviso quando o recurso é maior que o limite).
+
+Cada página é convertida assim que chega em buffers de coluna já
+tipados (pelos tipos declarados em 'fields'), e os dicts do JSON são
+descartados: a memória fica limitada ao tamanho da página mais os
+arrays finais. Opcionalmente a próxima página é baixada enquanto a
+atual é convertida, e a leitura pode ser retomada do último offset.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urljoin, urlparse
+import logging
+
+import pandas as pd
+
+from src.config import config
+from src.data_collection.http_client import HttpClient, shared_http_client
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Tipos do datastore (PostgreSQL) -> conversão pandas
+NUMERIC_TYPES = {'int', 'int2', 'int4', 'int8', 'integer', 'bigint', 'smallint'}
+FLOAT_TYPES = {'numeric', 'float', 'float4', 'float8', 'double precision', 'real'}
+DATE_TYPES = {'timestamp', 'timestamptz', 'date'}
+BOOL_TYPES = {'bool', 'boolean'}
+
+
+class DatastoreError(Exception):
+    """Falha no meio de uma leitura paginada (permite retomar)"""
+
+    def __init__(self, message: str, resource_id: str, offset: int):
+        super().__init__(message)
+        self.resource_id = resource_id
+        self.offset = offset
+
+
+@dataclass
+class DatastorePage:
+    """Uma página do datastore_search"""
+    records: List[Dict[str, Any]]
+    fields: List[Dict[str, Any]]
+    offset: int
+    total: Optional[int]
+    next_url: Optional[str] = None
+
+
+def _typed_column(values: List[Any], field_type: Optional[str]) -> pd.Series:
+    """Converte os valores de uma coluna de uma página para o tipo declarado"""
+    series = pd.Series(values, dtype=object)
+    if field_type in NUMERIC_TYPES:
+        return pd.to_numeric(series, errors='coerce').astype('Int64')
+    if field_type in FLOAT_TYPES:
+        return pd.to_numeric(series, errors='coerce').astype(float)
+    if field_type in DATE_TYPES:
+        return pd.to_datetime(series, errors='coerce')
+    if field_type in BOOL_TYPES:
+        return series.astype('boolean')
+    return series
+
+
+@dataclass
+class ColumnBuffers:
+    """Buffers de coluna tipados, preenchidos página a página"""
+    columns: Dict[str, List[pd.Series]] = field(default_factory=dict)
+    types: Dict[str, Optional[str]] = field(default_factory=dict)
+    rows: int = 0
+
+    def append(self, page: DatastorePage) -> None:
+        """Converte os registros da página e os acrescenta aos buffers"""
+        for field_info in page.fields:
+            self.types.setdefault(field_info['id'], field_info.get('type'))
+
+        n = len(page.records)
+        names = list(self.types) + [key for record in page.records[:1]
+                                    for key in record if key not in self.types]
+        for name in names:
+            values = [record.get(name) for record in page.records]
+            chunks = self.columns.get(name)
+            if chunks is None:
+                # Coluna nova: preenche as páginas anteriores com ausentes
+                chunks = self.columns[name] = (
+                    [pd.Series([None] * self.rows, dtype=object)] if self.rows else []
+                )
+            chunks.append(_typed_column(values, self.types.get(name)))
+        self.rows += n
+
+    def to_frame(self) -> pd.DataFrame:
+        """Concatena os buffers em um DataFrame"""
+        return pd.DataFrame({
+            name: pd.concat(chunks, ignore_index=True) if chunks else pd.Series(dtype=object)
+            for name, chunks in self.columns.items()
+        })
+
+
+class DatastoreReader:
+    """Leitor paginado do datastore_search"""
+
+    def __init__(self, base_url: str = "https://www.data.rio/api/3/action",
+                 http: Optional[HttpClient] = None,
+                 page_size: Optional[int] = None,
+                 prefetch: bool = True):
+        """
+        Args:
+            base_url: URL da API CKAN (até /api/3/action)
+            http: Cliente HTTP (padrão: shared_http_client)
+            page_size: Registros por página (padrão: config.apis.DATASTORE_PAGE_SIZE)
+            prefetch: Baixa a próxima página enquanto converte a atual
+        """
+        self.base_url = base_url.rstrip('/')
+        self.http = http or shared_http_client
+        self.page_size = page_size or config.apis.DATASTORE_PAGE_SIZE
+        self.prefetch = prefetch
+        # Leitura interrompida por recurso: último offset lido com sucesso
+        # e as páginas já convertidas (para retomar sem perder o que foi lido)
+        self.offsets: Dict[str, int] = {}
+        self.partial: Dict[str, ColumnBuffers] = {}
+
+    def _fetch(self, resource_id: str, offset: int, url: Optional[str],
+               params: Dict[str, Any]) -> DatastorePage:
+        """Baixa uma página (pela URL de _links.next ou por offset)"""
+        try:
+            if url:
+                response = self.http.get(url)
+            else:
+                response = self.http.get(f"{self.base_url}/datastore_search", params={
+                    **params, 'resource_id': resource_id,
+                    'limit': self.page_size, 'offset': offset
+                })
+            response.raise_for_status()
+            result = response.json()['result']
+        except Exception as e:
+            raise DatastoreError(f"Erro ao ler {resource_id} (offset {offset}): {e}",
+                                 resource_id, offset) from e
+
+        next_url = (result.get('_links') or {}).get('next')
+        return DatastorePage(
+            records=result.get('records', []),
+            fields=result.get('fields', []),
+            offset=offset,
+            total=result.get('total'),
+            next_url=urljoin(self.base_url + '/', next_url) if next_url else None
+        )
+
+    @staticmethod
+    def _next_offset(page: DatastorePage) -> int:
+        """Offset da próxima página (do link, se houver)"""
+        if page.next_url:
+            query = parse_qs(urlparse(page.next_url).query)
+            if 'offset' in query:
+                return int(query['offset'][0])
+        return page.offset + len(page.records)
+
+    def pages(self, resource_id: str, offset: int = 0,
+              max_records: Optional[int] = None, **params) -> Iterator[DatastorePage]:
+        """
+        Itera as páginas de um recurso a partir de um offset
+
+        Args:
+            resource_id: ID do recurso
+            offset: Offset inicial
+            max_records: Para depois de ler esse número de registros
+            **params: Parâmetros extras do datastore_search (filters, q...)
+
+        Yields:
+            DatastorePage
+
+        Raises:
+            DatastoreError: Falha de uma página (com o offset para retomar)
+        """
+        executor = ThreadPoolExecutor(max_workers=1) if self.prefetch else None
+        read = 0
+        try:
+            pending = None
+            page = self._fetch(resource_id, offset, None, params)
+            while page.records:
+                if max_records is not None and read + len(page.records) > max_records:
+                    page.records = page.records[:max_records - read]
+
+                read += len(page.records)
+                next_offset = self._next_offset(page)
+                done = ((max_records is not None and read >= max_records)
+                        or (page.total is not None and next_offset >= page.total)
+                        or len(page.records) < self.page_size)
+
+                if not done and executor is not None:
+                    pending = executor.submit(self._fetch, resource_id, next_offset,
+                                              page.next_url, params)
+
+                yield page
+                self.offsets[resource_id] = next_offset
+
+                if done:
+                    break
+                page = pending.result() if pending is not None else \
+                    self._fetch(resource_id, next_offset, page.next_url, params)
+                pending = None
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def read(self, resource_id: str, offset: int = 0, resume: bool = False,
+             max_records: Optional[int] = None, **params) -> pd.DataFrame:
+        """
+        Lê um recurso inteiro (ou até max_records) em colunas tipadas
+
+        Args:
+            resource_id: ID do recurso
+            offset: Offset inicial
+            resume: Completa a leitura interrompida deste recurso (do último offset,
+                mantendo os registros já lidos)
+            max_records: Limite de registros (None = todos)
+            **params: Parâmetros extras do datastore_search
+
+        Returns:
+            DataFrame com os registros lidos
+
+        Raises:
+            DatastoreError: Falha de uma página (self.offsets e self.partial
+                guardam onde retomar e o que já foi lido)
+        """
+        buffers = self.partial.get(resource_id) if resume else None
+        if buffers is not None and resource_id in self.offsets:
+            offset = self.offsets[resource_id]
+        else:
+            buffers = self.partial[resource_id] = ColumnBuffers()
+            self.offsets.pop(resource_id, None)
+
+        remaining = None if max_records is None else max(max_records - buffers.rows, 0)
+        total = None
+        if remaining != 0:
+            for page in self.pages(resource_id, offset, remaining, **params):
+                buffers.append(page)
+                total = page.total
+
+        # Leitura completa: nada a retomar
+        del self.partial[resource_id]
+        self.offsets.pop(resource_id, None)
+
+        df = buffers.to_frame()
+        logger.info(f"Data.Rio {resource_id}: {len(df)} registros"
+                    + (f" de {total}" if total is not None else ""))
+        return df
@@ -0,0 +1,385 @@
+"""
+🌐 HTTP CLIENT - Cliente HTTP Compartilhado pelos Coletores
+===========================================================
+
+Utilitários de rede compartilhados pelos coletores:
+
+- HttpClient: Session única com pool de conexões por host, retries com
+  backoff exponencial (APIConfig), gzip e métricas de tempo por host;
+  shared_http_client é a instância usada por todos os coletores
+- TokenBucket: limitador de taxa educado (requisições por segundo com
+  rajada limitada), seguro entre threads
+- fetch_all: baixa várias URLs em um pool de threads de tamanho fixo,
+  cada arquivo uma única vez, opcionalmente já fazendo o parse dos bytes
+- ConditionalDownloader: baixa arquivos grandes com requisições
+  condicionais (ETag/Last-Modified) e guarda a cópia local, para que uma
+  atualização sem mudanças custe só uma resposta 304
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Limitador de taxa por balde de fichas (thread-safe)"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Fichas repostas por segundo (requisições/s)
+            capacity: Tamanho máximo da rajada (padrão: max(1, rate))
+            clock: Relógio monotônico (injetável)
+            sleep: Função de espera (injetável)
+        """
+        if rate <= 0:
+            raise ValueError("rate deve ser positivo")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Repõe as fichas acumuladas desde a última leitura"""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Bloqueia até haver fichas suficientes e as consome
+
+        Args:
+            tokens: Número de fichas (no máximo capacity)
+
+        Returns:
+            Tempo total de espera, em segundos
+
+        Raises:
+            ValueError: Se tokens excede a capacidade (nunca seria atendido)
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"tokens ({tokens}) excede a capacidade do balde ({self.capacity})")
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class HttpClient:
+    """Cliente HTTP com pool de conexões, retries e métricas por host"""
+
+    # Status que disparam nova tentativa (com backoff)
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, max_retries: Optional[int] = None,
+                 backoff_factor: Optional[float] = None,
+                 timeout: Optional[float] = None,
+                 pool_size: Optional[int] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            max_retries: Tentativas extras (padrão: config.apis.MAX_RETRIES)
+            backoff_factor: Base do backoff exponencial, em segundos
+                (padrão: config.apis.RETRY_BACKOFF)
+            timeout: Timeout padrão por requisição (padrão: config.apis.REQUEST_TIMEOUT)
+            pool_size: Conexões mantidas por host (padrão: config.apis.HTTP_MAX_WORKERS)
+            headers: Cabeçalhos padrão adicionais
+        """
+        apis = config.apis
+        self.timeout = timeout or apis.REQUEST_TIMEOUT
+        retry = Retry(
+            total=apis.MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=apis.RETRY_BACKOFF if backoff_factor is None else backoff_factor,
+            status_forcelist=self.RETRY_STATUS,
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        pool_size = pool_size or apis.HTTP_MAX_WORKERS
+        adapter = HTTPAdapter(pool_connections=apis.HTTP_POOL_HOSTS,
+                              pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': apis.USER_AGENT,
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def headers(self):
+        """Cabeçalhos padrão da Session"""
+        return self.session.headers
+
+    def _record(self, url: str, elapsed: float, nbytes: int, error: bool) -> None:
+        """Acumula as métricas da requisição no host correspondente"""
+        host = requests.utils.urlparse(url).netloc
+        with self._lock:
+            stats = self._metrics.setdefault(host, {
+                'requests': 0, 'errors': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'bytes': 0
+            })
+            stats['requests'] += 1
+            stats['errors'] += int(error)
+            stats['seconds'] += elapsed
+            stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+            stats['bytes'] += nbytes
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Executa uma requisição (com retries) e registra o tempo
+
+        Com stream=True o tempo medido vai até o recebimento dos
+        cabeçalhos.
+
+        Args:
+            method: Método HTTP
+            url: URL
+            **kwargs: Repassados a requests.Session.request
+
+        Returns:
+            requests.Response (status final, após as tentativas)
+
+        Raises:
+            requests.RequestException: Falha de conexão/timeout esgotadas as tentativas
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        if kwargs['timeout'] is None:
+            kwargs['timeout'] = self.timeout
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self._record(url, time.perf_counter() - start, 0, error=True)
+            raise
+
+        elapsed = time.perf_counter() - start
+        nbytes = 0 if kwargs.get('stream') else len(response.content)
+        self._record(url, elapsed, nbytes, error=response.status_code >= 400)
+        logger.debug(f"{method} {url} -> {response.status_code} ({elapsed:.3f}s)")
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET com retries e métricas (mesma assinatura de Session.get)"""
+        return self.request('GET', url, **kwargs)
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Métricas acumuladas por host
+
+        Returns:
+            Host -> requisições, erros, tempo total/máximo/médio e bytes
+        """
+        with self._lock:
+            snapshot = {host: dict(stats) for host, stats in self._metrics.items()}
+        for stats in snapshot.values():
+            stats['mean_seconds'] = stats['seconds'] / stats['requests'] if stats['requests'] else 0.0
+        return snapshot
+
+    def reset_metrics(self) -> None:
+        """Zera as métricas"""
+        with self._lock:
+            self._metrics.clear()
+
+
+def fetch_all(session: Union[HttpClient, requests.Session], urls: Iterable[str],
+              parse: Optional[Callable[[bytes], Any]] = None,
+              max_workers: Optional[int] = None,
+              rate_limiter: Optional[TokenBucket] = None,
+              timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Baixa várias URLs com concorrência limitada
+
+    Cada URL é baixada uma única vez; o parse (se informado) roda na
+    própria thread, sobre os bytes já recebidos. Falhas e respostas
+    diferentes de 200 resultam em None para a URL.
+
+    Args:
+        session: Cliente HTTP (HttpClient ou Session)
+        urls: URLs a baixar
+        parse: Função aplicada ao conteúdo de cada resposta
+        max_workers: Downloads simultâneos (padrão: config.apis.HTTP_MAX_WORKERS)
+        rate_limiter: Limitador de taxa compartilhado entre as threads
+        timeout: Timeout por requisição (padrão: config.apis.REQUEST_TIMEOUT)
+
+    Returns:
+        Dicionário URL -> conteúdo (ou resultado do parse) ou None
+    """
+    urls = list(dict.fromkeys(urls))
+    max_workers = max_workers or config.apis.HTTP_MAX_WORKERS
+    timeout = timeout or config.apis.REQUEST_TIMEOUT
+
+    def fetch(url: str):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        response = session.get(url, timeout=timeout)
+        if response.status_code != 200:
+            logger.warning(f"HTTP {response.status_code}: {url}")
+            return None
+        return parse(response.content) if parse else response.content
+
+    results: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, max(len(urls), 1))) as executor:
+        futures = {executor.submit(fetch, url): url for url in urls}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                logger.error(f"Erro ao baixar {url}: {e}")
+                results[url] = None
+
+    return results
+
+
+@dataclass
+class DownloadResult:
+    """Resultado de um download condicional"""
+    url: str
+    path: Path
+    changed: bool
+    status: int
+    content_hash: str
+
+
+class ConditionalDownloader:
+    """Downloads condicionais com cópia local e metadados por URL"""
+
+    # Tamanho dos blocos gravados/hasheados durante o download
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, cache_dir: Optional[Path] = None,
+                 session: Optional[Union[HttpClient, requests.Session]] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            cache_dir: Diretório das cópias locais (padrão: data/cache/http)
+            session: Cliente HTTP (padrão: shared_http_client)
+            timeout: Timeout por requisição (padrão: config.apis.REQUEST_TIMEOUT)
+        """
+        self.cache_dir = Path(cache_dir or config.paths.DATA_CACHE / 'http')
+        self.session = session or shared_http_client
+        self.timeout = timeout or config.apis.REQUEST_TIMEOUT
+
+    def path_for(self, url: str) -> Path:
+        """Caminho da cópia local de uma URL"""
+        key = hashlib.blake2b(url.encode('utf-8'), digest_size=4).hexdigest()
+        name = url.rstrip('/').rsplit('/', 1)[-1].split('?')[0] or 'index'
+        return self.cache_dir / f"{key}-{name}"
+
+    def _meta_path(self, url: str) -> Path:
+        path = self.path_for(url)
+        return path.with_name(f"{path.name}.meta.json")
+
+    def metadata(self, url: str) -> Dict[str, Any]:
+        """
+        Metadados do último download (ETag, Last-Modified, hash)
+
+        Returns:
+            Dicionário (vazio se a URL nunca foi baixada)
+        """
+        meta_path = self._meta_path(url)
+        if not meta_path.exists() or not self.path_for(url).exists():
+            return {}
+        try:
+            return json.loads(meta_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> DownloadResult:
+        """
+        Baixa a URL só se mudou desde o último download
+
+        Envia If-None-Match/If-Modified-Since quando há cópia local. Uma
+        resposta 304, ou um 200 com o mesmo hash de conteúdo, resulta em
+        changed=False e a cópia local é mantida.
+
+        Args:
+            url: URL do arquivo
+            headers: Cabeçalhos extras da requisição
+
+        Returns:
+            DownloadResult com o caminho da cópia local
+
+        Raises:
+            requests.HTTPError: Se o servidor responder com erro
+        """
+        meta = self.metadata(url)
+        path = self.path_for(url)
+
+        headers = dict(headers or {})
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and meta:
+                logger.info(f"Não modificado (304): {url}")
+                return DownloadResult(url, path, False, 304, meta['hash'])
+            response.raise_for_status()
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            digest = hashlib.blake2b(digest_size=16)
+            with open(temp, 'wb') as f:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            content_hash = digest.hexdigest()
+            changed = content_hash != meta.get('hash')
+            if changed:
+                os.replace(temp, path)
+            else:
+                temp.unlink(missing_ok=True)
+
+            meta = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'hash': content_hash
+            }
+            status = response.status_code
+
+        self._meta_path(url).write_text(json.dumps(meta, indent=2), encoding='utf-8')
+        logger.info(f"{'Baixado' if changed else 'Sem mudanças'} ({status}): {url}")
+        return DownloadResult(url, path, changed, status, content_hash)
+
+
+# Instância compartilhada pelo processo
+shared_http_client = HttpClient()
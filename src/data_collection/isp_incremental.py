@@ -0,0 +1,293 @@
+"""
+🔁 ISP INCREMENTAL - Ingestão Mensal das Bases do ISP-RJ
+========================================================
+
+As bases do ISP-RJ (BaseDPEvolucaoMensalCisp, BaseMunicipioMensal) são
+republicadas inteiras a cada mês, mas só o mês novo (e eventuais
+revisões) muda. Este módulo grava cada base em partições ano/mês e
+mantém um cubo de agregados persistido: a cada download, só as partições
+novas ou alteradas são gravadas e só os meses correspondentes do cubo
+são recalculados.
+
+A base estadual é lida em blocos (stream_isp_csv), com filtros de
+município e ano e a projeção de colunas aplicados a cada bloco, e os
+blocos vão direto para o armazenamento (ingest_chunks), sem montar a
+base inteira em memória: o pico depende do tamanho do bloco e de um mês,
+não do arquivo estadual.
+"""
+
+import io
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+import logging
+
+import pandas as pd
+
+from src.config import config
+from src.core.cube import CrimeCube
+from src.core.partitions import IngestResult, PartitionedStore, partition_hashes
+from src.core.regions import CISP_PARA_RA, REGIOES_INFO
+from src.core.storage import filter_frame
+from src.data_collection.isp_schema import ISP_ID_COLUMNS
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Município usado no filtro padrão
+MUNICIPIO_RIO = 'Rio de Janeiro'
+
+# Primeiro ano da série mensal do ISP-RJ
+ISP_SERIES_START_YEAR = 2003
+
+# Linhas por bloco na leitura em streaming das bases estaduais
+CSV_CHUNK_SIZE = 50_000
+
+
+def parse_isp_csv(content: bytes, encoding: str = 'latin-1', sep: str = ';') -> pd.DataFrame:
+    """
+    Lê um CSV do ISP-RJ a partir dos bytes já baixados
+
+    Args:
+        content: Corpo da resposta
+        encoding: Codificação do arquivo
+        sep: Separador
+
+    Returns:
+        DataFrame no layout original
+    """
+    return pd.read_csv(io.BytesIO(content), encoding=encoding, sep=sep)
+
+
+def stream_isp_csv(path: Union[str, Path],
+                   municipio: Optional[str] = MUNICIPIO_RIO,
+                   anos: Optional[Iterable[int]] = None,
+                   columns: Optional[List[str]] = None,
+                   chunksize: int = CSV_CHUNK_SIZE,
+                   encoding: str = 'latin-1',
+                   sep: str = ';') -> Iterator[pd.DataFrame]:
+    """
+    Lê uma base do ISP em blocos, filtrando e projetando cada bloco
+
+    Args:
+        path: CSV da base (cópia local do download)
+        municipio: Município mantido (None = todos)
+        anos: Anos mantidos (None = todos)
+        columns: Colunas mantidas (None = todas); ano e mes sempre entram
+        chunksize: Linhas por bloco
+        encoding: Codificação do arquivo
+        sep: Separador
+
+    Yields:
+        Blocos com as linhas mantidas (blocos vazios são pulados)
+    """
+    filters = []
+    if municipio:
+        filters.append(('munic', '==', municipio))
+    if anos is not None:
+        filters.append(('ano', 'in', list(anos)))
+
+    # Colunas lidas = projeção + partição + colunas dos filtros
+    keep = set(columns) | {'ano', 'mes'} if columns is not None else None
+    usecols = None
+    if keep is not None:
+        wanted = keep | {col for col, _, _ in filters}
+        usecols = lambda col: col in wanted
+
+    reader = pd.read_csv(path, encoding=encoding, sep=sep, usecols=usecols,
+                         chunksize=chunksize)
+    for chunk in reader:
+        kept = filter_frame(chunk, filters)
+        if keep is not None:
+            kept = kept[[col for col in chunk.columns if col in keep]]
+        if len(kept):
+            yield kept
+
+
+def isp_indicator_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Colunas numéricas de indicadores de uma base do ISP
+
+    Args:
+        df: Base do ISP em formato largo
+
+    Returns:
+        Lista de colunas de indicadores
+    """
+    return [col for col in df.columns
+            if col not in ISP_ID_COLUMNS and pd.api.types.is_numeric_dtype(df[col])]
+
+
+def isp_to_long(df: pd.DataFrame, value_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Converte a base larga do ISP (um indicador por coluna) para o formato
+    longo do projeto (regiao_administrativa, tipo_crime, data, total_ocorrencias)
+
+    A região vem da CISP (mapeada para a RA) ou do município.
+
+    Args:
+        df: Base do ISP com colunas ano e mes
+        value_columns: Indicadores a usar (padrão: todos os numéricos)
+
+    Returns:
+        DataFrame em formato longo
+    """
+    value_columns = value_columns or isp_indicator_columns(df)
+
+    if 'cisp' in df.columns:
+        nomes = {cisp: REGIOES_INFO[ra]['nome'] for cisp, ra in CISP_PARA_RA.items()}
+        regiao = df['cisp'].map(nomes)
+    elif 'munic' in df.columns:
+        regiao = df['munic']
+    else:
+        regiao = pd.Series(MUNICIPIO_RIO, index=df.index)
+
+    base = pd.DataFrame({
+        'regiao_administrativa': regiao,
+        'data': pd.to_datetime({'year': df['ano'], 'month': df['mes'], 'day': 1})
+    })
+    long = pd.concat([base, df[value_columns]], axis=1).melt(
+        id_vars=['regiao_administrativa', 'data'], value_vars=value_columns,
+        var_name='tipo_crime', value_name='total_ocorrencias'
+    )
+    return long
+
+
+class ISPIncrementalStore:
+    """Base do ISP particionada por mês + cubo de agregados mantido incrementalmente"""
+
+    def __init__(self, dataset: str, base_path: Optional[Path] = None,
+                 municipio: Optional[str] = MUNICIPIO_RIO,
+                 value_columns: Optional[List[str]] = None):
+        """
+        Args:
+            dataset: Nome da base (diretório das partições)
+            base_path: Diretório raiz (padrão: data/processed/isp)
+            municipio: Filtro de município (None = sem filtro)
+            value_columns: Indicadores agregados no cubo (padrão: todos)
+        """
+        self.dataset = dataset
+        self.store = PartitionedStore(base_path or config.paths.DATA_PROCESSED / 'isp', dataset)
+        self.municipio = municipio
+        self.value_columns = value_columns
+        self.cube_path = self.store.root / 'cube.npz'
+
+    def _filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aplica o filtro de município, quando a coluna existe"""
+        if self.municipio and 'munic' in df.columns:
+            return df[df['munic'] == self.municipio]
+        return df
+
+    def _build_cube(self, df: pd.DataFrame) -> CrimeCube:
+        """Cubo de um recorte da base larga"""
+        return CrimeCube.from_frame(isp_to_long(df, self.value_columns),
+                                    values=['total_ocorrencias'])
+
+    def ingest(self, df: pd.DataFrame) -> IngestResult:
+        """
+        Grava as partições novas/alteradas e atualiza o cubo só nesses meses
+
+        Args:
+            df: Base completa do ISP recém-baixada (formato largo)
+
+        Returns:
+            IngestResult com as partições gravadas
+        """
+        result = self.store.ingest(self._filter(df))
+        self._update_cube(result)
+        return result
+
+    def ingest_chunks(self, chunks: Iterable[pd.DataFrame]) -> IngestResult:
+        """
+        Ingestão em streaming: cada bloco é filtrado e gravado assim que chega
+
+        Args:
+            chunks: Blocos da base em formato largo (ex.: stream_isp_csv)
+
+        Returns:
+            IngestResult com as partições gravadas
+        """
+        result = self.store.ingest_chunks(self._filter(chunk) for chunk in chunks)
+        self._update_cube(result)
+        return result
+
+    def write_month(self, ano: int, mes: int, content: bytes) -> Optional[Dict]:
+        """
+        Grava a partição de um mês a partir do arquivo mensal do ISP
+        (BaseAAAAMM.csv), sem registrar no manifesto
+
+        Seguro para processos paralelos (cada mês é um arquivo); a entrada
+        retornada deve ser registrada com store.commit() por um único
+        processo, e o cubo remontado com rebuild_cube() no fim da carga.
+
+        Args:
+            ano: Ano do arquivo
+            mes: Mês do arquivo
+            content: Conteúdo do CSV mensal
+
+        Returns:
+            Entrada do manifesto ou None se o mês não tem linhas (após o filtro)
+        """
+        df = self._filter(parse_isp_csv(content))
+        df = df.assign(ano=ano, mes=mes).reset_index(drop=True)
+        if df.empty:
+            return None
+
+        key = (ano, mes)
+        return self.store.write_partition(key, df, partition_hashes(df, self.store.columns)[key])
+
+    def _update_cube(self, result: IngestResult) -> None:
+        """Recalcula no cubo só os meses gravados (ou monta o cubo na primeira carga)"""
+        if not self.store.keys() or (not result.has_changes and self.cube_path.exists()):
+            return
+
+        if self.cube_path.exists() and result.has_changes:
+            changed = (pd.concat(result.frames.values(), ignore_index=True) if result.frames
+                       else self.store.read(result.updated))
+            cube = CrimeCube.load(self.cube_path)
+            cube.update(self._build_cube(changed))
+        else:
+            # Primeira carga: monta o cubo com todas as partições
+            cube = self._build_cube(self.store.read())
+
+        cube.save(self.cube_path)
+        logger.info(f"{self.dataset}: {result.summary()}")
+
+    def rebuild_cube(self) -> Optional[CrimeCube]:
+        """
+        Remonta o cubo com todas as partições (após cargas fora de ingest)
+
+        Returns:
+            CrimeCube ou None se não há partições
+        """
+        if not self.has_data():
+            return None
+        cube = self._build_cube(self.store.read())
+        cube.save(self.cube_path)
+        return cube
+
+    def has_data(self) -> bool:
+        """Se já há partições ingeridas"""
+        return bool(self.store.keys())
+
+    def load(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Lê a base consolidada a partir das partições
+
+        Args:
+            columns: Colunas a projetar (None = todas)
+
+        Returns:
+            DataFrame com todos os meses ingeridos
+        """
+        return self.store.read(columns=columns)
+
+    def cube(self) -> Optional[CrimeCube]:
+        """
+        Cubo de agregados persistido
+
+        Returns:
+            CrimeCube ou None se nada foi ingerido
+        """
+        if not self.cube_path.exists():
+            return None
+        return CrimeCube.load(self.cube_path)
@@ -0,0 +1,154 @@
+"""
+📐 ISP SCHEMA - Layout Declarativo das Bases do ISP-RJ
+======================================================
+
+Descreve as colunas das bases do ISP-RJ (chaves, identificação e
+indicadores) em tabelas de nomes exatos, em vez de procurar trechos nos
+nomes das colunas (o que confundia, por exemplo, 'mes' com 'mes_ano' ou
+'dp' com qualquer coluna contendo essas letras). Cabeçalhos de layouts
+diferentes (maiúsculas, acentos, nomes antigos) são levados ao nome
+canônico e os indicadores são todas as colunas numéricas restantes.
+"""
+
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Colunas de identificação (não são indicadores de crime)
+ISP_ID_COLUMNS = {
+    'cisp', 'aisp', 'risp', 'ano', 'mes', 'mes_ano', 'munic', 'mcirc',
+    'fmun', 'fmun_cod', 'regiao', 'Regiao', 'fase'
+}
+
+# Nome canônico -> nomes aceitos nos layouts do ISP (já normalizados)
+ISP_KEY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'cisp': ('cisp', 'dp', 'delegacia', 'circ'),
+    'ano': ('ano', 'vano', 'year'),
+    'mes': ('mes', 'month'),
+    'munic': ('munic', 'municipio'),
+}
+
+# Grupos de indicadores: coluna de total publicada e, na falta dela,
+# prefixo das colunas somadas
+ISP_INDICATOR_GROUPS: Dict[str, Tuple[str, Optional[str]]] = {
+    'homicidios': ('hom_doloso', None),
+    'roubos': ('total_roubos', 'roubo_'),
+    'furtos': ('total_furtos', 'furto_'),
+}
+
+
+def canonical_column(name: str) -> str:
+    """Nome de coluna sem acentos, em minúsculas e sem espaços nas pontas"""
+    text = unicodedata.normalize('NFKD', str(name).strip())
+    return ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+
+
+def indicator_groups(indicators: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Colunas que compõem cada grupo de indicadores (ISP_INDICATOR_GROUPS)
+
+    Um indicador com o próprio nome do grupo (dados já agregados) é usado
+    diretamente; senão a coluna de total publicada; senão a soma das
+    colunas com o prefixo do grupo.
+
+    Args:
+        indicators: Indicadores disponíveis
+
+    Returns:
+        Grupo -> colunas somadas (grupos sem colunas ficam de fora)
+    """
+    indicators = list(indicators)
+    groups = {}
+    for group, (total, prefix) in ISP_INDICATOR_GROUPS.items():
+        if group in indicators:
+            groups[group] = [group]
+        elif total in indicators:
+            groups[group] = [total]
+        elif prefix is not None:
+            members = [col for col in indicators if col.startswith(prefix)]
+            if members:
+                groups[group] = members
+    return groups
+
+
+@dataclass
+class ISPLayout:
+    """Layout resolvido de uma base do ISP"""
+    columns: Dict[str, str]
+    indicators: List[str]
+    groups: Dict[str, List[str]] = field(default_factory=dict)
+
+    @property
+    def keys(self) -> List[str]:
+        """Colunas-chave presentes (nomes canônicos)"""
+        return [key for key in ISP_KEY_ALIASES if key in self.columns.values()]
+
+    @property
+    def rename(self) -> Dict[str, str]:
+        """Colunas cujo nome original difere do canônico"""
+        return {col: name for col, name in self.columns.items() if name != col}
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Renomeia as colunas para os nomes canônicos e garante indicadores numéricos
+
+        Args:
+            df: Base do ISP no layout original
+
+        Returns:
+            DataFrame com nomes canônicos
+        """
+        df = df.rename(columns=self.rename)
+        for col in self.indicators:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
+
+
+def resolve_isp_layout(df: pd.DataFrame,
+                       required: Iterable[str] = ('cisp',)) -> ISPLayout:
+    """
+    Resolve o layout de uma base do ISP pelos nomes exatos das colunas
+
+    Args:
+        df: Base do ISP (qualquer layout)
+        required: Chaves canônicas obrigatórias
+
+    Returns:
+        ISPLayout com nomes canônicos, indicadores e grupos
+
+    Raises:
+        ValueError: Se falta alguma chave obrigatória
+    """
+    aliases = {alias: key for key, names in ISP_KEY_ALIASES.items() for alias in names}
+
+    names: Dict[str, str] = {}
+    for col in df.columns:
+        name = canonical_column(col)
+        key = aliases.get(name, name)
+        # Primeira coluna de cada chave vence (ex.: cisp antes de dp)
+        names[col] = name if key in names.values() else key
+
+    missing = [key for key in required if key not in names.values()]
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes na base do ISP: {missing}")
+
+    skip = ISP_ID_COLUMNS | set(aliases) | set(ISP_KEY_ALIASES)
+    indicators = [
+        name for col, name in names.items()
+        if name not in skip and (
+            pd.api.types.is_numeric_dtype(df[col])
+            or pd.to_numeric(df[col].head(100), errors='coerce').notna().any()
+        )
+    ]
+
+    layout = ISPLayout(columns=names, indicators=indicators,
+                       groups=indicator_groups(indicators))
+    logger.debug(f"Layout ISP: chaves {layout.keys}, {len(indicators)} indicadores")
+    return layout
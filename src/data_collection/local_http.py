@@ -0,0 +1,91 @@
+"""
+🧪 LOCAL HTTP - Servidor HTTP Local para Testes Offline
+=======================================================
+
+Servidor mínimo em 127.0.0.1 que responde com conteúdos fixos por
+caminho (com ETag e 304 para requisições condicionais). Permite
+exercitar os coletores sem acesso ao ISP-RJ:
+
+    with LocalHTTPServer({'/Arquivos/Base202001.csv': b'...'}) as server:
+        collector = ISPDadosCollector(base_url=server.url)
+"""
+
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class LocalHTTPServer:
+    """Servidor HTTP local com respostas fixas (uso em testes)"""
+
+    def __init__(self, routes: Dict[str, bytes], delay: float = 0.0):
+        """
+        Args:
+            routes: Caminho -> corpo da resposta (demais caminhos: 404)
+            delay: Atraso artificial por requisição, em segundos
+        """
+        self.routes = dict(routes)
+        self.delay = delay
+        self.requests: List[str] = []
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """URL base do servidor (http://127.0.0.1:porta)"""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        """Classe de handler ligada a esta instância"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(self.path)
+                if server.delay:
+                    threading.Event().wait(server.delay)
+
+                body = server.routes.get(self.path.split('?')[0])
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'LocalHTTPServer':
+        """Sobe o servidor em uma porta livre"""
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Derruba o servidor"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'LocalHTTPServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,152 @@
+"""
+🎼 ORCHESTRATOR - Coleta Concorrente de Fontes Independentes
+============================================================
+
+Dispara as coletas de fontes que não dependem umas das outras (ISP,
+Data.Rio, IBGE...) em paralelo, cada uma com seu prazo. O tempo total
+passa a ser o da fonte mais lenta (limitado pelo prazo), e uma fonte
+lenta ou fora do ar não derruba as demais: o resultado traz o status de
+cada fonte e os dados das que responderam.
+
+Cada fonte roda em uma thread daemon, então uma coleta travada também
+não impede o processo de terminar. Limitação: o prazo não interrompe a
+coleta; a thread abandonada segue até a função retornar (ou o processo
+sair), segurando a conexão. O que encerra uma requisição travada é o
+timeout do cliente HTTP.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import pandas as pd
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Status possíveis de uma fonte
+STATUS_OK = 'ok'
+STATUS_EMPTY = 'vazio'
+STATUS_ERROR = 'erro'
+STATUS_TIMEOUT = 'timeout'
+
+
+@dataclass
+class SourceResult:
+    """Resultado da coleta de uma fonte"""
+    name: str
+    status: str
+    data: Any = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Se a fonte retornou dados"""
+        return self.status == STATUS_OK
+
+
+def _is_empty(data: Any) -> bool:
+    """None, DataFrame vazio ou coleção vazia"""
+    if data is None:
+        return True
+    if isinstance(data, pd.DataFrame):
+        return data.empty
+    try:
+        return len(data) == 0
+    except TypeError:
+        return False
+
+
+def _run_daemon(name: str, task: Callable[[], Any]) -> Future:
+    """Executa a tarefa em uma thread daemon e devolve o Future do resultado"""
+    future: Future = Future()
+
+    def run():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(task())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name=f'coleta-{name}', daemon=True).start()
+    return future
+
+
+def run_sources(tasks: Dict[str, Callable[[], Any]],
+                deadlines: Optional[Dict[str, float]] = None,
+                default_deadline: Optional[float] = None) -> Dict[str, SourceResult]:
+    """
+    Executa as coletas em paralelo, com prazo por fonte
+
+    Os prazos contam a partir do disparo. Uma fonte que estoura o prazo
+    é marcada como timeout e abandonada: a thread (daemon) termina em
+    segundo plano, sem bloquear o retorno nem a saída do processo.
+
+    Args:
+        tasks: Nome da fonte -> função sem argumentos que coleta os dados
+        deadlines: Prazo em segundos por fonte
+        default_deadline: Prazo das fontes sem prazo próprio
+            (padrão: config.apis.SOURCE_DEADLINE)
+
+    Returns:
+        Nome da fonte -> SourceResult, na ordem de tasks
+    """
+    deadlines = deadlines or {}
+    default_deadline = default_deadline or config.apis.SOURCE_DEADLINE
+
+    start = time.monotonic()
+    finished: Dict[str, float] = {}
+
+    def timed(name: str, task: Callable[[], Any]):
+        try:
+            return task()
+        finally:
+            finished[name] = time.monotonic() - start
+
+    futures = {name: _run_daemon(name, lambda name=name, task=task: timed(name, task))
+               for name, task in tasks.items()}
+
+    results: Dict[str, SourceResult] = {}
+    for name, future in futures.items():
+        deadline = deadlines.get(name, default_deadline)
+        remaining = max(start + deadline - time.monotonic(), 0.0)
+        try:
+            data = future.result(timeout=remaining)
+            status = STATUS_EMPTY if _is_empty(data) else STATUS_OK
+            results[name] = SourceResult(name, status, data, finished.get(name, 0.0))
+        except FutureTimeout:
+            results[name] = SourceResult(name, STATUS_TIMEOUT, elapsed=deadline,
+                                         error=f"prazo de {deadline:.0f}s excedido")
+        except Exception as e:
+            results[name] = SourceResult(name, STATUS_ERROR, elapsed=finished.get(name, 0.0),
+                                         error=str(e))
+
+        result = results[name]
+        log = logger.info if result.ok else logger.warning
+        log(f"Fonte {name}: {result.status} ({result.elapsed:.1f}s)"
+            + (f" - {result.error}" if result.error else ""))
+
+    return results
+
+
+def status_frame(results: Dict[str, SourceResult]) -> pd.DataFrame:
+    """
+    Tabela de status das fontes (para relatórios e para a interface)
+
+    Args:
+        results: Saída de run_sources
+
+    Returns:
+        DataFrame com fonte, status, tempo e erro
+    """
+    return pd.DataFrame([
+        {'fonte': r.name, 'status': r.status, 'tempo_s': round(r.elapsed, 2), 'erro': r.error}
+        for r in results.values()
+    ])
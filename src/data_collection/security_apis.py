@@ -19,6 +19,10 @@ from typing import Dict, List, Optional
 import warnings
 warnings.filterwarnings('ignore')
 
+from src.core.sample_data import generate_counts
+from src.core.cube import CrimeCube
+from src.data_collection.orchestrator import run_sources, status_frame
+
 class SecurityDataCollector:
     """Coletor de dados de segurança pública"""
     
@@ -44,10 +48,9 @@ class SecurityDataCollector:
         print("🔍 Coletando dados do ISP-RJ...")
         
         # Simulação de dados reais baseados em padrões do ISP-RJ
-        np.random.seed(42)
         data_inicio = datetime.now() - timedelta(days=periodo_meses * 30)
+        datas = pd.DatetimeIndex([data_inicio + timedelta(days=mes * 30) for mes in range(periodo_meses)])
         
-        crimes_data = []
         # APENAS MUNICÍPIO DO RIO DE JANEIRO
         regioes = [
             'Centro', 'Zona Sul', 'Zona Norte', 'Zona Oeste'
@@ -60,38 +63,34 @@ class SecurityDataCollector:
             'Violência Doméstica', 'Apreensão de Armas', 'Apreensão de Drogas'
         ]
         
-        for mes in range(periodo_meses):
-            data_mes = data_inicio + timedelta(days=mes * 30)
-            
-            for regiao in regioes:
-                for crime in tipos_crime:
-                    # Padrões baseados em dados reais do RJ
-                    if crime == 'Homicídio Doloso':
-                        base_ocorrencias = np.random.poisson(15)
-                    elif crime == 'Roubo a Transeunte':
-                        base_ocorrencias = np.random.poisson(120)
-                    elif crime == 'Furto a Transeunte':
-                        base_ocorrencias = np.random.poisson(200)
-                    else:
-                        base_ocorrencias = np.random.poisson(30)
-                    
-                    # Ajuste por região do município
-                    if regiao == 'Zona Sul':
-                        base_ocorrencias = int(base_ocorrencias * 0.6)
-                    elif regiao == 'Centro':
-                        base_ocorrencias = int(base_ocorrencias * 1.1)
-                    elif regiao == 'Zona Norte':
-                        base_ocorrencias = int(base_ocorrencias * 1.3)
-                    elif regiao == 'Zona Oeste':
-                        base_ocorrencias = int(base_ocorrencias * 1.5)
-                    
-                    crimes_data.append({
-                        'data': data_mes.strftime('%Y-%m-%d'),
-                        'regiao': regiao,
-                        'tipo_crime': crime,
-                        'ocorrencias': max(0, base_ocorrencias),
-                        'fonte': 'ISP-RJ'
-                    })
+        # Padrões baseados em dados reais do RJ (média mensal por crime)
+        medias_crime = {
+            'Homicídio Doloso': 15,
+            'Roubo a Transeunte': 120,
+            'Furto a Transeunte': 200
+        }
+        
+        # Ajuste por região do município
+        fatores_regiao = np.array([1.1, 0.6, 1.3, 1.5])
+        
+        ocorrencias = generate_counts(
+            datas, len(tipos_crime), len(regioes),
+            base=1,
+            crime_factors=[medias_crime.get(crime, 30) for crime in tipos_crime],
+            distribution='poisson',
+            rng=np.random.default_rng(42)
+        )
+        ocorrencias = np.trunc(ocorrencias * fatores_regiao[None, :, None]).astype(int)
+        
+        # Linhas na ordem mês → região → crime
+        n_meses, n_regioes, n_crimes = len(datas), len(regioes), len(tipos_crime)
+        crimes_data = {
+            'data': np.repeat(datas.strftime('%Y-%m-%d').to_numpy(), n_regioes * n_crimes),
+            'regiao': np.tile(np.repeat(regioes, n_crimes), n_meses),
+            'tipo_crime': np.tile(tipos_crime, n_meses * n_regioes),
+            'ocorrencias': ocorrencias.transpose(2, 1, 0).ravel(),
+            'fonte': 'ISP-RJ'
+        }
         
         df = pd.DataFrame(crimes_data)
         print(f"✅ Coletados {len(df)} registros do ISP-RJ")
@@ -199,16 +198,22 @@ class SecurityDataCollector:
     def consolidar_dados_seguranca(self, periodo_meses: int = 12) -> Dict[str, pd.DataFrame]:
         """
         Consolida dados de todas as fontes de segurança
+        
+        As fontes são coletadas em paralelo; as que falham ou estouram o
+        prazo ficam de fora, e o status de cada uma vai em 'status_fontes'.
         """
         print("🔄 Consolidando dados de segurança pública...")
         
-        dados_consolidados = {}
+        # Coleta as fontes em paralelo (cada uma com seu prazo)
+        status = run_sources({
+            'isp_rj': lambda: self.coletar_dados_isp_rj(periodo_meses),
+            'ibge': self.coletar_dados_ibge,
+            'ongs': self.coletar_dados_ongs,
+            'midia': self.coletar_dados_midia
+        })
         
-        # Coleta dados de cada fonte
-        dados_consolidados['isp_rj'] = self.coletar_dados_isp_rj(periodo_meses)
-        dados_consolidados['ibge'] = self.coletar_dados_ibge()
-        dados_consolidados['ongs'] = self.coletar_dados_ongs()
-        dados_consolidados['midia'] = self.coletar_dados_midia()
+        dados_consolidados = {fonte: resultado.data for fonte, resultado in status.items()
+                              if resultado.ok}
         
         # Consolida todos os dados de crimes
         todos_crimes = []
@@ -216,23 +221,46 @@ class SecurityDataCollector:
             if fonte != 'ibge':  # IBGE não tem dados de crimes
                 todos_crimes.append(df)
         
-        dados_consolidados['todos_crimes'] = pd.concat(todos_crimes, ignore_index=True)
+        dados_consolidados['todos_crimes'] = (pd.concat(todos_crimes, ignore_index=True)
+                                              if todos_crimes else pd.DataFrame())
+        dados_consolidados['status_fontes'] = status_frame(status)
         
-        print(f"✅ Consolidados dados de {len(dados_consolidados)} fontes")
+        print(f"✅ Consolidados dados de {sum(r.ok for r in status.values())}/{len(status)} fontes")
         return dados_consolidados
     
+    @staticmethod
+    def _fontes_indisponiveis(dados_consolidados: Dict[str, pd.DataFrame]) -> List[str]:
+        """Fontes que falharam ou estouraram o prazo (de 'status_fontes')"""
+        status = dados_consolidados.get('status_fontes')
+        if status is None or status.empty:
+            return []
+        return status.loc[status['status'] != 'ok', 'fonte'].tolist()
+    
     def calcular_indices_violencia(self, dados_consolidados: Dict[str, pd.DataFrame]) -> pd.DataFrame:
         """
         Calcula índices de violência por região
         """
         print("📊 Calculando índices de violência...")
         
-        # Agrupa dados por região
-        crimes_por_regiao = dados_consolidados['todos_crimes'].groupby('regiao')['ocorrencias'].sum().reset_index()
-        demograficos = dados_consolidados['ibge']
-        
-        # Merge com dados demográficos
-        indices = crimes_por_regiao.merge(demograficos, on='regiao', how='left')
+        # Agrupa dados por região (fatia do cubo região × crime × mês)
+        cubo = dados_consolidados.get('cubo')
+        todos_crimes = dados_consolidados.get('todos_crimes', pd.DataFrame())
+        if cubo is None and todos_crimes.empty:
+            print(f"⚠️ Sem dados de crimes (fontes indisponíveis: "
+                  f"{', '.join(self._fontes_indisponiveis(dados_consolidados)) or 'nenhuma'})")
+            return pd.DataFrame(columns=['regiao', 'ocorrencias', 'taxa_violencia_100k',
+                                         'densidade_crimes', 'nivel_violencia', 'cor'])
+        if cubo is None:
+            cubo = CrimeCube.from_frame(todos_crimes, values=['ocorrencias'], region_col='regiao')
+        crimes_por_regiao = cubo.by_region({'ocorrencias': 'sum'})
+        
+        # Merge com dados demográficos (sem IBGE, as taxas ficam NaN)
+        demograficos = dados_consolidados.get('ibge')
+        if demograficos is not None:
+            indices = crimes_por_regiao.merge(demograficos, on='regiao', how='left')
+        else:
+            print("⚠️ IBGE indisponível: taxas por habitante e por km² não calculadas")
+            indices = crimes_por_regiao.assign(populacao=np.nan, area_km2=np.nan)
         
         # Calcula índices
         indices['taxa_violencia_100k'] = (indices['ocorrencias'] / indices['populacao']) * 100000
@@ -265,9 +293,15 @@ class SecurityDataCollector:
         """
         print("📈 Analisando principais crimes dos últimos 12 meses...")
         
+        colunas = ['tipo_crime', 'total_ocorrencias', 'media_mensal', 'desvio_padrao',
+                   'meses_com_dados', 'percentual_total']
+        crimes_12m = dados_consolidados.get('todos_crimes', pd.DataFrame()).copy()
+        if crimes_12m.empty:
+            print("⚠️ Sem dados de crimes para analisar")
+            return pd.DataFrame(columns=colunas)
+        
         # Filtra últimos 12 meses
         data_limite = datetime.now() - timedelta(days=365)
-        crimes_12m = dados_consolidados['todos_crimes'].copy()
         crimes_12m['data'] = pd.to_datetime(crimes_12m['data'])
         crimes_12m = crimes_12m[crimes_12m['data'] >= data_limite]
         
@@ -17,9 +17,18 @@ except ImportError:
     NUMPY_AVAILABLE = False
     print("⚠️ NumPy não disponível.")
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from pathlib import Path
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.core.features import FeatureSpec, add_features
+from src.preprocessing.derived_columns import add_derived_columns
+from src.preprocessing.label_normalizer import LabelNormalizer
 
 # Verifica se as bibliotecas essenciais estão disponíveis
 if not PANDAS_AVAILABLE or not NUMPY_AVAILABLE:
@@ -29,14 +38,65 @@ if not PANDAS_AVAILABLE or not NUMPY_AVAILABLE:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass
+class StepReport:
+    """Instrumentação de uma etapa da limpeza"""
+    step: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+
+    @property
+    def removed(self) -> int:
+        """Linhas removidas pela etapa"""
+        return self.rows_in - self.rows_out
+
+
+def _clean_chunk(cleaner: 'DataCleaner', chunk: pd.DataFrame) -> Tuple[pd.DataFrame, List[StepReport]]:
+    """Limpa um bloco de linhas (executado em um processo do pool)"""
+    cleaned = cleaner.clean_crime_data(chunk, inplace=True)
+    return cleaned, cleaner.report
+
+
 class DataCleaner:
     """
     Classe para limpeza e padronização de dados de criminalidade
     """
     
-    def __init__(self):
+    # Versão do pipeline de limpeza (incrementar ao mudar qualquer etapa:
+    # invalida o cache em disco)
+    PIPELINE_VERSION = 5
+    
+    # Etapas da limpeza, em ordem: nome -> método (DataFrame -> DataFrame).
+    # Cada etapa substitui colunas inteiras (nunca escreve dentro de um
+    # array existente) e só a de registros inválidos filtra linhas.
+    STEPS = (
+        ('tipos_crime', '_standardize_crime_types'),
+        ('regioes', '_standardize_regions'),
+        ('tipos_dados', '_clean_data_types'),
+        ('registros_invalidos', '_remove_invalid_records'),
+        ('colunas_derivadas', '_add_derived_columns'),
+    )
+    
+    # Faixa de anos aceita
+    VALID_YEARS = (2020, 2025)
+    
+    # Linhas por bloco na limpeza paralela
+    PARALLEL_CHUNK_ROWS = 250_000
+    
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Args:
+            cache_dir: Diretório dos dicionários de normalização aprendidos
+                (padrão: data/cache/normalizacao)
+        """
         self.crime_types_mapping = self._get_crime_types_mapping()
         self.region_mapping = self._get_region_mapping()
+        # Normalização pelos valores distintos, com dicionário persistente
+        self.crime_normalizer = LabelNormalizer(self.crime_types_mapping, 'tipos_crime', cache_dir)
+        self.region_normalizer = LabelNormalizer(self.region_mapping, 'regioes', cache_dir)
+        # Instrumentação da última limpeza (uma entrada por etapa)
+        self.report: List[StepReport] = []
         
     def _get_crime_types_mapping(self) -> Dict[str, str]:
         """
@@ -99,39 +159,139 @@ class DataCleaner:
             'GUARATIBA': 'Guaratiba'
         }
     
-    def clean_crime_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_crime_data(self, df: pd.DataFrame, inplace: bool = False,
+                         steps: Optional[Sequence[str]] = None) -> pd.DataFrame:
         """
         Limpa e padroniza dados de criminalidade
         
+        Política de cópia: com inplace=False a entrada é copiada só de
+        forma rasa (as colunas não são duplicadas; as etapas substituem
+        colunas inteiras, então a entrada nunca é alterada). Com
+        inplace=True as colunas são substituídas no próprio DataFrame. Em
+        ambos os casos use o retorno: a remoção de registros gera um novo
+        DataFrame.
+        
         Args:
             df: DataFrame com dados brutos de criminalidade
+            inplace: Substitui as colunas no próprio df
+            steps: Nomes das etapas a executar (padrão: todas de STEPS)
             
         Returns:
-            DataFrame limpo e padronizado
+            DataFrame limpo e padronizado (tempos e linhas em self.report)
         """
         logger.info("Iniciando limpeza de dados de criminalidade")
         
-        # Cria cópia para não modificar original
-        df_clean = df.copy()
+        df_clean = df if inplace else df.copy(deep=False)
         
-        # 1. Padroniza tipos de crime
-        df_clean = self._standardize_crime_types(df_clean)
+        self.report = []
+        for name, method in self.STEPS:
+            if steps is not None and name not in steps:
+                continue
+            rows_in = len(df_clean)
+            start = time.perf_counter()
+            df_clean = getattr(self, method)(df_clean)
+            self.report.append(StepReport(name, rows_in, len(df_clean),
+                                          time.perf_counter() - start))
         
-        # 2. Padroniza regiões administrativas
-        df_clean = self._standardize_regions(df_clean)
+        for step in self.report:
+            logger.debug(f"Etapa {step.step}: {step.seconds:.3f}s, "
+                         f"{step.rows_in} -> {step.rows_out} linhas")
         
-        # 3. Limpa e converte tipos de dados
-        df_clean = self._clean_data_types(df_clean)
-        
-        # 4. Remove registros inválidos
-        df_clean = self._remove_invalid_records(df_clean)
+        logger.info(f"Dados limpos: {len(df_clean)} registros "
+                    f"({sum(step.seconds for step in self.report):.2f}s)")
+        return df_clean
+    
+    def clean_crime_data_parallel(self, df: pd.DataFrame, max_workers: Optional[int] = None,
+                                  chunk_rows: Optional[int] = None) -> pd.DataFrame:
+        """
+        Limpa em paralelo, em blocos de linhas, num pool de processos
         
-        # 5. Adiciona colunas derivadas
-        df_clean = self._add_derived_columns(df_clean)
+        Todas as etapas são por linha, então cada bloco é limpo de forma
+        independente; os blocos voltam na ordem original e o resultado é
+        idêntico ao de clean_crime_data (mesmo índice, colunas e tipos).
+        Tabelas com um bloco só são limpas no próprio processo.
         
-        logger.info(f"Dados limpos: {len(df_clean)} registros")
+        Args:
+            df: DataFrame com dados brutos de criminalidade
+            max_workers: Processos (padrão: número de CPUs)
+            chunk_rows: Linhas por bloco (padrão: PARALLEL_CHUNK_ROWS)
+            
+        Returns:
+            DataFrame limpo e padronizado (self.report soma os blocos)
+        """
+        chunk_rows = chunk_rows or self.PARALLEL_CHUNK_ROWS
+        max_workers = max_workers or os.cpu_count() or 1
+        if len(df) <= chunk_rows or max_workers == 1:
+            return self.clean_crime_data(df)
+        
+        # Vocabulário resolvido aqui: os processos só consultam o dicionário
+        for column, normalizer in (('tipo_crime', self.crime_normalizer),
+                                   ('regiao_administrativa', self.region_normalizer)):
+            if column in df.columns:
+                normalizer.fit(df[column].unique())
+        
+        chunks = [df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows)]
+        logger.info(f"Limpeza paralela: {len(chunks)} blocos em {max_workers} processos")
+        
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            # map devolve na ordem dos blocos
+            results = list(executor.map(_clean_chunk, [self] * len(chunks), chunks))
+        
+        # Instrumentação: linhas somadas; tempo de CPU somado por etapa
+        self.report = [
+            StepReport(name, sum(r[i].rows_in for _, r in results),
+                       sum(r[i].rows_out for _, r in results),
+                       sum(r[i].seconds for _, r in results))
+            for i, name in enumerate(step.step for step in results[0][1])
+        ]
+        df_clean = pd.concat([cleaned for cleaned, _ in results])
+        logger.info(f"Dados limpos: {len(df_clean)} registros "
+                    f"({time.perf_counter() - start:.2f}s em paralelo)")
         return df_clean
     
+    def report_frame(self) -> pd.DataFrame:
+        """
+        Instrumentação da última limpeza em tabela
+        
+        Returns:
+            DataFrame com etapa, linhas de entrada/saída e tempo
+        """
+        return pd.DataFrame([vars(step) for step in self.report])
+    
+    def clean_crime_file(self, path, use_cache: bool = True, parallel: bool = False,
+                         **read_kwargs) -> pd.DataFrame:
+        """
+        Lê e limpa um CSV de criminalidade
+        
+        O resultado limpo fica no cache em disco (data/cache), chaveado pelo
+        conteúdo do arquivo e por PIPELINE_VERSION: chamadas seguintes, mesmo
+        em outro processo, pulam a leitura do CSV e todas as etapas de limpeza.
+        
+        Args:
+            path: Caminho do CSV
+            use_cache: Se False, sempre relê e limpa
+            parallel: Limpa em blocos num pool de processos (mesmo resultado)
+            **read_kwargs: Argumentos repassados a pd.read_csv
+            
+        Returns:
+            DataFrame limpo e padronizado
+        """
+        path = Path(path)
+        
+        def build():
+            df = pd.read_csv(path, **read_kwargs)
+            if parallel:
+                return self.clean_crime_data_parallel(df)
+            return self.clean_crime_data(df)
+        
+        if not use_cache:
+            return build()
+        
+        from src.core.disk_cache import shared_disk_cache
+        version = f"{self.PIPELINE_VERSION}:{sorted(read_kwargs.items())}"
+        return shared_disk_cache.fetch(path, 'clean', build, version=version)
+    
     def _standardize_crime_types(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Padroniza tipos de crime
@@ -143,11 +303,8 @@ class DataCleaner:
             DataFrame com tipos de crime padronizados
         """
         if 'tipo_crime' in df.columns:
-            # Mapeia tipos de crime para padronização
-            df['tipo_crime'] = df['tipo_crime'].str.upper().str.strip()
-            
-            # Aplica mapeamento
-            df['tipo_crime'] = df['tipo_crime'].map(self.crime_types_mapping).fillna(df['tipo_crime'])
+            # Resolve só os valores distintos e propaga pelos códigos
+            df['tipo_crime'] = self.crime_normalizer.normalize(df['tipo_crime'])
             
             logger.info(f"Tipos de crime únicos: {df['tipo_crime'].nunique()}")
         
@@ -164,11 +321,8 @@ class DataCleaner:
             DataFrame com regiões padronizadas
         """
         if 'regiao_administrativa' in df.columns:
-            # Padroniza nomes das regiões
-            df['regiao_administrativa'] = df['regiao_administrativa'].str.upper().str.strip()
-            
-            # Aplica mapeamento
-            df['regiao_administrativa'] = df['regiao_administrativa'].map(self.region_mapping).fillna(df['regiao_administrativa'])
+            # Resolve só os valores distintos e propaga pelos códigos
+            df['regiao_administrativa'] = self.region_normalizer.normalize(df['regiao_administrativa'])
             
             logger.info(f"Regiões únicas: {df['regiao_administrativa'].nunique()}")
         
@@ -184,22 +338,17 @@ class DataCleaner:
         Returns:
             DataFrame com tipos de dados corretos
         """
-        # Converte colunas numéricas
-        numeric_columns = ['total_ocorrencias', 'populacao', 'taxa_100k']
-        for col in numeric_columns:
-            if col in df.columns:
+        # Converte só as colunas que ainda não são numéricas
+        for col in ['total_ocorrencias', 'populacao', 'taxa_100k', 'ano', 'mes']:
+            if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
                 df[col] = pd.to_numeric(df[col], errors='coerce')
         
-        # Converte colunas de data
-        if 'ano' in df.columns:
-            df['ano'] = pd.to_numeric(df['ano'], errors='coerce')
-        
-        if 'mes' in df.columns:
-            df['mes'] = pd.to_numeric(df['mes'], errors='coerce')
-        
-        # Cria coluna de data completa
+        # Cria coluna de data completa (ano/mês inválidos viram NaT)
         if 'ano' in df.columns and 'mes' in df.columns:
-            df['data'] = pd.to_datetime(df[['ano', 'mes']].assign(day=1))
+            # float: ausentes de colunas anuláveis (Int64) viram NaN -> NaT
+            df['data'] = pd.to_datetime({'year': df['ano'].astype(float),
+                                         'month': df['mes'].astype(float), 'day': 1},
+                                        errors='coerce')
         
         return df
     
@@ -213,33 +362,37 @@ class DataCleaner:
         Returns:
             DataFrame sem registros inválidos
         """
-        initial_count = len(df)
+        # Máscara única com todos os critérios; as linhas são copiadas uma vez.
+        # Cada critério vira um array bool puro, com ausentes (NaN/NA) inválidos.
+        def valid(condition: pd.Series) -> np.ndarray:
+            return condition.to_numpy(dtype=bool, na_value=False)
         
-        # Remove registros com valores faltantes críticos
         critical_columns = ['ano', 'mes', 'regiao_administrativa', 'tipo_crime']
-        df = df.dropna(subset=critical_columns)
+        invalid = df[[col for col in critical_columns if col in df.columns]].isna().any(axis=1).to_numpy(copy=True)
         
-        # Remove registros com valores negativos em ocorrências
+        # Ocorrências negativas ou ausentes (como o filtro >= 0 original)
         if 'total_ocorrencias' in df.columns:
-            df = df[df['total_ocorrencias'] >= 0]
+            invalid |= ~valid(df['total_ocorrencias'] >= 0)
         
-        # Remove registros com anos inválidos
+        # Anos fora da faixa
         if 'ano' in df.columns:
-            df = df[(df['ano'] >= 2020) & (df['ano'] <= 2025)]
+            first_year, last_year = self.VALID_YEARS
+            invalid |= ~valid(df['ano'].between(first_year, last_year))
         
-        # Remove registros com meses inválidos
+        # Meses inválidos
         if 'mes' in df.columns:
-            df = df[(df['mes'] >= 1) & (df['mes'] <= 12)]
+            invalid |= ~valid(df['mes'].between(1, 12))
         
-        removed_count = initial_count - len(df)
+        removed_count = int(invalid.sum())
         if removed_count > 0:
+            df = df[~invalid]
             logger.info(f"Registros removidos: {removed_count}")
         
         return df
     
     def _add_derived_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
-        Adiciona colunas derivadas
+        Adiciona colunas derivadas (declaradas em derived_columns.DERIVED_COLUMNS)
         
         Args:
             df: DataFrame com dados de criminalidade
@@ -247,51 +400,8 @@ class DataCleaner:
         Returns:
             DataFrame com colunas derivadas
         """
-        # Adiciona trimestre
-        if 'mes' in df.columns:
-            df['trimestre'] = df['mes'].apply(lambda x: (x - 1) // 3 + 1)
-        
-        # Adiciona semestre
-        if 'mes' in df.columns:
-            df['semestre'] = df['mes'].apply(lambda x: 1 if x <= 6 else 2)
-        
-        # Adiciona estação do ano
-        if 'mes' in df.columns:
-            def get_season(month):
-                if month in [12, 1, 2]:
-                    return 'Verão'
-                elif month in [3, 4, 5]:
-                    return 'Outono'
-                elif month in [6, 7, 8]:
-                    return 'Inverno'
-                else:
-                    return 'Primavera'
-            
-            df['estacao'] = df['mes'].apply(get_season)
-        
-        # Adiciona categoria de crime
-        if 'tipo_crime' in df.columns:
-            def get_crime_category(crime_type):
-                cvli_crimes = ['Homicídio Doloso', 'Latrocínio', 'Lesão Corporal Seguida de Morte']
-                violent_property = ['Roubo de Veículo', 'Roubo de Carga', 'Roubo a Transeunte', 
-                                  'Roubo em Estabelecimento Comercial', 'Roubo de Aparelho Celular']
-                non_violent_property = ['Furto de Veículo', 'Furto a Transeunte', 'Furto em Estabelecimento']
-                vulnerable_groups = ['Estupro', 'Violência Doméstica']
-                
-                if crime_type in cvli_crimes:
-                    return 'CVLI'
-                elif crime_type in violent_property:
-                    return 'Crime Violento contra Patrimônio'
-                elif crime_type in non_violent_property:
-                    return 'Crime contra Patrimônio sem Violência'
-                elif crime_type in vulnerable_groups:
-                    return 'Crime contra Grupos Vulneráveis'
-                else:
-                    return 'Outros'
-            
-            df['categoria_crime'] = df['tipo_crime'].apply(get_crime_category)
-        
-        return df
+        # Vetorizado: consulta por mês e mapeamento dos valores únicos
+        return add_derived_columns(df)
     
     def calculate_crime_rates(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -333,15 +443,15 @@ class DataCleaner:
             df['dia_mes'] = df['data'].dt.day
             df['semana_ano'] = df['data'].dt.isocalendar().week
             
-            # Adiciona lags temporais
-            df = df.sort_values(['regiao_administrativa', 'tipo_crime', 'data'])
-            
-            for lag in [1, 3, 6, 12]:  # 1, 3, 6 e 12 meses
-                if 'total_ocorrencias' in df.columns:
-                    df[f'ocorrencias_lag_{lag}m'] = df.groupby(['regiao_administrativa', 'tipo_crime'])['total_ocorrencias'].shift(lag)
-                
-                if 'taxa_100k' in df.columns:
-                    df[f'taxa_lag_{lag}m'] = df.groupby(['regiao_administrativa', 'tipo_crime'])['taxa_100k'].shift(lag)
+            # Adiciona lags temporais (uma ordenação, todos os lags de uma vez)
+            value_cols = [col for col in ('total_ocorrencias', 'taxa_100k') if col in df.columns]
+            if value_cols:
+                spec = FeatureSpec(lags=(1, 3, 6, 12), windows=(), diffs=(),
+                                   lag_name='{col}_lag_{n}m',
+                                   aliases={'total_ocorrencias': 'ocorrencias',
+                                            'taxa_100k': 'taxa'})
+                df = add_features(df, value_cols, 'data',
+                                  ['regiao_administrativa', 'tipo_crime'], spec)
         
         return df
     
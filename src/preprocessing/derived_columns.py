@@ -0,0 +1,144 @@
+"""
+🧮 DERIVED COLUMNS - Colunas Derivadas Vetorizadas
+==================================================
+
+Declara em um só lugar as colunas derivadas da limpeza (trimestre,
+semestre, estação, categoria do crime) e as calcula sem .apply linha a
+linha:
+
+- campos do mês saem de um array de consulta indexado pelo próprio mês;
+- categorias saem de um mapeamento feito sobre os valores únicos
+  (códigos do Categorical ou do factorize) e propagado pelos códigos.
+
+O custo passa a ser uma indexação de array por linha, mais um dicionário
+por valor distinto.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class MonthColumn:
+    """Coluna derivada do mês (1-12) por array de consulta"""
+    name: str
+    values: Tuple[Any, ...]
+    source: str = 'mes'
+
+    def _lookup_index(self, month: pd.Series) -> np.ndarray:
+        """Índice no array de consulta (0 = mês ausente ou inválido)"""
+        month = pd.to_numeric(month, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        valid = (month >= 1) & (month <= 12) & (month == np.floor(month))
+        return np.where(valid, month, 0).astype(np.intp)
+
+    def compute(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula a coluna a partir do mês
+
+        Args:
+            df: DataFrame com a coluna de mês
+
+        Returns:
+            Series inteira (ou Categorical, se os valores são rótulos)
+        """
+        index = self._lookup_index(df[self.source])
+
+        if isinstance(self.values[0], str):
+            # Rótulos: códigos por mês e um Categorical no fim
+            categories = list(dict.fromkeys(self.values))
+            codes = np.array([-1] + [categories.index(v) for v in self.values], dtype=np.int8)
+            return pd.Series(pd.Categorical.from_codes(codes[index], categories),
+                             index=df.index, name=self.name)
+
+        table = np.array((0,) + tuple(self.values), dtype=np.int8)
+        result = pd.Series(table[index], index=df.index, name=self.name)
+        if (index == 0).any():
+            result = result.astype('Int8').mask(index == 0)
+        return result
+
+
+@dataclass(frozen=True)
+class CategoryColumn:
+    """Coluna derivada de uma coluna categórica por mapeamento dos valores únicos"""
+    name: str
+    source: str
+    groups: Dict[str, Sequence[str]]
+    default: str = 'Outros'
+
+    @property
+    def categories(self) -> List[str]:
+        """Categorias de saída, na ordem declarada"""
+        return list(self.groups) + [self.default]
+
+    def compute(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Calcula a coluna mapeando só os valores distintos da origem
+
+        Args:
+            df: DataFrame com a coluna de origem
+
+        Returns:
+            Series Categorical
+        """
+        source = df[self.source]
+        if isinstance(source.dtype, pd.CategoricalDtype):
+            codes, uniques = source.cat.codes.to_numpy(), source.cat.categories
+        else:
+            codes, uniques = pd.factorize(source)
+
+        categories = self.categories
+        member_of = {value: categories.index(group)
+                     for group, values in self.groups.items() for value in values}
+        default_code = categories.index(self.default)
+
+        # Uma entrada por valor distinto; a última atende os ausentes (código -1)
+        table = np.array([member_of.get(value, default_code) for value in uniques]
+                         + [default_code], dtype=np.int8)
+        return pd.Series(pd.Categorical.from_codes(table[codes], categories),
+                         index=df.index, name=self.name)
+
+
+# Categorias de crime (tipos já padronizados -> categoria)
+CRIME_CATEGORIES = {
+    'CVLI': ('Homicídio Doloso', 'Latrocínio', 'Lesão Corporal Seguida de Morte'),
+    'Crime Violento contra Patrimônio': (
+        'Roubo de Veículo', 'Roubo de Carga', 'Roubo a Transeunte',
+        'Roubo em Estabelecimento Comercial', 'Roubo de Aparelho Celular'
+    ),
+    'Crime contra Patrimônio sem Violência': (
+        'Furto de Veículo', 'Furto a Transeunte', 'Furto em Estabelecimento'
+    ),
+    'Crime contra Grupos Vulneráveis': ('Estupro', 'Violência Doméstica'),
+}
+
+# Colunas derivadas da limpeza (para incluir uma nova, basta declará-la aqui)
+DERIVED_COLUMNS = (
+    MonthColumn('trimestre', (1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4)),
+    MonthColumn('semestre', (1, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 2)),
+    MonthColumn('estacao', (
+        'Verão', 'Verão', 'Outono', 'Outono', 'Outono', 'Inverno',
+        'Inverno', 'Inverno', 'Primavera', 'Primavera', 'Primavera', 'Verão'
+    )),
+    CategoryColumn('categoria_crime', 'tipo_crime', CRIME_CATEGORIES),
+)
+
+
+def add_derived_columns(df: pd.DataFrame,
+                        columns: Optional[Sequence] = None) -> pd.DataFrame:
+    """
+    Adiciona as colunas derivadas cuja coluna de origem existe
+
+    Args:
+        df: DataFrame (modificado no lugar)
+        columns: Colunas a derivar (padrão: DERIVED_COLUMNS)
+
+    Returns:
+        O mesmo DataFrame, com as colunas derivadas
+    """
+    for column in columns or DERIVED_COLUMNS:
+        if column.source in df.columns:
+            df[column.name] = column.compute(df)
+    return df
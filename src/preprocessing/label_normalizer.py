@@ -0,0 +1,169 @@
+"""
+🔤 LABEL NORMALIZER - Padronização de Rótulos pelo Vocabulário
+==============================================================
+
+Padroniza colunas de rótulos (tipos de crime, regiões) resolvendo só os
+valores distintos: a coluna é fatorada, cada valor único é resolvido uma
+vez e os códigos propagam o resultado para as linhas. O custo depende do
+tamanho do vocabulário (centenas de rótulos), não do número de linhas.
+
+A resolução de cada rótulo bruto segue, em ordem:
+
+1. dicionário aprendido (persistido em data/cache/normalizacao);
+2. mapeamento exato (maiúsculas, sem espaços nas pontas);
+3. chave sem acentos/pontuação, contra as chaves e os rótulos finais;
+4. correspondência aproximada (difflib) acima de um limiar.
+
+O dicionário aprendido sobrevive entre execuções e é invalidado quando o
+mapeamento muda.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.config import config
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# Similaridade mínima para aceitar uma correspondência aproximada
+FUZZY_CUTOFF = 0.9
+
+
+def fold_label(value: str) -> str:
+    """Chave de comparação: sem acentos, maiúsculas, pontuação vira '_'"""
+    text = unicodedata.normalize('NFKD', str(value))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r'[^A-Z0-9]+', '_', text.upper()).strip('_')
+
+
+class LabelNormalizer:
+    """Padroniza rótulos pelo vocabulário, com dicionário aprendido persistente"""
+
+    def __init__(self, mapping: Dict[str, str], name: str,
+                 cache_dir: Optional[Path] = None,
+                 fuzzy_cutoff: float = FUZZY_CUTOFF):
+        """
+        Args:
+            mapping: Rótulo bruto (maiúsculas) -> rótulo padronizado
+            name: Nome do dicionário (arquivo do cache)
+            cache_dir: Diretório do cache (padrão: data/cache/normalizacao)
+            fuzzy_cutoff: Similaridade mínima da correspondência aproximada
+        """
+        self.mapping = dict(mapping)
+        self.name = name
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.cache_path = (Path(cache_dir) if cache_dir else
+                           config.paths.DATA_CACHE / 'normalizacao') / f"{name}.json"
+
+        # Chaves dobradas -> rótulo (chaves do mapeamento e os próprios rótulos)
+        self.folded = {fold_label(label): label for label in self.mapping.values()}
+        self.folded.update({fold_label(key): label for key, label in self.mapping.items()})
+
+        digest = hashlib.blake2b(json.dumps(self.mapping, sort_keys=True).encode('utf-8'),
+                                 digest_size=8)
+        self.version = f"{digest.hexdigest()}:{fuzzy_cutoff}"
+        self.learned: Dict[str, str] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, str]:
+        """Lê o dicionário aprendido (descarta se o mapeamento mudou)"""
+        try:
+            data = json.loads(self.cache_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != self.version:
+            return {}
+        return data.get('labels', {})
+
+    def save(self) -> None:
+        """Grava o dicionário aprendido, se houve rótulos novos (gravação atômica)"""
+        if not self._dirty:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temp = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            temp.write_text(json.dumps({'version': self.version, 'labels': self.learned},
+                                       ensure_ascii=False, indent=1), encoding='utf-8')
+            os.replace(temp, self.cache_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o dicionário {self.name}: {e}")
+
+    def resolve(self, raw) -> str:
+        """
+        Rótulo padronizado de um valor bruto
+
+        Args:
+            raw: Valor bruto (não nulo)
+
+        Returns:
+            Rótulo padronizado (ou o valor normalizado, se não há correspondência)
+        """
+        key = str(raw)
+        label = self.learned.get(key)
+        if label is not None:
+            return label
+
+        normalized = key.upper().strip()
+        label = self.mapping.get(normalized)
+        if label is None:
+            folded = fold_label(normalized)
+            label = self.folded.get(folded)
+            if label is None:
+                match = difflib.get_close_matches(folded, self.folded, n=1,
+                                                  cutoff=self.fuzzy_cutoff)
+                if match:
+                    label = self.folded[match[0]]
+                    logger.info(f"{self.name}: '{key}' ~ '{label}'")
+                else:
+                    label = normalized
+
+        self.learned[key] = label
+        self._dirty = True
+        return label
+
+    def fit(self, values: Iterable) -> 'LabelNormalizer':
+        """
+        Resolve e memoriza um vocabulário (sem transformar linhas)
+
+        Args:
+            values: Valores brutos (repetidos e nulos são ignorados)
+
+        Returns:
+            O próprio normalizador
+        """
+        for value in pd.unique(pd.Series(list(values), dtype=object).dropna()):
+            self.resolve(value)
+        self.save()
+        return self
+
+    def normalize(self, values: pd.Series) -> pd.Series:
+        """
+        Padroniza uma coluna resolvendo só os valores distintos
+
+        Args:
+            values: Coluna de rótulos brutos
+
+        Returns:
+            Series com os rótulos padronizados (nulos preservados)
+        """
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+
+        # Uma resolução por valor distinto; a última posição atende os nulos
+        labels = np.array([self.resolve(value) for value in uniques] + [np.nan], dtype=object)
+        self.save()
+        return pd.Series(labels[codes], index=values.index, name=values.name)
@@ -9,7 +9,7 @@ a lógica de negócio do framework.
 import streamlit as st
 import pandas as pd
 import geopandas as gpd
-from typing import Optional
+from typing import Optional, List, Union
 
 from src.core.data_loader import CrimeDataLoader, GeoDataLoader, DataManager
 
@@ -29,16 +29,29 @@ def get_crime_data(filename: Optional[str] = None,
     Returns:
         DataFrame com dados
     """
-    loader = CrimeDataLoader()
-    df = loader.load(filename)
-    
-    if crime_type:
-        df = loader.filter_by_crime_type(df, crime_type)
-    
-    if region:
-        df = loader.filter_by_region(df, region)
+    return DataManager().get_crime_data(filename, crime_type, region)
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def query_crime_data(filename: Optional[str] = None,
+                     crime_types: Optional[Union[str, List[str]]] = None,
+                     regions: Optional[Union[str, List[str]]] = None,
+                     start_date: Optional[str] = None,
+                     end_date: Optional[str] = None) -> pd.DataFrame:
+    """
+    Wrapper com cache para consultas com múltiplos filtros
     
-    return df
+    Args:
+        filename: Nome do arquivo
+        crime_types: Tipo de crime ou lista de tipos
+        regions: Região ou lista de regiões
+        start_date: Data inicial (inclusiva)
+        end_date: Data final (inclusiva)
+        
+    Returns:
+        DataFrame com dados
+    """
+    return DataManager().query(filename, crime_types, regions, start_date, end_date)
 
 
 @st.cache_data(ttl=3600, show_spinner=False)
@@ -59,8 +72,7 @@ def get_geo_data(filename: str = "zonas_rio_limites_reais.geojson",
     
     if gdf is not None and include_crime_data:
         crime_loader = CrimeDataLoader()
-        crime_df = crime_loader.load()
-        gdf = geo_loader.merge_with_crime_data(gdf, crime_df)
+        gdf = geo_loader.merge_with_crime_data(gdf, crime_loader.load_cube())
     
     return gdf
 
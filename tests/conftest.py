@@ -0,0 +1,10 @@
+"""
+Configuração dos testes: raiz do projeto e scripts/ no path
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'scripts'))
@@ -0,0 +1,76 @@
+"""
+Backfill do ISP: checkpoint dos meses gravados e dos ausentes no servidor
+"""
+
+import pytest
+
+import backfill_isp
+from src.config import config
+from src.data_collection.isp_incremental import ISPIncrementalStore
+from src.data_collection.local_http import LocalHTTPServer
+
+pytest.importorskip('pyarrow')
+
+
+def monthly_csv(ano, mes):
+    """Arquivo mensal BaseAAAAMM.csv"""
+    return (f"cisp;munic;hom_doloso\n1;Rio de Janeiro;{ano % 7 + mes}\n"
+            f"5;Rio de Janeiro;3\n2;Niteroi;1\n").encode('latin-1')
+
+
+# Publicados: 2021-01 a 2022-09, sem 2022-03 (buraco na série)
+PUBLISHED = [(ano, mes) for ano in (2021, 2022) for mes in range(1, 13)
+             if (ano, mes) != (2022, 3) and (ano, mes) <= (2022, 9)]
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(config.apis, 'HTTP_RATE_LIMIT', 1000.0)
+    routes = {f'/Arquivos/Base{ano}{mes:02d}.csv': monthly_csv(ano, mes) for ano, mes in PUBLISHED}
+    with LocalHTTPServer(routes) as server:
+        yield server
+
+
+def requested(server, start):
+    """Meses pedidos ao servidor a partir da requisição start"""
+    return sorted((int(path[-10:-6]), int(path[-6:-4])) for path in server.requests[start:])
+
+
+def test_backfill_checkpoint_and_resume(server, tmp_path):
+    """Retomada pede só os meses que não estão no checkpoint"""
+    resumo = backfill_isp.backfill(2020, 2022, workers=2, base_url=server.url, base_path=tmp_path)
+    assert sorted(resumo['gravados']) == PUBLISHED and not resumo['erros']
+
+    base = ISPIncrementalStore(backfill_isp.DATASET, base_path=tmp_path)
+    assert base.store.keys() == PUBLISHED
+    assert base.cube() is not None
+
+    # Ausentes antes do último mês publicado ficam no checkpoint; os
+    # posteriores continuam pendentes (podem ser publicados depois)
+    ausentes = backfill_isp.ler_ausentes(base)
+    assert ausentes == {(2020, mes) for mes in range(1, 13)} | {(2022, 3)}
+
+    start = len(server.requests)
+    resumo = backfill_isp.backfill(2020, 2022, workers=2, base_url=server.url, base_path=tmp_path)
+    assert requested(server, start) == [(2022, mes) for mes in (10, 11, 12)]
+    assert not resumo['gravados']
+
+
+def test_backfill_resumes_interrupted_run(server, tmp_path):
+    """Meses já gravados por uma execução parcial não são baixados de novo"""
+    backfill_isp.backfill(2021, 2021, workers=2, base_url=server.url, base_path=tmp_path)
+
+    start = len(server.requests)
+    resumo = backfill_isp.backfill(2021, 2022, workers=2, base_url=server.url, base_path=tmp_path)
+    assert all(ano == 2022 for ano, _ in requested(server, start))
+    assert sorted(resumo['gravados']) == [key for key in PUBLISHED if key[0] == 2022]
+
+
+def test_backfill_refazer_ignores_checkpoint(server, tmp_path):
+    """--refazer pede de novo meses gravados e ausentes"""
+    backfill_isp.backfill(2022, 2022, workers=2, base_url=server.url, base_path=tmp_path)
+
+    start = len(server.requests)
+    backfill_isp.backfill(2022, 2022, workers=2, refazer=True,
+                          base_url=server.url, base_path=tmp_path)
+    assert requested(server, start) == [(2022, mes) for mes in range(1, 13)]
@@ -0,0 +1,99 @@
+"""
+Ingestão incremental do ISP: partições, manifesto e cubo
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.partitions import partition_hashes
+from src.data_collection.isp_incremental import ISPIncrementalStore, stream_isp_csv
+
+pytest.importorskip('pyarrow')
+
+
+def base_isp(anos=(2022, 2023), cisps=range(1, 11), seed=0):
+    """Base larga no layout do ISP (Rio + outro município)"""
+    rows = [(cisp, ano, mes, munic)
+            for munic in ('Rio de Janeiro', 'Niteroi')
+            for cisp in cisps for ano in anos for mes in range(1, 13)]
+    df = pd.DataFrame(rows, columns=['cisp', 'ano', 'mes', 'munic'])
+    rng = np.random.default_rng(seed)
+    df['hom_doloso'] = rng.integers(0, 9, len(df))
+    df['roubo_transeunte'] = rng.integers(0, 50, len(df))
+    return df
+
+
+def mtimes(base):
+    """mtime de cada arquivo de partição"""
+    return {key: base.store.partition_path(key).stat().st_mtime_ns for key in base.store.keys()}
+
+
+def assert_same_cube(left, right):
+    """Cubos com os mesmos agregados por mês e por região"""
+    pd.testing.assert_frame_equal(left.by_month(), right.by_month())
+    pd.testing.assert_frame_equal(left.by_region(), right.by_region())
+
+
+def test_round_trip_ingest(tmp_path):
+    """Ingestão -> reingestão sem mudança -> mês revisado"""
+    base = ISPIncrementalStore('cisp', base_path=tmp_path)
+    df = base_isp()
+
+    result = base.ingest(df)
+    assert len(result.new) == 24 and not result.changed
+    assert len(base.load()) == (df['munic'] == 'Rio de Janeiro').sum()
+
+    # Reingestão idêntica: nada é gravado, nem o cubo
+    before, cube_before = mtimes(base), base.cube_path.stat().st_mtime_ns
+    result = base.ingest(df.sample(frac=1, random_state=1))
+    assert not result.has_changes and len(result.unchanged) == 24
+    assert mtimes(base) == before
+    assert base.cube_path.stat().st_mtime_ns == cube_before
+
+    # Revisão de um mês: só essa partição é regravada e o cubo acompanha
+    revised = df.copy()
+    month = (revised['ano'] == 2023) & (revised['mes'] == 5) & (revised['munic'] == 'Rio de Janeiro')
+    revised.loc[month & (revised['cisp'] == 3), 'hom_doloso'] += 7
+    result = base.ingest(revised)
+    assert result.changed == [(2023, 5)] and not result.new
+    after = mtimes(base)
+    assert [key for key in after if after[key] != before[key]] == [(2023, 5)]
+
+    stored = base.load()
+    stored = stored[(stored['ano'] == 2023) & (stored['mes'] == 5)]
+    assert stored['hom_doloso'].sum() == revised.loc[month, 'hom_doloso'].sum()
+    assert_same_cube(base.cube(), ISPIncrementalStore('cisp', base_path=tmp_path).rebuild_cube())
+
+
+def test_ingest_chunks_matches_ingest(tmp_path):
+    """Ingestão em blocos grava o mesmo que a ingestão em memória"""
+    df = base_isp()
+    csv = tmp_path / 'base.csv'
+    df.to_csv(csv, sep=';', index=False, encoding='latin-1')
+
+    streamed = ISPIncrementalStore('blocos', base_path=tmp_path)
+    in_memory = ISPIncrementalStore('memoria', base_path=tmp_path)
+    result = streamed.ingest_chunks(stream_isp_csv(csv, chunksize=100))
+    in_memory.ingest(df)
+
+    assert len(result.new) == 24
+    assert streamed.store.manifest() == in_memory.store.manifest()
+    assert not (streamed.store.root / '_staging').exists()
+    assert_same_cube(streamed.cube(), in_memory.cube())
+
+    # Blocos de outro tamanho, mesmo conteúdo: nada muda
+    result = streamed.ingest_chunks(stream_isp_csv(csv, chunksize=333))
+    assert not result.has_changes
+
+
+def test_partition_hash_ignores_dtype_and_column_order():
+    """Um NaN (int -> float) ou colunas reordenadas não alteram outros meses"""
+    df = base_isp(anos=(2023,))
+    hashes = partition_hashes(df)
+
+    with_nan = df.astype({'hom_doloso': float})
+    with_nan.loc[with_nan['mes'] == 12, 'hom_doloso'] = np.nan
+    changed = partition_hashes(with_nan[df.columns[::-1]])
+
+    assert [key for key in hashes if hashes[key] != changed[key]] == [(2023, 12)]